@@ -1,18 +1,31 @@
+import os
+import socket
 from pathlib import Path
 from datetime import datetime
 
 from flask import Flask, session
+from werkzeug.middleware.proxy_fix import ProxyFix
 
+from .audit_sink import configure_audit_sink
 from .auth import is_admin_authenticated
 from .config import Config
-from .db import init_db
+from .db import init_db, start_db_warmup
 from .extensions import csrf, limiter
+from .health import configure_health
+from .jobs import configure_jobs
+from .metrics import configure_metrics
+from .page_cache import configure_page_cache
+from .query_profiler import configure_query_profiler
+from .registry import configure_registry
+from .repositories.lock_repo import LockRepository
 from .routes.admin import admin_bp
 from .routes.api import api_bp
 from .routes.main import main_bp
 from .services.auth_service import AuthService
 from .services.media_storage_service import configure_media_storage
 
+ADMIN_BOOTSTRAP_LOCK = "admin_bootstrap"
+
 
 def create_app(config_class=Config):
     base_dir = Path(__file__).resolve().parents[1]
@@ -25,12 +38,21 @@ def create_app(config_class=Config):
         static_folder=str(static_dir),
     )
     app.config.from_object(config_class)
+    if app.config.get("PROXY_FIX_X_FOR", 0) > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
 
     csrf.init_app(app)
     limiter.init_app(app)
     init_db(app)
+    configure_metrics(app)
+    configure_audit_sink(app)
     configure_media_storage(app)
-    bootstrap_admin_from_env(app)
+    configure_page_cache(app)
+    configure_jobs(app)
+    configure_health(app)
+    configure_registry(app)
+    configure_query_profiler(app)
+    start_db_warmup(app, on_ready=bootstrap_admin_from_env)
 
     @app.template_filter("pretty_date")
     def pretty_date(value):
@@ -89,8 +111,25 @@ def bootstrap_admin_from_env(app):
     if not username or not password:
         return
 
+    auth_service = AuthService(db)
+    locks = LockRepository(db)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
     try:
-        AuthService(db).bootstrap_admin(username=username, password=password)
-        app.logger.info("Admin credentials bootstrapped from environment for '%s'", username)
+        with app.app_context():
+            # Workers booting later skip on the fingerprint left by the first one,
+            # without a lock round trip or a pbkdf2 verification.
+            if auth_service.bootstrap_is_current(username, password):
+                app.logger.info("Admin credentials for '%s' already match the environment", username)
+                return
+
+            # Workers booting together would otherwise all hash and upsert the same admin.
+            if not locks.acquire(ADMIN_BOOTSTRAP_LOCK, owner, ttl_seconds=60):
+                app.logger.info("Admin bootstrap is running in another process; skipping")
+                return
+            try:
+                auth_service.bootstrap_admin(username=username, password=password)
+            finally:
+                locks.release(ADMIN_BOOTSTRAP_LOCK, owner)
+            app.logger.info("Admin credentials from environment are in place for '%s'", username)
     except Exception as exc:
         app.logger.warning("Admin bootstrap from environment failed: %s", exc)
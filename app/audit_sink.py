@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+from typing import Any
+
+from flask import current_app, has_app_context
+
+
+class BufferedAuditSink:
+    """Collects audit events in a bounded queue and writes them in batches.
+
+    A daemon thread flushes with ``insert_many`` whenever ``batch_size`` events are
+    waiting or ``flush_seconds`` have passed. ``submit`` never blocks: when the
+    queue is full it returns ``False`` and the caller writes the event itself.
+    Pending events are flushed at interpreter exit.
+    """
+
+    def __init__(self, app, max_events: int = 1000, batch_size: int = 100, flush_seconds: float = 2.0):
+        self.app = app
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max_events)
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def submit(self, event: dict[str, Any]) -> bool:
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            return False
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> int:
+        """Write every queued event now; returns how many were written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return written
+                self._write(batch)
+                written += len(batch)
+
+    def _drain(self) -> list[dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list[dict[str, Any]]):
+        from .repositories.audit_repo import AuditRepository
+
+        with self.app.app_context():
+            try:
+                AuditRepository(self.app.extensions.get("mongo_db")).write_many(batch)
+            except Exception:
+                self.app.logger.exception("Dropping %s buffered audit events after a failed write", len(batch))
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            # Threads do not survive fork(), so each worker process starts its own.
+            if self._pid == os.getpid():
+                return
+            self._thread = threading.Thread(target=self._loop, name="audit-sink", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _loop(self):
+        while True:
+            self._wake.wait(timeout=self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+
+def configure_audit_sink(app):
+    sink = None
+    if app.config.get("AUDIT_BUFFER_ENABLED", False):
+        sink = BufferedAuditSink(
+            app,
+            max_events=app.config.get("AUDIT_BUFFER_MAX_EVENTS", 1000),
+            batch_size=app.config.get("AUDIT_BUFFER_BATCH_SIZE", 100),
+            flush_seconds=app.config.get("AUDIT_BUFFER_FLUSH_SECONDS", 2.0),
+        )
+    app.extensions["audit_sink"] = sink
+
+
+def get_audit_sink() -> BufferedAuditSink | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("audit_sink")
@@ -11,8 +11,6 @@ def login_admin(user: dict):
     session.clear()
     session["admin_user_id"] = str(user.get("_id") or user.get("id"))
     session["admin_username"] = user.get("username", "")
-    session["admin_failed_attempts"] = 0
-    session["admin_locked_until"] = 0
 
 
 def logout_admin():
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from flask import current_app, has_app_context
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def app_cache(name: str, ttl_config_key: str, default_ttl: float, maxsize: int = 256) -> TTLCache | None:
+    """Return the per-process cache ``name`` bound to the current app, if any."""
+    if not has_app_context():
+        return None
+
+    cache = current_app.extensions.get(name)
+    if cache is None:
+        ttl_seconds = current_app.config.get(ttl_config_key, default_ttl)
+        cache = current_app.extensions.setdefault(name, TTLCache(ttl_seconds=ttl_seconds, maxsize=maxsize))
+    return cache
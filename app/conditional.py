@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import timezone
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+
+from .auth import is_admin_authenticated
+from .db import get_db, public_reads_may_lag
+from .repositories.content_version_repo import ContentVersionRepository
+from .services.books import source_signature
+
+
+def conditional_get(collections: tuple[str, ...] = (), args: tuple[str, ...] = (), per_session: bool = True):
+    """Answer revalidation requests from content versions before running the view.
+
+    The ETag is derived from the endpoint, the listed query args, the version
+    of every collection the response is built from and :func:`release_signature`,
+    and Last-Modified is the most recent bump among them, so a matching
+    ``If-None-Match``/``If-Modified-Since`` costs a single ``content_versions``
+    lookup.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*view_args, **view_kwargs):
+            if request.method not in {"GET", "HEAD"}:
+                return view(*view_args, **view_kwargs)
+            if per_session and session.get("_flashes"):
+                return view(*view_args, **view_kwargs)
+            if public_reads_may_lag():
+                # The body may predate the version the ETag would name.
+                return view(*view_args, **view_kwargs)
+
+            versions = ContentVersionRepository(get_db()).get_versions(collections)
+            etag = _etag(versions, collections, args, view_kwargs, per_session)
+            last_modified = max(
+                (_as_utc(entry["updated_at"]) for entry in versions.values() if entry.get("updated_at")),
+                default=None,
+            )
+
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*view_args, **view_kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers["Cache-Control"] = "private, no-cache" if per_session else "public, no-cache"
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+def _etag(versions: dict, collections, args, view_kwargs: dict, per_session: bool) -> str:
+    parts = {
+        "endpoint": request.endpoint or request.path,
+        "view_args": view_kwargs,
+        "args": {name: (request.args.get(name) or "").strip() for name in args},
+        "versions": {name: versions.get(name, {}).get("version", 0) for name in collections},
+        "release": release_signature(),
+    }
+    if per_session:
+        parts["admin"] = is_admin_authenticated()
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def release_signature() -> dict:
+    """What besides content versions changes rendered pages: the deployed code and,
+    without a database, the static books catalogue the fallback pages read."""
+    signature = {"build": build_id()}
+    if get_db() is None:
+        signature["fallback_data"] = source_signature()
+    return signature
+
+
+def build_id() -> str:
+    value = current_app.extensions.get("build_id")
+    if value is None:
+        value = current_app.config.get("BUILD_ID") or _source_tree_signature(
+            (current_app.root_path, current_app.template_folder)
+        )
+        current_app.extensions["build_id"] = value
+    return value
+
+
+def _source_tree_signature(roots) -> str:
+    digest = hashlib.sha256()
+    for root in roots:
+        if not root:
+            continue
+        root = os.path.join(current_app.root_path, root)
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(name for name in dirnames if name != "__pycache__")
+            for filename in sorted(filenames):
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                digest.update(f"{os.path.relpath(path, root)}:{stat.st_mtime_ns}:{stat.st_size}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _as_utc(value):
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _not_modified(etag: str, last_modified) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -14,20 +15,59 @@ def env_bool(name: str, default: bool = False) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def env_int_mapping(name: str, default: str = "") -> dict[str, int]:
+    """Parse ``key=value,key=value`` into a dict of ints, skipping malformed pairs."""
+    mapping = {}
+    for pair in os.getenv(name, default).split(","):
+        key, _, value = pair.partition("=")
+        if key.strip() and value.strip().isdigit():
+            mapping[key.strip()] = int(value)
+    return mapping
+
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-me")
+    # Identifies the deployed code in ETags and page cache keys; derived from the
+    # app and template files when unset.
+    BUILD_ID = os.getenv("BUILD_ID", "").strip()
 
     MONGODB_URI = os.getenv("MONGODB_URI", "")
     MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "archive")
+    MONGODB_CONNECT_MODE = os.getenv("MONGODB_CONNECT_MODE", "eager").strip().lower()
+    MONGODB_AUTO_MIGRATE = env_bool("MONGODB_AUTO_MIGRATE", True)
+    MONGODB_WARMUP_MAX_BACKOFF_SECONDS = float(os.getenv("MONGODB_WARMUP_MAX_BACKOFF_SECONDS", "60"))
     MONGODB_TLS = env_bool("MONGODB_TLS", True)
     MONGODB_TLS_CA_FILE = os.getenv("MONGODB_TLS_CA_FILE", "").strip()
     MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "20000"))
     MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "20000"))
     MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "30000"))
+    MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+    MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+    MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+    MONGODB_COMPRESSORS = [name.strip() for name in os.getenv("MONGODB_COMPRESSORS", "zlib").split(",") if name.strip()]
+    MONGODB_MAX_TIME_MS = int(os.getenv("MONGODB_MAX_TIME_MS", "5000"))
+    MONGODB_PUBLIC_READ_PREFERENCE = os.getenv("MONGODB_PUBLIC_READ_PREFERENCE", "primary").strip()
+    MONGODB_PUBLIC_READ_MAX_STALENESS_SECONDS = int(os.getenv("MONGODB_PUBLIC_READ_MAX_STALENESS_SECONDS", "0"))
+
+    QUERY_PROFILER_ENABLED = env_bool("QUERY_PROFILER_ENABLED", True)
+    QUERY_PROFILER_SERVER_TIMING = env_bool("QUERY_PROFILER_SERVER_TIMING", False)
+    QUERY_PROFILER_DEBUG_FOOTER = env_bool("QUERY_PROFILER_DEBUG_FOOTER", False)
+    QUERY_BUDGET_COUNT = int(os.getenv("QUERY_BUDGET_COUNT", "25"))
+    QUERY_BUDGET_MS = float(os.getenv("QUERY_BUDGET_MS", "250"))
+
+    METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+    # Shared by every worker of one instance so a scrape reports instance totals.
+    # Files left by dead workers are removed at startup; set it empty to report
+    # only the worker that answers the scrape.
+    METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "nchydev-metrics")).strip()
+    METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "10"))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
 
     ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "").strip()
     ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "")
     ADMIN_BOOTSTRAP_TOKEN = os.getenv("ADMIN_BOOTSTRAP_TOKEN", "")
+    ADMIN_PASSWORD_HASH_ROUNDS = int(os.getenv("ADMIN_PASSWORD_HASH_ROUNDS", "29000"))
 
     SESSION_COOKIE_SECURE = env_bool("SESSION_COOKIE_SECURE", False)
     SESSION_COOKIE_HTTPONLY = env_bool("SESSION_COOKIE_HTTPONLY", True)
@@ -37,8 +77,45 @@ class Config:
     WTF_CSRF_TIME_LIMIT = None
 
     LOGIN_RATE_LIMIT = os.getenv("LOGIN_RATE_LIMIT", "5 per minute")
+    # Number of reverse proxies in front of the app that append to X-Forwarded-For.
+    # 0 trusts the socket address only; the header is client-controlled otherwise.
+    PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", "0"))
     RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+    LOGIN_THROTTLE_IP_LIMIT = int(os.getenv("LOGIN_THROTTLE_IP_LIMIT", "20"))
+    LOGIN_THROTTLE_IP_WINDOW_SECONDS = int(os.getenv("LOGIN_THROTTLE_IP_WINDOW_SECONDS", "900"))
+    LOGIN_THROTTLE_USERNAME_LIMIT = int(os.getenv("LOGIN_THROTTLE_USERNAME_LIMIT", "5"))
+    LOGIN_THROTTLE_USERNAME_WINDOW_SECONDS = int(os.getenv("LOGIN_THROTTLE_USERNAME_WINDOW_SECONDS", "900"))
+    HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "15"))
     JSON_SORT_KEYS = False
+    # Anchors follow the books content version; the TTL only catches writes that bypass the app.
+    BOOKS_PAGE_ANCHOR_TTL_SECONDS = int(os.getenv("BOOKS_PAGE_ANCHOR_TTL_SECONDS", "86400"))
+    COUNT_CACHE_TTL_SECONDS = int(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+    COLLECTION_STATS_RECONCILE_SECONDS = int(os.getenv("COLLECTION_STATS_RECONCILE_SECONDS", "3600"))
+    CONTENT_VERSION_CACHE_TTL_SECONDS = float(os.getenv("CONTENT_VERSION_CACHE_TTL_SECONDS", "2"))
+
+    PAGE_CACHE_BACKEND = os.getenv("PAGE_CACHE_BACKEND", "memory").strip().lower()
+    PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", "").strip()
+    PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "256"))
+    PAGE_CACHE_TTL_SECONDS = int(os.getenv("PAGE_CACHE_TTL_SECONDS", "300"))
+    MEDIA_CACHE_DIR = os.getenv("MEDIA_CACHE_DIR", "").strip()
+    MEDIA_CACHE_MAX_BYTES = int(os.getenv("MEDIA_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    MEDIA_CACHE_MAX_FILE_BYTES = int(os.getenv("MEDIA_CACHE_MAX_FILE_BYTES", str(32 * 1024 * 1024)))
+    USE_X_SENDFILE = env_bool("USE_X_SENDFILE", False)
+    AUDIT_BUFFER_ENABLED = env_bool("AUDIT_BUFFER_ENABLED", True)
+    AUDIT_BUFFER_MAX_EVENTS = int(os.getenv("AUDIT_BUFFER_MAX_EVENTS", "1000"))
+    AUDIT_BUFFER_BATCH_SIZE = int(os.getenv("AUDIT_BUFFER_BATCH_SIZE", "100"))
+    AUDIT_BUFFER_FLUSH_SECONDS = float(os.getenv("AUDIT_BUFFER_FLUSH_SECONDS", "2"))
+    # Audit rows are kept forever unless retention is set, e.g. AUDIT_RETENTION_DAYS=365 and
+    # AUDIT_RETENTION_DAYS_BY_ACTION=auth.login_failed=90. Expired rows are deleted by a TTL index.
+    AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "0"))
+    AUDIT_RETENTION_DAYS_BY_ACTION = env_int_mapping("AUDIT_RETENTION_DAYS_BY_ACTION")
+    AUDIT_ROLLUP_HOURLY_RETENTION_DAYS = int(os.getenv("AUDIT_ROLLUP_HOURLY_RETENTION_DAYS", "14"))
+    JOBS_MODE = os.getenv("JOBS_MODE", "thread").strip().lower()
+    JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+    JOBS_LEASE_SECONDS = int(os.getenv("JOBS_LEASE_SECONDS", "300"))
+    JOBS_RETRY_BASE_SECONDS = int(os.getenv("JOBS_RETRY_BASE_SECONDS", "30"))
+    JOBS_POLL_INTERVAL_SECONDS = float(os.getenv("JOBS_POLL_INTERVAL_SECONDS", "5"))
+    JOBS_RETENTION_SECONDS = int(os.getenv("JOBS_RETENTION_SECONDS", str(7 * 24 * 3600)))
     OPEN_BOOK_API_BASE_URL = os.getenv("OPEN_BOOK_API_BASE_URL", "https://openlibrary.org").strip()
     OPEN_BOOK_API_KEY = os.getenv("OPEN_BOOK_API_KEY", "").strip()
 
@@ -47,3 +124,8 @@ class TestConfig(Config):
     TESTING = True
     WTF_CSRF_ENABLED = False
     SESSION_COOKIE_SECURE = False
+    MEDIA_CACHE_MAX_BYTES = 0
+    JOBS_MODE = "inline"
+    AUDIT_BUFFER_ENABLED = False
+    HEALTH_CHECK_INTERVAL_SECONDS = 0
+    METRICS_DIR = ""
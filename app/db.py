@@ -1,13 +1,40 @@
+import threading
+import time
+from datetime import datetime, timezone
+
 import certifi
 
+import pymongo
 from pymongo import ASCENDING, DESCENDING, TEXT, MongoClient
-from pymongo.errors import PyMongoError
+from pymongo.errors import InvalidOperation, PyMongoError
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
 from pymongo.server_api import ServerApi
 
-from flask import current_app
+from flask import current_app, g, request
+
+from .metrics import METRICS_LISTENER
+from .query_profiler import QUERY_LISTENER
+
+# Bump whenever ensure_schema changes so deployed databases pick up the new indexes.
+SCHEMA_VERSION = 2
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primarypreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondarypreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
 
 
 def init_db(app):
+    """Create the MongoDB client.
+
+    With ``MONGODB_CONNECT_MODE=eager`` the first ping (and schema check) happens
+    here and a failure disables MongoDB-backed features. With ``lazy`` the client
+    is only constructed — pymongo connects in the background — and
+    :func:`start_db_warmup` does the ping and schema check off the boot path.
+    """
     uri = app.config.get("MONGODB_URI", "")
     db_name = app.config.get("MONGODB_DB_NAME", "archive")
 
@@ -15,6 +42,7 @@ def init_db(app):
         app.logger.warning("MONGODB_URI is not set. MongoDB-backed features are unavailable.")
         app.extensions["mongo_client"] = None
         app.extensions["mongo_db"] = None
+        app.extensions["mongo_read_db"] = None
         return
 
     try:
@@ -23,8 +51,24 @@ def init_db(app):
             "connectTimeoutMS": app.config.get("MONGODB_CONNECT_TIMEOUT_MS", 20000),
             "socketTimeoutMS": app.config.get("MONGODB_SOCKET_TIMEOUT_MS", 20000),
             "serverSelectionTimeoutMS": app.config.get("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 30000),
+            "maxPoolSize": app.config.get("MONGODB_MAX_POOL_SIZE", 100),
+            "minPoolSize": app.config.get("MONGODB_MIN_POOL_SIZE", 0),
+            "waitQueueTimeoutMS": app.config.get("MONGODB_WAIT_QUEUE_TIMEOUT_MS", 0) or None,
+            "maxIdleTimeMS": app.config.get("MONGODB_MAX_IDLE_TIME_MS", 0) or None,
         }
 
+        event_listeners = []
+        if app.config.get("QUERY_PROFILER_ENABLED", True):
+            event_listeners.append(QUERY_LISTENER)
+        if app.config.get("METRICS_ENABLED", True):
+            event_listeners.append(METRICS_LISTENER)
+        if event_listeners:
+            client_options["event_listeners"] = event_listeners
+
+        compressors = [name for name in app.config.get("MONGODB_COMPRESSORS", []) if name]
+        if compressors:
+            client_options["compressors"] = compressors
+
         if app.config.get("MONGODB_TLS", True):
             ca_file = app.config.get("MONGODB_TLS_CA_FILE") or certifi.where()
             client_options.update(
@@ -35,23 +79,185 @@ def init_db(app):
             )
 
         client = MongoClient(uri, **client_options)
-        client.admin.command("ping")
         db = client[db_name]
-
         app.extensions["mongo_client"] = client
         app.extensions["mongo_db"] = db
-        ensure_indexes(db)
+        app.extensions["mongo_read_db"] = db.with_options(read_preference=public_read_preference(app.config))
+        if _may_lag(app.extensions["mongo_read_db"]):
+            app.logger.warning(
+                "MONGODB_PUBLIC_READ_PREFERENCE=%s: public pages may lag the primary, so the page cache "
+                "and ETag revalidation are disabled for them",
+                app.config.get("MONGODB_PUBLIC_READ_PREFERENCE"),
+            )
+        _register_query_deadline(app)
+
+        if _connect_mode(app) == "lazy":
+            app.logger.info("MongoDB client for '%s' created; connecting in the background", db_name)
+            return
+
+        client.admin.command("ping")
+        _migrate_on_start(app, db)
         app.logger.info("Connected to MongoDB database '%s'", db_name)
     except PyMongoError as exc:
         app.logger.exception("Unable to connect to MongoDB: %s", exc)
         app.extensions["mongo_client"] = None
         app.extensions["mongo_db"] = None
+        app.extensions["mongo_read_db"] = None
+
+
+def public_read_preference(config):
+    """Read preference for public pages, from ``MONGODB_PUBLIC_READ_PREFERENCE``."""
+    name = (config.get("MONGODB_PUBLIC_READ_PREFERENCE") or "primary").replace("_", "").lower()
+    preference = READ_PREFERENCES.get(name)
+    if preference is None:
+        raise ValueError(f"Unknown MONGODB_PUBLIC_READ_PREFERENCE: {name}")
+    if preference is Primary:
+        return Primary()
+    max_staleness = config.get("MONGODB_PUBLIC_READ_MAX_STALENESS_SECONDS", -1)
+    return preference(max_staleness=max_staleness if max_staleness and max_staleness > 0 else -1)
+
+
+def without_query_deadline(view):
+    """Exempt a view from ``MONGODB_MAX_TIME_MS`` (e.g. one that streams large blobs)."""
+    view.without_query_deadline = True
+    return view
+
+
+def _register_query_deadline(app):
+    if app.extensions.get("mongo_query_deadline"):
+        return
+    app.extensions["mongo_query_deadline"] = True
+
+    @app.before_request
+    def start_query_deadline():
+        max_time_ms = current_app.config.get("MONGODB_MAX_TIME_MS", 0)
+        if not max_time_ms or request.method not in {"GET", "HEAD"}:
+            return
+        view = current_app.view_functions.get(request.endpoint)
+        if getattr(view, "without_query_deadline", False):
+            return
+        # pymongo sends the remaining budget as maxTimeMS on every operation and
+        # gives up client-side once it is spent, so a slow query cannot hold a worker.
+        deadline = pymongo.timeout(max_time_ms / 1000)
+        deadline.__enter__()
+        g._mongo_query_deadline = deadline
+
+    @app.teardown_request
+    def end_query_deadline(exc=None):
+        deadline = g.pop("_mongo_query_deadline", None)
+        if deadline is not None:
+            deadline.__exit__(None, None, None)
+
+
+def start_db_warmup(app, on_ready=None):
+    """Run ``on_ready(app)`` once MongoDB answers, in a background thread in lazy mode."""
+    db = app.extensions.get("mongo_db")
+    if db is None:
+        return
+
+    if _connect_mode(app) != "lazy":
+        if on_ready is not None:
+            on_ready(app)
+        return
+
+    threading.Thread(target=_warm_up, args=(app, db, on_ready), name="mongo-warmup", daemon=True).start()
+
+
+def _warm_up(app, db, on_ready=None, sleep=time.sleep):
+    # Keep pinging with capped exponential backoff: a worker that boots while
+    # MongoDB is briefly unreachable must still migrate and bootstrap later.
+    delay = 1.0
+    max_delay = app.config.get("MONGODB_WARMUP_MAX_BACKOFF_SECONDS", 60)
+    while True:
+        try:
+            db.client.admin.command("ping")
+            break
+        except InvalidOperation:
+            # The client was closed (shutdown or tests); nothing left to warm up.
+            return
+        except PyMongoError as exc:
+            app.logger.warning("MongoDB is not reachable yet, retrying in %ss: %s", delay, exc)
+        sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+    with app.app_context():
+        _migrate_on_start(app, db)
+        if on_ready is not None:
+            on_ready(app)
+    app.logger.info("Connected to MongoDB database '%s'", db.name)
+
+
+def _connect_mode(app) -> str:
+    return (app.config.get("MONGODB_CONNECT_MODE") or "eager").strip().lower()
+
+
+def _migrate_on_start(app, db):
+    if not app.config.get("MONGODB_AUTO_MIGRATE", True):
+        return
+    try:
+        if ensure_schema(db):
+            app.logger.info("MongoDB indexes migrated to schema version %s", SCHEMA_VERSION)
+    except PyMongoError as exc:
+        app.logger.warning("MongoDB schema migration failed: %s", exc)
+
+
+def ensure_schema(db, force: bool = False) -> bool:
+    """Create indexes unless ``schema_migrations`` already records ``SCHEMA_VERSION``.
+
+    Returns ``True`` when indexes were (re)created. A worker booting against an
+    up-to-date database pays a single ``find_one`` instead of every
+    ``create_index`` round trip.
+    """
+    if not force:
+        current = db.schema_migrations.find_one({"_id": "indexes"}) or {}
+        if int(current.get("version") or 0) >= SCHEMA_VERSION:
+            return False
+
+    # Imported here: the repositories package imports this module.
+    from .repositories.audit_rollup_repo import AuditRollupRepository
+
+    ensure_indexes(db)
+    if db.audit_logs.find_one({}, {"_id": 1}) is None:
+        # Nothing logged yet, so the rollups are complete from the first event.
+        # Existing logs wait for tools/maintenance/rebuild_audit_rollups.py.
+        AuditRollupRepository(db).mark_complete()
+    db.schema_migrations.update_one(
+        {"_id": "indexes"},
+        {"$set": {"version": SCHEMA_VERSION, "applied_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+    return True
 
 
 def get_db():
     return current_app.extensions.get("mongo_db")
 
 
+def get_read_db():
+    """Database handle for public, read-only pages.
+
+    Uses ``MONGODB_PUBLIC_READ_PREFERENCE`` (primary by default). A secondary
+    preference keeps anonymous traffic off the primary, but reads may then lag
+    recent admin writes by the replication delay; admin views and anything that
+    writes use :func:`get_db`.
+    """
+    read_db = current_app.extensions.get("mongo_read_db")
+    return read_db if read_db is not None else get_db()
+
+
+def public_reads_may_lag() -> bool:
+    """Whether :func:`get_read_db` may answer from a secondary.
+
+    Content versions are always read from the primary, so a page rendered from a
+    lagging secondary must not be stored or validated under the new version.
+    """
+    return _may_lag(current_app.extensions.get("mongo_read_db"))
+
+
+def _may_lag(read_db) -> bool:
+    return read_db is not None and read_db.read_preference.mode != Primary().mode
+
+
 def db_is_ready() -> bool:
     return get_db() is not None
 
@@ -59,6 +265,7 @@ def db_is_ready() -> bool:
 def ensure_indexes(db):
     db.books.create_index([("slug", ASCENDING)], unique=True)
     db.books.create_index([("title", TEXT), ("authors", TEXT)], name="books_text_search")
+    db.books.create_index([("search_tokens", ASCENDING)])
     db.books.create_index([("updated_at", DESCENDING)])
     db.reading_list.create_index([("book_id", ASCENDING)], unique=True)
     db.reading_list.create_index([("created_at", DESCENDING)])
@@ -74,9 +281,22 @@ def ensure_indexes(db):
     db.certifications.create_index([("is_published", ASCENDING)])
 
     db.admin_users.create_index([("username", ASCENDING)], unique=True)
+    db.app_locks.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+    db.login_throttle.create_index([("key", ASCENDING), ("at", DESCENDING)])
+    db.login_throttle.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
 
     db.audit_logs.create_index([("timestamp", DESCENDING)])
     db.audit_logs.create_index([("action", ASCENDING), ("timestamp", DESCENDING)])
+    db.audit_logs.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+    db.audit_rollups.create_index([("period", ASCENDING), ("action", ASCENDING), ("dimension", ASCENDING), ("bucket", ASCENDING)])
+    db.audit_rollups.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
     db.notes_logs.create_index([("created_at", DESCENDING)])
     db.notes_logs.create_index([("is_published", ASCENDING)])
     db.site_settings.create_index([("key", ASCENDING)], unique=True)
+
+    db.jobs.create_index([("status", ASCENDING), ("run_at", ASCENDING)])
+    db.jobs.create_index([("status", ASCENDING), ("locked_until", ASCENDING)])
+    db.jobs.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+    for bucket in ("gallery_upload_blobs", "notes_audio_blobs", "research_pdf_blobs"):
+        db[f"{bucket}_chunks"].create_index([("files_id", ASCENDING), ("n", ASCENDING)], unique=True)
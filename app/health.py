@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from flask import current_app
+
+
+class HealthMonitor:
+    """Checks dependencies on a timer and keeps the latest result in memory.
+
+    Probes read :meth:`snapshot`, which never touches MongoDB itself once the
+    daemon thread has produced a result. With ``interval_seconds`` of ``0`` no
+    thread is started and every snapshot runs the checks inline. A result older
+    than two intervals means the thread is stuck (e.g. on a hung ping) and is
+    reported as ``degraded`` with ``stale`` set.
+    """
+
+    def __init__(self, app, interval_seconds: float = 15.0):
+        self.app = app
+        self.interval_seconds = interval_seconds
+        self._result: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid = None
+
+    def snapshot(self) -> dict[str, Any]:
+        if self.interval_seconds <= 0:
+            return self.refresh()
+        self._ensure_thread()
+        result = self._result
+        if result is None:
+            result = self.refresh()
+        age = (datetime.now(timezone.utc) - result["checked_at"]).total_seconds()
+        if age > 2 * self.interval_seconds:
+            return {**result, "status": "degraded", "stale": True}
+        return result
+
+    def refresh(self) -> dict[str, Any]:
+        """Run every check now and cache the result."""
+        with self._lock:
+            dependencies = {
+                "database": _timed(_check_database, self.app),
+                "media_cache": _timed(_check_media_cache, self.app),
+            }
+            healthy = dependencies["database"]["status"] == "up" and all(
+                dep["status"] != "down" for dep in dependencies.values()
+            )
+            result = {
+                "status": "ok" if healthy else "degraded",
+                "checked_at": datetime.now(timezone.utc),
+                "dependencies": dependencies,
+            }
+            self._result = result
+            return result
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            # Threads do not survive fork(), so each worker process starts its own.
+            if self._pid == os.getpid():
+                return
+            self._result = None
+            self._thread = threading.Thread(target=self._loop, name="health-monitor", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _loop(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                self.app.logger.exception("Health check failed")
+            time.sleep(self.interval_seconds)
+
+
+def _timed(check, app) -> dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        status, error = check(app)
+    except Exception as exc:
+        status, error = "down", str(exc)
+    result = {"status": status, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+    if error:
+        result["error"] = error
+    return result
+
+
+def _check_database(app) -> tuple[str, str | None]:
+    db = app.extensions.get("mongo_db")
+    if db is None:
+        return "unconfigured", None
+    db.command("ping")
+    return "up", None
+
+
+def _check_media_cache(app) -> tuple[str, str | None]:
+    cache = app.extensions.get("media_cache")
+    if cache is None:
+        return "disabled", None
+    with tempfile.NamedTemporaryFile(dir=cache.directory, prefix=".health-", suffix=".tmp"):
+        pass
+    return "up", None
+
+
+def configure_health(app):
+    app.extensions["health_monitor"] = HealthMonitor(
+        app,
+        interval_seconds=app.config.get("HEALTH_CHECK_INTERVAL_SECONDS", 15.0),
+    )
+
+
+def get_health_monitor() -> HealthMonitor:
+    return current_app.extensions["health_monitor"]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import traceback
+from typing import Any, Callable
+
+from flask import current_app
+
+from .repositories.jobs_repo import JobsRepository
+
+JobHandler = Callable[..., None]
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(name: str):
+    """Register ``func`` as the handler for jobs called ``name``."""
+
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue_job(name: str, **payload: Any):
+    """Run a side effect off the request path according to ``JOBS_MODE``.
+
+    ``inline`` runs the handler immediately (tests, local development), ``thread``
+    persists the job and wakes this process's background runner, and ``worker``
+    only persists it for ``tools/jobs/run_worker.py``. Without a database the
+    handler always runs inline.
+    """
+    if name not in _handlers:
+        raise ValueError(f"Unknown job: {name}")
+
+    mode = (current_app.config.get("JOBS_MODE") or "inline").strip().lower()
+    repo = JobsRepository(current_app.extensions.get("mongo_db"))
+    if mode == "inline" or not repo.available():
+        _handlers[name](**payload)
+        return None
+
+    job_id = repo.enqueue(name, payload, max_attempts=current_app.config.get("JOBS_MAX_ATTEMPTS", 5))
+    if mode == "thread":
+        _background_runner(current_app._get_current_object()).wake()
+    return job_id
+
+
+def configure_jobs(app):
+    mode = (app.config.get("JOBS_MODE") or "inline").strip().lower()
+    app.logger.info("Background jobs mode: %s", mode)
+    if mode != "thread":
+        return
+
+    @app.before_request
+    def _ensure_job_runner():
+        if app.extensions.get("mongo_db") is not None:
+            _background_runner(app)
+
+
+def run_pending_jobs(app, worker_id: str | None = None, max_jobs: int | None = None) -> int:
+    """Claim and run due jobs until the queue is empty (or ``max_jobs`` ran)."""
+    worker_id = worker_id or default_worker_id()
+    processed = 0
+    with app.app_context():
+        repo = JobsRepository(app.extensions.get("mongo_db"))
+        if not repo.available():
+            return 0
+
+        while max_jobs is None or processed < max_jobs:
+            job = repo.claim(worker_id, lease_seconds=app.config.get("JOBS_LEASE_SECONDS", 300))
+            if job is None:
+                break
+            processed += 1
+            _run_job(app, repo, job)
+    return processed
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _run_job(app, repo: JobsRepository, job: dict[str, Any]):
+    retention = app.config.get("JOBS_RETENTION_SECONDS", 7 * 24 * 3600)
+    handler = _handlers.get(job["name"])
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job {job['name']!r}")
+        # Handlers build media URLs with url_for, which needs a request context.
+        with app.test_request_context():
+            handler(**(job.get("payload") or {}))
+    except Exception as exc:
+        retry = repo.fail(
+            job,
+            "".join(traceback.format_exception_only(type(exc), exc)).strip(),
+            retry_base_seconds=app.config.get("JOBS_RETRY_BASE_SECONDS", 30),
+            retention_seconds=retention,
+        )
+        app.logger.warning(
+            "Job %s (%s) failed on attempt %s%s: %s",
+            job["_id"],
+            job["name"],
+            job.get("attempts"),
+            ", will retry" if retry else ", giving up",
+            exc,
+        )
+        return
+    repo.complete(job, retention_seconds=retention)
+
+
+class _BackgroundRunner:
+    """Daemon thread that drains the job queue for ``JOBS_MODE=thread``."""
+
+    def __init__(self, app):
+        self.app = app
+        self.pid = os.getpid()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="jobs-runner", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _loop(self):
+        worker_id = default_worker_id()
+        while True:
+            self._wake.wait(timeout=self.app.config.get("JOBS_POLL_INTERVAL_SECONDS", 5))
+            self._wake.clear()
+            try:
+                run_pending_jobs(self.app, worker_id=worker_id)
+            except Exception:
+                self.app.logger.exception("Background job runner iteration failed")
+
+
+_runner_lock = threading.Lock()
+
+
+def _background_runner(app) -> _BackgroundRunner:
+    with _runner_lock:
+        runner = app.extensions.get("jobs_runner")
+        # A runner inherited through fork() has no thread in this process.
+        if runner is None or runner.pid != os.getpid():
+            runner = _BackgroundRunner(app)
+            app.extensions["jobs_runner"] = runner
+        return runner
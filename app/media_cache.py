@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from flask import current_app
+
+
+class MediaDiskCache:
+    """Immutable media blobs copied to local disk so hot files skip MongoDB.
+
+    Each blob is stored as ``<hash>.blob`` with a ``<hash>.json`` manifest next to
+    it, where the hash is derived from the bucket and media id. Files are written
+    to a temporary name and renamed into place, so readers never see a partial
+    blob, and the directory is trimmed to ``max_bytes`` by evicting the least
+    recently served files first.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, max_file_bytes: int | None = None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes or max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._prune_lock = threading.Lock()
+
+    def get(self, bucket: str, media_id: str) -> tuple[Path, dict[str, Any]] | None:
+        blob_path, meta_path = self._paths(bucket, media_id)
+        try:
+            manifest = json.loads(meta_path.read_text(encoding="utf-8"))
+            os.utime(blob_path)
+        except (OSError, ValueError):
+            return None
+        return blob_path, _load_manifest(manifest)
+
+    def fill(self, bucket: str, media_id: str, manifest: dict[str, Any], chunks: Iterable[bytes]):
+        """Write a blob into the cache, returning ``(path, manifest)`` or ``None`` if skipped."""
+        for _ in self.fill_through(bucket, media_id, manifest, chunks):
+            pass
+        return self.get(bucket, media_id)
+
+    def fill_through(self, bucket: str, media_id: str, manifest: dict[str, Any], chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield ``chunks`` unchanged while copying them into the cache.
+
+        The blob is only published once every byte has been seen, so a client
+        that disconnects halfway leaves nothing behind.
+        """
+        length = int(manifest.get("length") or 0)
+        if length > self.max_file_bytes:
+            yield from chunks
+            return
+
+        blob_path, meta_path = self._paths(bucket, media_id)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        blob_temp = blob_path.with_name(blob_path.name + suffix)
+        meta_temp = meta_path.with_name(meta_path.name + suffix)
+        handle = None
+        written = 0
+        try:
+            try:
+                handle = blob_temp.open("wb")
+            except OSError as exc:
+                current_app.logger.warning("Unable to cache media %s/%s: %s", bucket, media_id, exc)
+            for chunk in chunks:
+                if handle is not None:
+                    try:
+                        handle.write(chunk)
+                        written += len(chunk)
+                    except OSError as exc:
+                        current_app.logger.warning("Unable to cache media %s/%s: %s", bucket, media_id, exc)
+                        handle.close()
+                        handle = None
+                yield chunk
+
+            if handle is None or written != length:
+                return
+            handle.close()
+            handle = None
+            try:
+                meta_temp.write_text(json.dumps(_dump_manifest(manifest)), encoding="utf-8")
+                os.replace(blob_temp, blob_path)
+                os.replace(meta_temp, meta_path)
+            except OSError as exc:
+                current_app.logger.warning("Unable to cache media %s/%s: %s", bucket, media_id, exc)
+                return
+            self._prune()
+        finally:
+            if handle is not None:
+                handle.close()
+            blob_temp.unlink(missing_ok=True)
+            meta_temp.unlink(missing_ok=True)
+
+    def discard(self, bucket: str, media_id: str):
+        for path in self._paths(bucket, media_id):
+            path.unlink(missing_ok=True)
+
+    def _paths(self, bucket: str, media_id: str) -> tuple[Path, Path]:
+        digest = hashlib.sha256(f"{bucket}:{media_id}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.blob", self.directory / f"{digest}.json"
+
+    def _prune(self):
+        with self._prune_lock:
+            entries = []
+            total = 0
+            for path in self.directory.glob("*.blob"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.with_suffix(".json").unlink(missing_ok=True)
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+def configure_media_cache(app):
+    max_bytes = app.config.get("MEDIA_CACHE_MAX_BYTES", 0)
+    cache = None
+    if max_bytes > 0:
+        directory = app.config.get("MEDIA_CACHE_DIR") or os.path.join(app.instance_path, "media_cache")
+        try:
+            cache = MediaDiskCache(directory, max_bytes, app.config.get("MEDIA_CACHE_MAX_FILE_BYTES"))
+        except OSError as exc:
+            app.logger.warning("Media cache directory unavailable, serving media from MongoDB: %s", exc)
+
+    app.extensions["media_cache"] = cache
+    app.logger.info("Media disk cache: %s", cache.directory if cache else "disabled")
+
+
+def get_media_cache() -> MediaDiskCache | None:
+    return current_app.extensions.get("media_cache")
+
+
+class CachingBlobReader:
+    """Reads a blob from MongoDB, copying full reads into the disk cache as they stream."""
+
+    def __init__(self, repo, cache: MediaDiskCache, bucket: str, media_id: str):
+        self.repo = repo
+        self.cache = cache
+        self.bucket = bucket
+        self.media_id = media_id
+
+    def iter_bytes(self, manifest: dict[str, Any], start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        chunks = self.repo.iter_bytes(manifest, start, end)
+        length = int(manifest.get("length") or 0)
+        if start != 0 or (end is not None and end < length - 1):
+            return chunks
+        return self.cache.fill_through(self.bucket, self.media_id, manifest, chunks)
+
+
+class FileBlobReader:
+    """Range reads over a cached blob file, mirroring ``ChunkedBlobRepository.iter_bytes``."""
+
+    def __init__(self, path: Path, block_size: int = 256 * 1024):
+        self.path = path
+        self.block_size = block_size
+
+    def iter_bytes(self, manifest: dict[str, Any], start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        length = int(manifest.get("length") or 0)
+        last = length - 1 if end is None else min(end, length - 1)
+        remaining = last - start + 1
+        with self.path.open("rb") as handle:
+            handle.seek(start)
+            while remaining > 0:
+                data = handle.read(min(self.block_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+
+def _dump_manifest(manifest: dict[str, Any]) -> dict[str, Any]:
+    uploaded_at = manifest.get("uploaded_at")
+    return {
+        "_id": str(manifest["_id"]),
+        "filename": manifest.get("filename", ""),
+        "content_type": manifest.get("content_type", ""),
+        "length": int(manifest.get("length") or 0),
+        "uploaded_at": uploaded_at.isoformat() if uploaded_at else None,
+    }
+
+
+def _load_manifest(data: dict[str, Any]) -> dict[str, Any]:
+    if data.get("uploaded_at"):
+        data["uploaded_at"] = datetime.fromisoformat(data["uploaded_at"])
+    return data
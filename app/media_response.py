@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import timezone
+from uuid import uuid4
+
+from flask import Response, request, send_file, stream_with_context
+
+from .media_cache import FileBlobReader
+
+MAX_BYTE_RANGES = 16
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def blob_response(repo, manifest: dict, mimetype: str | None = None, headers: dict | None = None) -> Response:
+    """Stream a stored blob, answering ``Range`` requests with ``206 Partial Content``.
+
+    Single ranges are sent as-is and multiple ranges as ``multipart/byteranges``;
+    either way only the chunks covering the requested bytes are read. Blobs never
+    change once written, so the manifest id doubles as a strong ETag.
+    """
+    length = int(manifest.get("length") or 0)
+    mimetype = mimetype or manifest.get("content_type") or "application/octet-stream"
+    etag = str(manifest["_id"])
+    last_modified = manifest.get("uploaded_at")
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    base_headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Accept-Ranges": "bytes", **(headers or {})}
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304, headers=base_headers)
+        response.set_etag(etag)
+        return response
+
+    ranges = _requested_ranges(length, etag, last_modified)
+    if ranges == []:
+        response = Response(status=416, headers=base_headers)
+        response.headers["Content-Range"] = f"bytes */{length}"
+        return response
+
+    if ranges is None:
+        response = _streamed(repo.iter_bytes(manifest), mimetype, base_headers, status=200)
+        response.content_length = length
+    elif len(ranges) == 1:
+        start, end = ranges[0]
+        response = _streamed(repo.iter_bytes(manifest, start, end), mimetype, base_headers, status=206)
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+        response.content_length = end - start + 1
+    else:
+        boundary = uuid4().hex
+        parts = [(_part_header(boundary, mimetype, start, end, length), start, end) for start, end in ranges]
+        closing = f"\r\n--{boundary}--\r\n".encode("ascii")
+
+        def generate():
+            for header, start, end in parts:
+                yield header
+                yield from repo.iter_bytes(manifest, start, end)
+            yield closing
+
+        response = _streamed(generate(), f"multipart/byteranges; boundary={boundary}", base_headers, status=206)
+        response.content_length = sum(len(header) + end - start + 1 for header, start, end in parts) + len(closing)
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def file_response(path, manifest: dict, mimetype: str | None = None, headers: dict | None = None) -> Response:
+    """Serve a blob cached on disk via ``send_file`` (``X-Sendfile`` when ``USE_X_SENDFILE`` is on).
+
+    ``send_file`` only handles single ranges, so multi-range requests are streamed
+    from the file through :func:`blob_response` instead.
+    """
+    if request.range is not None and len(request.range.ranges) > 1:
+        return blob_response(FileBlobReader(path), manifest, mimetype=mimetype, headers=headers)
+
+    last_modified = manifest.get("uploaded_at")
+    response = send_file(
+        path,
+        mimetype=mimetype or manifest.get("content_type") or "application/octet-stream",
+        conditional=True,
+        etag=str(manifest["_id"]),
+        last_modified=last_modified,
+    )
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    response.headers.update(headers or {})
+    return response
+
+
+def _streamed(chunks, mimetype: str, headers: dict, status: int) -> Response:
+    return Response(
+        stream_with_context(chunks),
+        status=status,
+        mimetype=mimetype,
+        headers=headers,
+        direct_passthrough=True,
+    )
+
+
+def _part_header(boundary: str, mimetype: str, start: int, end: int, length: int) -> bytes:
+    return (
+        f"\r\n--{boundary}\r\n"
+        f"Content-Type: {mimetype}\r\n"
+        f"Content-Range: bytes {start}-{end}/{length}\r\n\r\n"
+    ).encode("ascii")
+
+
+def _requested_ranges(length: int, etag: str, last_modified) -> list[tuple[int, int]] | None:
+    """Return inclusive byte ranges to send, ``None`` for the full body or ``[]`` if unsatisfiable."""
+    if request.method not in {"GET", "HEAD"} or request.range is None or request.range.units != "bytes":
+        return None
+    if not _if_range_matches(etag, last_modified):
+        return None
+
+    ranges = []
+    for start, stop in request.range.ranges:
+        if start < 0:
+            start, end = max(length + start, 0), length - 1
+        else:
+            end = length - 1 if stop is None else min(stop, length) - 1
+        if start <= end:
+            ranges.append((start, end))
+
+    if len(ranges) > MAX_BYTE_RANGES:
+        return None
+    return _coalesce(ranges)
+
+
+def _if_range_matches(etag: str, last_modified) -> bool:
+    if_range = request.if_range
+    if if_range.etag is not None:
+        return if_range.etag == etag
+    if if_range.date is not None:
+        return last_modified is not None and last_modified.replace(microsecond=0) == if_range.date
+    return True
+
+
+def _coalesce(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
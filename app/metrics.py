@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import atexit
+import hmac
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from flask import current_app, g, has_app_context, request
+from pymongo import monitoring
+
+from .auth import is_admin_authenticated
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    "http_requests_total": ("counter", "HTTP requests by endpoint, method and status."),
+    "http_request_duration_seconds": ("histogram", "Time spent handling HTTP requests, excluding streamed bodies."),
+    "mongodb_commands_total": ("counter", "MongoDB commands by command name and outcome."),
+    "mongodb_command_duration_seconds": ("histogram", "MongoDB command round-trip time."),
+    "page_cache_requests_total": ("counter", "Page cache lookups by result."),
+    "media_cache_requests_total": ("counter", "Media disk cache lookups by result."),
+    "media_bytes_served_total": ("counter", "Media response bytes by endpoint."),
+    "login_throttled_total": ("counter", "Admin login attempts rejected by the failed-login throttle."),
+    "external_request_duration_seconds": ("histogram", "Outbound HTTP calls by service and outcome."),
+}
+
+MEDIA_ENDPOINTS = frozenset({"main.gallery_media", "main.notes_audio_media", "main.research_pdf_media"})
+
+
+class MetricsRegistry:
+    """Counters and histograms for one process.
+
+    With a ``directory`` every process also writes its values to its own JSON
+    file there, and :meth:`render` sums all files, so whichever gunicorn worker
+    answers a scrape reports totals for the whole instance. Files of workers
+    that are no longer running are removed when a registry is created.
+    """
+
+    def __init__(self, directory: str | Path | None = None, flush_seconds: float = 10.0):
+        self.directory = Path(directory) if directory else None
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], list[float]] = {}
+        self._pid = None
+        self._path: Path | None = None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._remove_dead_worker_files()
+            atexit.register(self.flush)
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_process()
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_process()
+            # One count per bucket (the last is +Inf), then sum and count.
+            series = self._histograms.get(key)
+            if series is None:
+                series = [0.0] * (len(DURATION_BUCKETS) + 3)
+                self._histograms[key] = series
+            index = next((i for i, bound in enumerate(DURATION_BUCKETS) if value <= bound), len(DURATION_BUCKETS))
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": [[name, dict(labels), value] for (name, labels), value in self._counters.items()],
+                "histograms": [[name, dict(labels), list(series)] for (name, labels), series in self._histograms.items()],
+            }
+
+    def flush(self):
+        """Write this process's values to its file in ``directory``."""
+        if self.directory is None:
+            return
+        with self._lock:
+            self._check_process()
+            path = self._path
+        temp = path.with_suffix(".tmp")
+        try:
+            temp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+            os.replace(temp, path)
+        except OSError:
+            temp.unlink(missing_ok=True)
+
+    def render(self) -> str:
+        counters: dict[tuple[str, tuple], float] = {}
+        histograms: dict[tuple[str, tuple], list[float]] = {}
+        for snapshot in self._snapshots():
+            for name, labels, value in snapshot.get("counters", []):
+                key = (name, _label_key(labels))
+                counters[key] = counters.get(key, 0.0) + value
+            for name, labels, series in snapshot.get("histograms", []):
+                key = (name, _label_key(labels))
+                merged = histograms.setdefault(key, [0.0] * len(series))
+                for index, value in enumerate(series):
+                    merged[index] += value
+        return _exposition(counters, histograms)
+
+    def _snapshots(self) -> list[dict[str, Any]]:
+        if self.directory is None:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in sorted(self.directory.glob("metrics-*.json")):
+            try:
+                snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def _check_process(self):
+        # Values inherited across fork() belong to the parent's file, so each
+        # worker starts from zero with a file of its own.
+        if self._pid == os.getpid():
+            return
+        if self._pid is not None:
+            self._counters.clear()
+            self._histograms.clear()
+        self._pid = os.getpid()
+        if self.directory is not None:
+            self._path = self.directory / f"metrics-{self._pid}-{uuid.uuid4().hex[:8]}.json"
+            threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+
+    def _remove_dead_worker_files(self):
+        for path in self.directory.glob("metrics-*"):
+            try:
+                pid = int(path.name.split("-")[1])
+            except (IndexError, ValueError):
+                continue
+            if not _pid_alive(pid):
+                path.unlink(missing_ok=True)
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+
+class MetricsCommandListener(monitoring.CommandListener):
+    """Feeds every MongoDB command, including background ones, into the metrics."""
+
+    def __init__(self):
+        self.registry: MetricsRegistry | None = None
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, "ok")
+
+    def failed(self, event):
+        self._record(event, "error")
+
+    def _record(self, event, outcome: str):
+        registry = self.registry
+        if registry is None:
+            return
+        registry.inc("mongodb_commands_total", command=event.command_name, outcome=outcome)
+        registry.observe("mongodb_command_duration_seconds", event.duration_micros / 1_000_000, command=event.command_name)
+
+
+METRICS_LISTENER = MetricsCommandListener()
+
+
+def configure_metrics(app):
+    registry = None
+    if app.config.get("METRICS_ENABLED", True):
+        directory = app.config.get("METRICS_DIR") or None
+        try:
+            registry = MetricsRegistry(directory, flush_seconds=app.config.get("METRICS_FLUSH_SECONDS", 10.0))
+        except OSError as exc:
+            app.logger.warning("Metrics directory unavailable, reporting this process only: %s", exc)
+            registry = MetricsRegistry()
+    app.extensions["metrics"] = registry
+    METRICS_LISTENER.registry = registry
+    if registry is None:
+        return
+
+    @app.before_request
+    def start_request_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop("_metrics_started", None)
+        endpoint = request.endpoint or "unmatched"
+        registry.inc("http_requests_total", endpoint=endpoint, method=request.method, status=str(response.status_code))
+        if started is not None:
+            registry.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - started,
+                endpoint=endpoint,
+                method=request.method,
+            )
+        if endpoint in MEDIA_ENDPOINTS and response.content_length:
+            registry.inc("media_bytes_served_total", response.content_length, endpoint=endpoint)
+        return response
+
+
+def get_metrics() -> MetricsRegistry | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("metrics")
+
+
+def metrics_authorized() -> bool:
+    """Whether the request may see metrics: an admin session or the ``METRICS_TOKEN`` bearer."""
+    if is_admin_authenticated():
+        return True
+    token = current_app.config.get("METRICS_TOKEN", "")
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def count(name: str, value: float = 1.0, **labels):
+    registry = get_metrics()
+    if registry is not None:
+        registry.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    registry = get_metrics()
+    if registry is not None:
+        registry.observe(name, value, **labels)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # EPERM: the process exists but belongs to someone else.
+        return True
+    return True
+
+
+def _label_key(labels: dict[str, Any]) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _exposition(counters: dict, histograms: dict) -> str:
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        if kind == "counter":
+            series = sorted((labels, value) for (metric, labels), value in counters.items() if metric == name)
+        else:
+            series = sorted((labels, value) for (metric, labels), value in histograms.items() if metric == name)
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in series:
+            if kind == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0.0
+            for bound, bucket_count in zip([*DURATION_BUCKETS, "+Inf"], value[:-2]):
+                cumulative += bucket_count
+                le = bound if isinstance(bound, str) else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {_format_value(cumulative)}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {_format_value(value[-1])}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
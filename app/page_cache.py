@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+
+from flask import current_app, make_response, request, session
+
+from .auth import is_admin_authenticated
+from .conditional import release_signature
+from .db import get_db, public_reads_may_lag
+from .metrics import count
+from .repositories.content_version_repo import ContentVersionRepository
+
+
+class MemoryPageCacheBackend:
+    """Per-process LRU of rendered pages."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, page = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return page
+
+    def set(self, key: str, page: dict, ttl_seconds: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, page)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FilesystemPageCacheBackend:
+    """Rendered pages stored as files so every worker on the host shares them."""
+
+    def __init__(self, directory: str | Path, max_entries: int = 1024):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str):
+        try:
+            with self._path(key).open("rb") as handle:
+                header = json.loads(handle.readline())
+                if header.get("expires_at", 0) <= time.time():
+                    return None
+                header["body"] = handle.read()
+        except (OSError, ValueError):
+            return None
+        return header
+
+    def set(self, key: str, page: dict, ttl_seconds: float):
+        header = {name: value for name, value in page.items() if name != "body"}
+        header["expires_at"] = time.time() + ttl_seconds
+
+        path = self._path(key)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with temp_path.open("wb") as handle:
+                handle.write(json.dumps(header).encode("utf-8") + b"\n")
+                handle.write(page["body"])
+            os.replace(temp_path, path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return
+        self._prune()
+
+    def clear(self):
+        for path in self.directory.glob("*.page"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.page"
+
+    def _prune(self):
+        paths = list(self.directory.glob("*.page"))
+        if len(paths) <= self.max_entries:
+            return
+
+        def mtime(path):
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0
+
+        for path in sorted(paths, key=mtime)[: len(paths) - self.max_entries]:
+            path.unlink(missing_ok=True)
+
+
+def configure_page_cache(app):
+    backend_name = (app.config.get("PAGE_CACHE_BACKEND") or "none").strip().lower()
+    max_entries = app.config.get("PAGE_CACHE_MAX_ENTRIES", 256)
+
+    if backend_name == "memory":
+        backend = MemoryPageCacheBackend(max_entries=max_entries)
+    elif backend_name == "filesystem":
+        directory = app.config.get("PAGE_CACHE_DIR") or os.path.join(app.instance_path, "page_cache")
+        try:
+            backend = FilesystemPageCacheBackend(directory, max_entries=max_entries)
+        except OSError as exc:
+            app.logger.warning("Page cache directory unavailable, falling back to memory: %s", exc)
+            backend = MemoryPageCacheBackend(max_entries=max_entries)
+    else:
+        backend = None
+
+    app.extensions["page_cache"] = backend
+    app.logger.info("Page cache backend: %s", type(backend).__name__ if backend else "disabled")
+
+
+def cached_page(collections: tuple[str, ...] = (), args: tuple[str, ...] = ()):
+    """Serve anonymous GETs of a view from the page cache.
+
+    The cache key combines the endpoint, the listed query args and the current
+    generation of every collection the page renders, so an admin write that bumps
+    a collection's version makes older entries unreachable.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*view_args, **view_kwargs):
+            backend = current_app.extensions.get("page_cache")
+            if backend is None or not _cacheable_request():
+                return view(*view_args, **view_kwargs)
+
+            key = _page_key(collections, args, view_kwargs)
+            page = backend.get(key)
+            count("page_cache_requests_total", result="hit" if page is not None else "miss")
+            if page is not None:
+                response = current_app.response_class(
+                    page["body"],
+                    status=page["status"],
+                    content_type=page["content_type"],
+                )
+                response.headers["X-Page-Cache"] = "hit"
+                return response
+
+            response = make_response(view(*view_args, **view_kwargs))
+            if response.status_code == 200 and not response.direct_passthrough and "Set-Cookie" not in response.headers:
+                backend.set(
+                    key,
+                    {
+                        "status": response.status_code,
+                        "content_type": response.content_type,
+                        "body": response.get_data(),
+                    },
+                    ttl_seconds=current_app.config.get("PAGE_CACHE_TTL_SECONDS", 300),
+                )
+            response.headers["X-Page-Cache"] = "miss"
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+def _cacheable_request() -> bool:
+    if request.method not in {"GET", "HEAD"}:
+        return False
+    # Admins see admin-only chrome and pending flash messages must reach the visitor.
+    if is_admin_authenticated() or session.get("_flashes"):
+        return False
+    # A page read from a lagging secondary would be cached under the new version.
+    return not public_reads_may_lag()
+
+
+def _page_key(collections: tuple[str, ...], args: tuple[str, ...], view_kwargs: dict) -> str:
+    versions = ContentVersionRepository(get_db()).get_versions(collections)
+    parts = [
+        request.endpoint or request.path,
+        json.dumps(view_kwargs, sort_keys=True, default=str),
+        json.dumps({name: (request.args.get(name) or "").strip() for name in args}, sort_keys=True),
+        json.dumps({name: versions.get(name, {}).get("version", 0) for name in collections}, sort_keys=True),
+        json.dumps(release_signature(), sort_keys=True),
+    ]
+    return "|".join(parts)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from collections import Counter
+from typing import Any
+
+from flask import current_app, g, request
+from pymongo import monitoring
+
+from .metrics import metrics_authorized
+
+
+class RequestQueryStats:
+    """MongoDB commands issued while serving one request."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.count = 0
+        self.failed = 0
+        self.duration_ms = 0.0
+        self.by_collection: Counter[str] = Counter()
+        self.slowest: tuple[float, str] | None = None
+        self._pending: dict[int, str] = {}
+
+    def start(self, request_id: int, label: str):
+        self._pending[request_id] = label
+
+    def finish(self, request_id: int, duration_ms: float, failed: bool = False):
+        label = self._pending.pop(request_id, None)
+        if label is None:
+            return
+        self.count += 1
+        self.failed += int(failed)
+        self.duration_ms += duration_ms
+        self.by_collection[label] += 1
+        if self.slowest is None or duration_ms > self.slowest[0]:
+            self.slowest = (duration_ms, label)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "failed": self.failed,
+            "duration_ms": round(self.duration_ms, 2),
+            "by_collection": dict(self.by_collection.most_common()),
+            "slowest": {"duration_ms": round(self.slowest[0], 2), "command": self.slowest[1]} if self.slowest else None,
+        }
+
+
+_current_stats: contextvars.ContextVar[RequestQueryStats | None] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+
+class QueryProfilerListener(monitoring.CommandListener):
+    """Attributes pymongo command events to the request that issued them.
+
+    pymongo publishes command events on the thread running the operation, so a
+    context variable set for the request is enough; commands from background
+    threads (jobs, audit sink, health checks) are not counted.
+    """
+
+    def started(self, event):
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.start(event.request_id, _command_label(event.command_name, event.command))
+
+    def succeeded(self, event):
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.finish(event.request_id, event.duration_micros / 1000)
+
+    def failed(self, event):
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.finish(event.request_id, event.duration_micros / 1000, failed=True)
+
+
+QUERY_LISTENER = QueryProfilerListener()
+
+
+def _command_label(command_name: str, command) -> str:
+    target = command.get(command_name)
+    if command_name == "getMore":
+        target = command.get("collection")
+    if isinstance(target, str):
+        return f"{target}.{command_name}"
+    return command_name
+
+
+def current_query_stats() -> RequestQueryStats | None:
+    return _current_stats.get()
+
+
+def configure_query_profiler(app):
+    if not app.config.get("QUERY_PROFILER_ENABLED", True):
+        return
+
+    @app.before_request
+    def start_query_profile():
+        g._query_stats_token = _current_stats.set(RequestQueryStats())
+
+    @app.after_request
+    def report_query_profile(response):
+        stats = _current_stats.get()
+        if stats is None:
+            return response
+
+        config = current_app.config
+        # Query counts and timings describe the backend, so only operators see them.
+        if config.get("QUERY_PROFILER_SERVER_TIMING", False) and metrics_authorized():
+            timing = f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries"'
+            existing = response.headers.get("Server-Timing")
+            response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        count_budget = config.get("QUERY_BUDGET_COUNT", 0)
+        time_budget = config.get("QUERY_BUDGET_MS", 0)
+        if (count_budget and stats.count > count_budget) or (time_budget and stats.duration_ms > time_budget):
+            current_app.logger.warning(
+                "Query budget exceeded on %s %s: %s",
+                request.method,
+                request.path,
+                stats.summary(),
+            )
+        return response
+
+    @app.teardown_request
+    def end_query_profile(exc=None):
+        token = g.pop("_query_stats_token", None)
+        if token is not None:
+            _current_stats.reset(token)
+
+    @app.context_processor
+    def inject_query_profile():
+        if not app.config.get("QUERY_PROFILER_DEBUG_FOOTER", False):
+            return {}
+        return {"query_profile": current_query_stats}
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any, Callable, TypeVar
+
+from flask import g, has_app_context
+
+from .db import get_db
+
+T = TypeVar("T")
+
+_REQUEST_SCOPED = ("_services", "_identity_maps")
+
+
+def request_service(factory: Callable[[Any], T], db=None) -> T:
+    """Return this request's ``factory(db)``, building it on first use.
+
+    Services and their repositories only hold collection handles, so one
+    instance per request (per database handle) is shared by every helper and
+    view that asks for it. Outside an app context a fresh instance is returned.
+    """
+    if db is None:
+        db = get_db()
+    if not has_app_context():
+        return factory(db)
+
+    services = g.setdefault("_services", {})
+    key = (factory, id(db))
+    instance = services.get(key)
+    if instance is None:
+        instance = factory(db)
+        services[key] = instance
+    return instance
+
+
+def identity_map(collection: str) -> dict[str, dict[str, Any]]:
+    """Documents of ``collection`` already loaded in this request, keyed by id.
+
+    Repositories consult it before querying by id and must drop entries they
+    write. Outside an app context it is a throwaway dict, so nothing is shared.
+    """
+    if not has_app_context():
+        return {}
+    maps = g.setdefault("_identity_maps", {})
+    return maps.setdefault(collection, {})
+
+
+def configure_registry(app):
+    # g outlives a request when an outer app context is already pushed (CLI
+    # tools, tests), so request-scoped state is dropped explicitly at both ends.
+    @app.before_request
+    def reset_request_registry():
+        _reset()
+
+    @app.teardown_request
+    def clear_request_registry(exc=None):
+        _reset()
+
+
+def _reset():
+    for name in _REQUEST_SCOPED:
+        g.pop(name, None)
@@ -1,5 +1,6 @@
 from .admin_repo import AdminRepository
 from .audit_repo import AuditRepository
+from .blob_repo import ChunkedBlobRepository
 from .books_repo import BooksRepository
 from .certification_repo import CertificationRepository
 from .gallery_repo import GalleryRepository
@@ -8,12 +9,15 @@ from .music_repo import MusicRepository
 from .notes_repo import NotesRepository
 from .reading_repo import ReadingRepository
 from .site_settings_repo import SiteSettingsRepository
+from .stats_repo import CollectionStatsRepository
 
 __all__ = [
     "AdminRepository",
     "AuditRepository",
     "BooksRepository",
     "CertificationRepository",
+    "ChunkedBlobRepository",
+    "CollectionStatsRepository",
     "GalleryRepository",
     "GithubResearchRepository",
     "MusicRepository",
@@ -13,6 +13,8 @@ class AdminRepository:
         return self.collection is not None
 
     def get_by_username(self, username: str):
+        # Never cached: a deactivation or password change made by another
+        # worker must stop the old credentials on the very next login.
         if self.collection is None:
             return None
         doc = self.collection.find_one({"username": username})
@@ -27,14 +29,29 @@ class AdminRepository:
         doc = self.collection.find_one({"_id": object_id})
         return serialize_doc(doc)
 
-    def touch_last_login(self, username: str):
+    def touch_last_login(self, username: str, at: datetime | None = None):
         if self.collection is None:
             return
+        # Only ever move forward: deferred updates may arrive out of order.
+        at = at or datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"username": username, "$or": [{"last_login_at": None}, {"last_login_at": {"$lt": at}}]},
+            {"$set": {"last_login_at": at}},
+        )
+
+    def update_password_hash(self, username: str, password_hash: str):
+        if self.collection is None:
+            raise RuntimeError("Database unavailable")
         self.collection.update_one(
             {"username": username},
-            {"$set": {"last_login_at": datetime.now(timezone.utc)}},
+            {"$set": {"password_hash": password_hash, "updated_at": datetime.now(timezone.utc)}},
         )
 
+    def set_bootstrap_fingerprint(self, username: str, fingerprint: str):
+        if self.collection is None:
+            raise RuntimeError("Database unavailable")
+        self.collection.update_one({"username": username}, {"$set": {"bootstrap_fingerprint": fingerprint}})
+
     def upsert_admin(self, username: str, password_hash: str):
         if self.collection is None:
             raise RuntimeError("Database unavailable")
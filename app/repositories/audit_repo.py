@@ -1,38 +1,108 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+from flask import current_app, has_app_context
 from pymongo import DESCENDING
 
+from .audit_rollup_repo import AuditRollupRepository, bucket_start
+from ..audit_sink import get_audit_sink
+from ..config import Config
 from ..utils import serialize_doc
 
 
+def _setting(name: str):
+    # Maintenance tools write audit rows without an app, so fall back to Config.
+    if has_app_context():
+        return current_app.config.get(name, getattr(Config, name))
+    return getattr(Config, name)
+
+
+def audit_expires_at(action: str, timestamp: datetime) -> datetime | None:
+    by_action = _setting("AUDIT_RETENTION_DAYS_BY_ACTION") or {}
+    days = by_action.get(action, _setting("AUDIT_RETENTION_DAYS"))
+    if not days:
+        return None
+    return timestamp + timedelta(days=days)
+
+
 class AuditRepository:
     def __init__(self, db):
         self.collection = db.audit_logs if db is not None else None
+        self.rollups = AuditRollupRepository(db)
 
     def log(self, actor: str, action: str, entity: str, entity_id: str = "", metadata: dict | None = None):
         if self.collection is None:
             return
 
-        self.collection.insert_one(
-            {
-                "actor": actor,
-                "action": action,
-                "entity": entity,
-                "entity_id": entity_id,
-                "timestamp": datetime.now(timezone.utc),
-                "metadata": metadata or {},
-            }
-        )
+        now = datetime.now(timezone.utc)
+        event = {
+            "actor": actor,
+            "action": action,
+            "entity": entity,
+            "entity_id": entity_id,
+            "timestamp": now,
+            "expires_at": audit_expires_at(action, now),
+            "metadata": metadata or {},
+        }
+        sink = get_audit_sink()
+        if sink is not None and sink.submit(event):
+            return
+        self.write_many([event])
+
+    def write_many(self, events: list[dict]):
+        if self.collection is None or not events:
+            return
+
+        self.collection.insert_many(events, ordered=False)
+        self.rollups.record(events, hourly_retention_days=_setting("AUDIT_ROLLUP_HOURLY_RETENTION_DAYS"))
 
     def list_by_action(self, action: str, limit: int = 200):
         if self.collection is None:
             return []
+        self._flush_pending()
         docs = self.collection.find({"action": action}).sort("timestamp", DESCENDING).limit(limit)
         return [serialize_doc(doc) for doc in docs]
 
+    # Until the rollups have been backfilled, counts come from the raw log so
+    # existing deployments do not report only the events logged since upgrading.
+
     def count_by_action(self, action: str) -> int:
         if self.collection is None:
             return 0
-        return self.collection.count_documents({"action": action})
+        self._flush_pending()
+        if not self.rollups.is_complete():
+            return self.collection.count_documents({"action": action})
+        return self.rollups.total(action)
+
+    def count_since(self, action: str, since: datetime, period: str = "hour") -> int:
+        if self.collection is None:
+            return 0
+        self._flush_pending()
+        if not self.rollups.is_complete():
+            return self.collection.count_documents({"action": action, "timestamp": {"$gte": bucket_start(since, period)}})
+        return self.rollups.count_since(action, since, period=period)
+
+    def top_values(self, action: str, dimension: str, since: datetime, limit: int = 10):
+        if self.collection is None:
+            return []
+        self._flush_pending()
+        if not self.rollups.is_complete():
+            field = f"metadata.{dimension}"
+            rows = self.collection.aggregate(
+                [
+                    {"$match": {"action": action, "timestamp": {"$gte": bucket_start(since, "day")}, field: {"$nin": [None, ""]}}},
+                    {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                    {"$sort": {"count": DESCENDING, "_id": 1}},
+                    {"$limit": limit},
+                ]
+            )
+            return [{"value": str(row["_id"]), "count": row["count"]} for row in rows]
+        return self.rollups.top_values(action, dimension, since, limit=limit)
+
+    @staticmethod
+    def _flush_pending():
+        # Reads should include events still sitting in this process's buffer.
+        sink = get_audit_sink()
+        if sink is not None and sink.pending():
+            sink.flush()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from pymongo import DESCENDING
+
+from ..cache import app_cache
+
+ROLLUP_PERIODS = ("hour", "day")
+# schema_migrations document recording that the rollups cover every audit row.
+ROLLUP_BACKFILL_ID = "audit_rollups"
+# Metadata fields rolled up next to the per-action totals.
+ROLLUP_METADATA_DIMENSIONS = ("remote_addr", "attempted_username")
+
+
+def bucket_start(timestamp: datetime, period: str) -> datetime:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    bucket = timestamp.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if period == "day":
+        bucket = bucket.replace(hour=0)
+    return bucket
+
+
+class AuditRollupRepository:
+    """Hourly and daily audit counts kept in ``audit_rollups``.
+
+    Every audit write increments one document per (period, bucket, action,
+    dimension, value), so dashboards read a handful of small documents instead
+    of counting the raw log. Hourly rows expire after ``hourly_retention_days``;
+    daily rows are kept so all-time totals survive raw log retention.
+
+    Rows written before rollups existed are only counted once
+    ``tools/maintenance/rebuild_audit_rollups.py`` has run; until then
+    :meth:`is_complete` is false and callers count the raw log instead.
+    """
+
+    def __init__(self, db):
+        self.collection = db.audit_rollups if db is not None else None
+        self.migrations = db.schema_migrations if db is not None else None
+
+    def available(self) -> bool:
+        return self.collection is not None
+
+    def record(self, events: Iterable[dict[str, Any]], hourly_retention_days: int = 14):
+        if self.collection is None:
+            return
+
+        increments: Counter[tuple] = Counter()
+        for event in events:
+            action = event["action"]
+            metadata = event.get("metadata") if isinstance(event.get("metadata"), dict) else {}
+            dimensions = [("action", action)]
+            dimensions += [(field, str(metadata[field])) for field in ROLLUP_METADATA_DIMENSIONS if metadata.get(field)]
+            for period in ROLLUP_PERIODS:
+                bucket = bucket_start(event["timestamp"], period)
+                for dimension, value in dimensions:
+                    increments[(period, bucket, action, dimension, value)] += 1
+
+        for (period, bucket, action, dimension, value), count in increments.items():
+            on_insert = {"period": period, "bucket": bucket, "action": action, "dimension": dimension, "value": value}
+            if period == "hour":
+                on_insert["expires_at"] = bucket + timedelta(days=hourly_retention_days)
+            self.collection.update_one(
+                {"_id": f"{period}|{bucket.isoformat()}|{action}|{dimension}|{value}"},
+                {"$inc": {"count": count}, "$setOnInsert": on_insert},
+                upsert=True,
+            )
+
+        cache = self._cache()
+        if cache is not None and increments:
+            cache.clear()
+
+    def is_complete(self) -> bool:
+        """Whether the rollups account for every row in ``audit_logs``."""
+        if self.collection is None:
+            return False
+        return bool(
+            self._cached(("complete",), lambda: self.migrations.find_one({"_id": ROLLUP_BACKFILL_ID}) is not None)
+        )
+
+    def mark_complete(self):
+        if self.collection is None:
+            return
+        self.migrations.update_one(
+            {"_id": ROLLUP_BACKFILL_ID},
+            {"$set": {"applied_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        cache = self._cache()
+        if cache is not None:
+            cache.clear()
+
+    def total(self, action: str) -> int:
+        return self._cached(("total", action), lambda: self._sum(action, "day", None))
+
+    def count_since(self, action: str, since: datetime, period: str = "hour") -> int:
+        since = bucket_start(since, period)
+        return self._cached(("since", action, period, since), lambda: self._sum(action, period, since))
+
+    def top_values(self, action: str, dimension: str, since: datetime, period: str = "day", limit: int = 10):
+        since = bucket_start(since, period)
+
+        def fetch():
+            rows = self.collection.aggregate(
+                [
+                    {"$match": {"period": period, "action": action, "dimension": dimension, "bucket": {"$gte": since}}},
+                    {"$group": {"_id": "$value", "count": {"$sum": "$count"}}},
+                    {"$sort": {"count": DESCENDING, "_id": 1}},
+                    {"$limit": limit},
+                ]
+            )
+            return [{"value": row["_id"], "count": row["count"]} for row in rows]
+
+        if self.collection is None:
+            return []
+        return self._cached(("top", action, dimension, period, since, limit), fetch)
+
+    def clear(self):
+        if self.collection is None:
+            return
+        self.collection.delete_many({})
+        cache = self._cache()
+        if cache is not None:
+            cache.clear()
+
+    def _sum(self, action: str, period: str, since: datetime | None) -> int:
+        match: dict[str, Any] = {"period": period, "action": action, "dimension": "action"}
+        if since is not None:
+            match["bucket"] = {"$gte": since}
+        rows = list(self.collection.aggregate([{"$match": match}, {"$group": {"_id": None, "count": {"$sum": "$count"}}}]))
+        return int(rows[0]["count"]) if rows else 0
+
+    def _cached(self, key, fetch):
+        if self.collection is None:
+            return 0
+        cache = self._cache()
+        if cache is None:
+            return fetch()
+        return cache.get_or_set(key, fetch)
+
+    @staticmethod
+    def _cache():
+        return app_cache("audit_rollups", "COUNT_CACHE_TTL_SECONDS", default_ttl=30, maxsize=128)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from bson import ObjectId
+from bson.binary import Binary
+from pymongo import ASCENDING
+
+from ..utils import maybe_object_id
+
+DEFAULT_CHUNK_SIZE = 255 * 1024
+CHUNK_BATCH_SIZE = 4
+
+
+class ChunkedBlobRepository:
+    """GridFS-style blob storage: a manifest document plus fixed-size chunks.
+
+    Manifests live in ``<bucket>`` (keeping the media ids already referenced by
+    content documents) and chunks in ``<bucket>_chunks``. Manifests written before
+    chunking keep their bytes inline in ``data`` and are still readable.
+    """
+
+    def __init__(self, db, bucket: str):
+        self.files = db[bucket] if db is not None else None
+        self.chunks = db[f"{bucket}_chunks"] if db is not None else None
+
+    def available(self) -> bool:
+        return self.files is not None
+
+    def put(
+        self,
+        stream,
+        filename: str,
+        content_type: str,
+        max_size: int | None = None,
+        too_large_message: str = "File is too large",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> ObjectId:
+        if self.files is None:
+            raise RuntimeError("Database unavailable")
+
+        file_id = ObjectId()
+        length = 0
+        chunk_count = 0
+        try:
+            while True:
+                data = _read_exact(stream, chunk_size)
+                if not data:
+                    break
+                length += len(data)
+                if max_size is not None and length > max_size:
+                    raise ValueError(too_large_message)
+                self.chunks.insert_one({"files_id": file_id, "n": chunk_count, "data": Binary(data)})
+                chunk_count += 1
+        except BaseException:
+            self.chunks.delete_many({"files_id": file_id})
+            raise
+
+        self.files.insert_one(
+            {
+                "_id": file_id,
+                "filename": filename,
+                "content_type": content_type,
+                "length": length,
+                "chunk_size": chunk_size,
+                "chunk_count": chunk_count,
+                "storage": "chunked",
+                "uploaded_at": datetime.now(timezone.utc),
+            }
+        )
+        return file_id
+
+    def get_manifest(self, file_id: str) -> dict[str, Any] | None:
+        if self.files is None:
+            return None
+        object_id = maybe_object_id(file_id)
+        if not object_id:
+            return None
+
+        manifest = self.files.find_one({"_id": object_id}, {"data": 0})
+        if manifest and manifest.get("storage") != "chunked":
+            # Not migrated yet: the bytes are inline, so load them once here.
+            manifest = self.files.find_one({"_id": object_id}) or manifest
+            manifest["length"] = len(manifest.get("data") or b"")
+        return manifest
+
+    def iter_bytes(self, manifest: dict[str, Any], start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        """Yield the bytes in ``[start, end]`` (inclusive) without loading the whole file."""
+        length = int(manifest.get("length") or 0)
+        last = length - 1 if end is None else min(end, length - 1)
+        if length == 0 or start > last:
+            return
+
+        if manifest.get("storage") != "chunked":
+            yield bytes(manifest.get("data") or b"")[start : last + 1]
+            return
+
+        chunk_size = int(manifest["chunk_size"])
+        first_chunk = start // chunk_size
+        last_chunk = last // chunk_size
+        cursor = (
+            self.chunks.find({"files_id": manifest["_id"], "n": {"$gte": first_chunk, "$lte": last_chunk}})
+            .sort("n", ASCENDING)
+            .batch_size(CHUNK_BATCH_SIZE)
+        )
+        for chunk in cursor:
+            offset = chunk["n"] * chunk_size
+            data = bytes(chunk["data"])
+            yield data[max(start - offset, 0) : last - offset + 1]
+
+    def delete(self, file_id: str):
+        if self.files is None:
+            return
+        object_id = maybe_object_id(file_id)
+        if not object_id:
+            return
+        self.files.delete_one({"_id": object_id})
+        self.chunks.delete_many({"files_id": object_id})
+
+    def migrate_inline(self, file_id: ObjectId, chunk_size: int = DEFAULT_CHUNK_SIZE) -> bool:
+        """Move an inline ``data`` blob into chunks, keeping its id."""
+        if self.files is None:
+            raise RuntimeError("Database unavailable")
+
+        doc = self.files.find_one({"_id": file_id})
+        if not doc or doc.get("storage") == "chunked":
+            return False
+
+        data = bytes(doc.get("data") or b"")
+        self.chunks.delete_many({"files_id": file_id})
+        for n, offset in enumerate(range(0, len(data), chunk_size)):
+            self.chunks.insert_one({"files_id": file_id, "n": n, "data": Binary(data[offset : offset + chunk_size])})
+
+        self.files.update_one(
+            {"_id": file_id},
+            {
+                "$set": {
+                    "length": len(data),
+                    "chunk_size": chunk_size,
+                    "chunk_count": (len(data) + chunk_size - 1) // chunk_size,
+                    "storage": "chunked",
+                },
+                "$unset": {"data": ""},
+            },
+        )
+        return True
+
+
+def _read_exact(stream, size: int) -> bytes:
+    parts = []
+    remaining = size
+    while remaining > 0:
+        data = stream.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
@@ -1,66 +1,184 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 
 from pymongo import ASCENDING, DESCENDING
 from pymongo.errors import DuplicateKeyError
 
-from ..utils import maybe_object_id, serialize_doc
+from .stats_repo import CollectionStatsRepository
+from ..registry import identity_map
+from ..utils import maybe_object_id, search_prefixes, search_query_tokens, search_words, serialize_doc
+
+SEARCH_SOURCE_FIELDS = ("title", "original_title", "authors")
+
+_CARD_FIELDS = (
+    "slug",
+    "original_title",
+    "title",
+    "subtitle",
+    "authors",
+    "first_publish_year",
+    "cover_url",
+    "description",
+    "updated_at",
+)
+
+# Fields each view renders. Reads that name one skip the imported ``google_info``
+# payload and the search token arrays, which no view shows.
+BOOK_PROJECTIONS: dict[str, tuple[str, ...]] = {
+    "card": _CARD_FIELDS,
+    "detail": _CARD_FIELDS,
+    "reading_card": _CARD_FIELDS,
+    "admin_row": ("slug", "original_title", "title", "authors", "first_publish_year", "cover_url", "updated_at"),
+    "preview": ("slug", "title", "original_title", "cover_url"),
+}
+
+
+def book_projection(name: str | None) -> dict[str, int] | None:
+    if name is None:
+        return None
+    fields = BOOK_PROJECTIONS.get(name)
+    if fields is None:
+        raise ValueError(f"Unknown book projection: {name}")
+    return {field: 1 for field in fields}
+
+
+def book_search_fields(book: dict[str, Any]) -> dict[str, list[str]]:
+    authors = book.get("authors") or []
+    if isinstance(authors, str):
+        authors = [authors]
+
+    title_words = search_words(book.get("title")) + search_words(book.get("original_title"))
+    author_words = [word for author in authors for word in search_words(author)]
+    return {
+        "search_tokens": search_prefixes(title_words + author_words),
+        "search_title_words": sorted(set(title_words)),
+    }
 
 
 class BooksRepository:
     def __init__(self, db):
         self.collection = db.books if db is not None else None
+        self.stats = CollectionStatsRepository(db)
 
     def available(self) -> bool:
         return self.collection is not None
 
-    def list_books(self, query: str = "", limit: int = 20, cursor: str | None = None):
+    def list_books(self, query: str = "", limit: int = 20, cursor: str | None = None, projection: str | None = None):
         if self.collection is None:
             return [], None
 
-        filters: dict[str, Any] = {}
         if query:
-            regex = {"$regex": query, "$options": "i"}
-            filters["$or"] = [
-                {"title": regex},
-                {"original_title": regex},
-                {"authors": regex},
-            ]
+            offset = 0
+            if cursor:
+                try:
+                    offset = max(0, int(cursor))
+                except ValueError:
+                    offset = 0
+
+            docs = self._search(query, skip=offset, limit=limit + 1, projection=projection)
+            next_cursor = None
+            if len(docs) > limit:
+                next_cursor = str(offset + limit)
+                docs = docs[:limit]
+            return self._remember_all(docs, projection), next_cursor
 
+        filters: dict[str, Any] = {}
         if cursor:
             cursor_id = maybe_object_id(cursor)
             if cursor_id:
                 filters["_id"] = {"$gt": cursor_id}
 
-        docs = list(self.collection.find(filters).sort("_id", ASCENDING).limit(limit + 1))
+        docs = list(self.collection.find(filters, book_projection(projection)).sort("_id", ASCENDING).limit(limit + 1))
         next_cursor = None
         if len(docs) > limit:
             next_cursor = str(docs[limit - 1]["_id"])
             docs = docs[:limit]
 
-        return [serialize_doc(doc) for doc in docs], next_cursor
+        return self._remember_all(docs, projection), next_cursor
+
+    def list_page_anchors(self, per_page: int = 24):
+        """Return the first ``_id`` of every browse page plus the total count.
 
-    def list_books_page(self, query: str = "", page: int = 1, per_page: int = 24):
+        Walking ``_id`` alone is covered by the primary index, so this costs one
+        index scan; callers cache the anchors and seek from them afterwards.
+        """
         if self.collection is None:
             return [], 0
 
+        safe_per_page = max(per_page, 1)
+        anchors: list[str] = []
+        total = 0
+        for doc in self.collection.find({}, {"_id": 1}).sort("_id", ASCENDING):
+            if total % safe_per_page == 0:
+                anchors.append(str(doc["_id"]))
+            total += 1
+        return anchors, total
+
+    def list_books_from(self, anchor: str | None, limit: int = 24, projection: str | None = None):
+        if self.collection is None:
+            return []
+
         filters: dict[str, Any] = {}
-        if query:
-            regex = {"$regex": query, "$options": "i"}
-            filters["$or"] = [
-                {"title": regex},
-                {"original_title": regex},
-                {"authors": regex},
-            ]
+        anchor_id = maybe_object_id(anchor) if anchor else None
+        if anchor_id:
+            filters["_id"] = {"$gte": anchor_id}
+
+        docs = self.collection.find(filters, book_projection(projection)).sort("_id", ASCENDING).limit(max(limit, 1))
+        return self._remember_all(docs, projection)
+
+    def search_books_page(self, query: str, page: int = 1, per_page: int = 24, projection: str | None = None):
+        if self.collection is None:
+            return []
 
-        total = self.collection.count_documents(filters)
         safe_page = max(page, 1)
         safe_per_page = max(per_page, 1)
-        skip = (safe_page - 1) * safe_per_page
+        docs = self._search(query, skip=(safe_page - 1) * safe_per_page, limit=safe_per_page, projection=projection)
+        return self._remember_all(docs, projection)
 
-        docs = list(self.collection.find(filters).sort("_id", ASCENDING).skip(skip).limit(safe_per_page))
-        return [serialize_doc(doc) for doc in docs], total
+    def count_matching(self, query: str) -> int:
+        if self.collection is None:
+            return 0
+        return self.collection.count_documents(self._search_filter(query))
+
+    def _search(self, query: str, skip: int = 0, limit: int = 20, projection: str | None = None):
+        filters = self._search_filter(query)
+        fields = book_projection(projection)
+        tokens = search_query_tokens(query)
+        if not tokens:
+            cursor = self.collection.find(filters, fields).sort("_id", ASCENDING).skip(skip).limit(limit)
+            return list(cursor)
+
+        # Rank by how many query tokens are whole words of the title, then keep
+        # insertion order so paging through equally ranked results is stable.
+        title_words = {"$ifNull": ["$search_title_words", []]}
+        score = {"$add": [{"$cond": [{"$in": [token, title_words]}, 1, 0]} for token in tokens]}
+        pipeline = [
+            {"$match": filters},
+            {"$addFields": {"_search_score": score}},
+            {"$sort": {"_search_score": -1, "_id": 1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$project": fields or {"_search_score": 0}},
+        ]
+        return list(self.collection.aggregate(pipeline))
+
+    @staticmethod
+    def _search_filter(query: str) -> dict[str, Any]:
+        tokens = search_query_tokens(query)
+        if tokens:
+            return {"search_tokens": {"$all": tokens}}
+
+        # Queries too short to tokenize fall back to an unindexed substring scan.
+        regex = {"$regex": re.escape(query), "$options": "i"}
+        return {
+            "$or": [
+                {"title": regex},
+                {"original_title": regex},
+                {"authors": regex},
+            ]
+        }
 
     def list_previews(self, limit: int = 8):
         if self.collection is None:
@@ -68,54 +186,58 @@ class BooksRepository:
 
         docs = self.collection.find(
             {"cover_url": {"$nin": [None, ""]}},
-            {"slug": 1, "title": 1, "original_title": 1, "cover_url": 1},
+            book_projection("preview"),
         ).sort("updated_at", DESCENDING).limit(limit)
         return [serialize_doc(doc) for doc in docs]
 
-    def get_by_id_or_slug(self, id_or_slug: str):
+    def get_by_id_or_slug(self, id_or_slug: str, projection: str | None = None):
         if self.collection is None:
             return None
 
-        filters: dict[str, Any]
         object_id = maybe_object_id(id_or_slug)
         if object_id:
-            filters = {"_id": object_id}
-        else:
-            filters = {"slug": id_or_slug}
+            return self.get_by_id(id_or_slug, projection=projection)
 
-        doc = self.collection.find_one(filters)
-        return serialize_doc(doc)
+        return self._remember(self.collection.find_one({"slug": id_or_slug}, book_projection(projection)), projection)
 
-    def get_by_id(self, book_id: str):
+    def get_by_id(self, book_id: str, projection: str | None = None):
         if self.collection is None:
             return None
         object_id = maybe_object_id(book_id)
         if not object_id:
             return None
-        doc = self.collection.find_one({"_id": object_id})
-        return serialize_doc(doc)
+        loaded = self._loaded(str(object_id), projection)
+        if loaded is not None:
+            return loaded
+        return self._remember(self.collection.find_one({"_id": object_id}, book_projection(projection)), projection)
 
     def get_by_slug(self, slug: str):
         if self.collection is None:
             return None
-        doc = self.collection.find_one({"slug": slug})
+        doc = self.collection.find_one({"slug": slug}, {"_id": 1})
         return serialize_doc(doc)
 
-    def list_by_ids(self, book_ids: list[str]):
+    def list_by_ids(self, book_ids: list[str], projection: str | None = None):
+        """Books for ``book_ids``; ones already loaded in this request are not re-read."""
         if self.collection is None:
             return []
 
-        object_ids = []
+        books = []
+        missing_ids = []
         for book_id in book_ids:
             object_id = maybe_object_id(book_id)
-            if object_id:
-                object_ids.append(object_id)
-
-        if not object_ids:
-            return []
-
-        docs = self.collection.find({"_id": {"$in": object_ids}})
-        return [serialize_doc(doc) for doc in docs]
+            if not object_id:
+                continue
+            known = self._loaded(str(object_id), projection)
+            if known is not None:
+                books.append(known)
+            else:
+                missing_ids.append(object_id)
+
+        if missing_ids:
+            docs = self.collection.find({"_id": {"$in": missing_ids}}, book_projection(projection))
+            books.extend(self._remember_all(docs, projection))
+        return books
 
     def update_book(self, book_id: str, update_fields: dict[str, Any]):
         if self.collection is None:
@@ -125,6 +247,11 @@ class BooksRepository:
         if not object_id:
             return None
 
+        if any(field in update_fields for field in SEARCH_SOURCE_FIELDS):
+            current = self.collection.find_one({"_id": object_id}, {field: 1 for field in SEARCH_SOURCE_FIELDS}) or {}
+            update_fields = {**update_fields, **book_search_fields({**current, **update_fields})}
+
+        self._forget(str(object_id))
         try:
             self.collection.update_one({"_id": object_id}, {"$set": update_fields})
         except DuplicateKeyError as exc:
@@ -135,11 +262,13 @@ class BooksRepository:
         if self.collection is None:
             raise RuntimeError("Database unavailable")
 
+        payload = {**payload, **book_search_fields(payload)}
         try:
             result = self.collection.insert_one(payload)
         except DuplicateKeyError as exc:
             raise ValueError("Slug already exists") from exc
 
+        self.stats.increment("books")
         return self.get_by_id(str(result.inserted_id))
 
     def delete_book(self, book_id: str) -> bool:
@@ -150,20 +279,71 @@ class BooksRepository:
         if not object_id:
             return False
 
+        self._forget(str(object_id))
         result = self.collection.delete_one({"_id": object_id})
+        if result.deleted_count:
+            self.stats.increment("books", -1)
         return result.deleted_count > 0
 
     def upsert_by_original_title(self, original_title: str, payload: dict[str, Any]):
         if self.collection is None:
             raise RuntimeError("Database unavailable")
 
-        self.collection.update_one(
+        search_fields = book_search_fields({"original_title": original_title, **payload})
+        self._forget()
+        result = self.collection.update_one(
             {"original_title": original_title},
-            {"$set": payload, "$setOnInsert": {"original_title": original_title}},
+            {"$set": {**payload, **search_fields}, "$setOnInsert": {"original_title": original_title}},
             upsert=True,
         )
+        if result.upserted_id is not None:
+            self.stats.increment("books")
 
     def count_books(self) -> int:
         if self.collection is None:
             return 0
-        return self.collection.count_documents({})
+        return self.stats.get_count("books")
+
+    def refresh_search_fields(self, batch_size: int = 500) -> int:
+        if self.collection is None:
+            raise RuntimeError("Database unavailable")
+
+        projection = {field: 1 for field in SEARCH_SOURCE_FIELDS}
+        self._forget()
+        refreshed = 0
+        for doc in self.collection.find({}, projection).batch_size(batch_size):
+            self.collection.update_one({"_id": doc["_id"]}, {"$set": book_search_fields(doc)})
+            refreshed += 1
+        return refreshed
+
+    @staticmethod
+    def _loaded(book_id: str, projection: str | None):
+        # A full document satisfies any projection; projected ones only their own.
+        for name in (None, projection) if projection else (None,):
+            known = identity_map(_identity_key(name)).get(book_id)
+            if known is not None:
+                return dict(known)
+        return None
+
+    @staticmethod
+    def _remember(doc, projection: str | None = None):
+        book = serialize_doc(doc)
+        if book:
+            identity_map(_identity_key(projection))[book["id"]] = dict(book)
+        return book
+
+    def _remember_all(self, docs, projection: str | None = None) -> list[dict[str, Any]]:
+        return [self._remember(doc, projection) for doc in docs]
+
+    @staticmethod
+    def _forget(book_id: str | None = None):
+        for name in (None, *BOOK_PROJECTIONS):
+            loaded = identity_map(_identity_key(name))
+            if book_id is None:
+                loaded.clear()
+            else:
+                loaded.pop(book_id, None)
+
+
+def _identity_key(projection: str | None) -> str:
+    return "books" if projection is None else f"books:{projection}"
@@ -5,12 +5,14 @@ from typing import Any
 
 from pymongo.errors import DuplicateKeyError
 
+from .stats_repo import CollectionStatsRepository
 from ..utils import maybe_object_id, serialize_doc
 
 
 class CertificationRepository:
     def __init__(self, db):
         self.collection = db.certifications if db is not None else None
+        self.stats = CollectionStatsRepository(db)
 
     def available(self) -> bool:
         return self.collection is not None
@@ -37,6 +39,7 @@ class CertificationRepository:
             result = self.collection.insert_one(payload)
         except DuplicateKeyError as exc:
             raise ValueError("This Credly badge is already added") from exc
+        self.stats.increment("certifications")
         return self.get_by_id(str(result.inserted_id))
 
     def update_badge(self, badge_id: str, payload: dict[str, Any]):
@@ -59,6 +62,8 @@ class CertificationRepository:
         if not object_id:
             return False
         result = self.collection.delete_one({"_id": object_id})
+        if result.deleted_count:
+            self.stats.increment("certifications", -1)
         return bool(result.deleted_count)
 
     def get_by_id(self, badge_id: str):
@@ -72,4 +77,4 @@ class CertificationRepository:
     def count_badges(self) -> int:
         if self.collection is None:
             return 0
-        return self.collection.count_documents({})
+        return self.stats.get_count("certifications")
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from ..cache import app_cache
+
+
+class ContentVersionRepository:
+    """Per-collection generation counters bumped whenever public content changes."""
+
+    def __init__(self, db):
+        self.collection = db.content_versions if db is not None else None
+
+    def available(self) -> bool:
+        return self.collection is not None
+
+    def bump(self, *names: str):
+        if self.collection is None or not names:
+            return
+
+        now = datetime.now(timezone.utc)
+        for name in names:
+            self.collection.update_one(
+                {"_id": name},
+                {"$inc": {"version": 1}, "$set": {"updated_at": now}},
+                upsert=True,
+            )
+        cache = self._cache()
+        if cache is not None:
+            cache.clear()
+
+    def get_versions(self, names: tuple[str, ...]) -> dict[str, dict]:
+        if self.collection is None or not names:
+            return {}
+
+        cache = self._cache()
+        if cache is None:
+            return self._fetch(names)
+        return cache.get_or_set(tuple(names), lambda: self._fetch(names))
+
+    def _fetch(self, names: tuple[str, ...]) -> dict[str, dict]:
+        versions = {name: {"version": 0, "updated_at": None} for name in names}
+        for doc in self.collection.find({"_id": {"$in": list(names)}}):
+            versions[doc["_id"]] = {
+                "version": int(doc.get("version") or 0),
+                "updated_at": doc.get("updated_at"),
+            }
+        return versions
+
+    @staticmethod
+    def _cache():
+        return app_cache("content_versions", "CONTENT_VERSION_CACHE_TTL_SECONDS", default_ttl=2, maxsize=64)
@@ -3,12 +3,14 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
+from .stats_repo import CollectionStatsRepository
 from ..utils import maybe_object_id, serialize_doc
 
 
 class GalleryRepository:
     def __init__(self, db):
         self.collection = db.gallery_items if db is not None else None
+        self.stats = CollectionStatsRepository(db)
 
     def available(self) -> bool:
         return self.collection is not None
@@ -59,6 +61,7 @@ class GalleryRepository:
         if self.collection is None:
             raise RuntimeError("Database unavailable")
         result = self.collection.insert_one(payload)
+        self.stats.increment("gallery_items")
         return self.get_by_id(str(result.inserted_id))
 
     def update_item(self, item_id: str, payload: dict[str, Any]):
@@ -77,6 +80,8 @@ class GalleryRepository:
         if not object_id:
             return False
         result = self.collection.delete_one({"_id": object_id})
+        if result.deleted_count:
+            self.stats.increment("gallery_items", -1)
         return bool(result.deleted_count)
 
     def set_published(self, item_id: str, is_published: bool):
@@ -98,7 +103,22 @@ class GalleryRepository:
         )
         return self.get_by_id(item_id)
 
+    def set_image_variants(self, item_id: str, storage_public_id: str, image_width: int | None, variants: list[dict]) -> bool:
+        """Attach variants unless the item's image was replaced in the meantime."""
+        if self.collection is None:
+            raise RuntimeError("Database unavailable")
+
+        object_id = maybe_object_id(item_id)
+        if not object_id:
+            return False
+
+        result = self.collection.update_one(
+            {"_id": object_id, "storage_public_id": storage_public_id},
+            {"$set": {"image_width": image_width, "image_variants": variants}},
+        )
+        return bool(result.matched_count)
+
     def count_items(self) -> int:
         if self.collection is None:
             return 0
-        return self.collection.count_documents({})
+        return self.stats.get_count("gallery_items")
@@ -3,12 +3,14 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
+from .stats_repo import CollectionStatsRepository
 from ..utils import maybe_object_id, serialize_doc
 
 
 class GithubResearchRepository:
     def __init__(self, db):
         self.collection = db.github_research_items if db is not None else None
+        self.stats = CollectionStatsRepository(db)
 
     def available(self) -> bool:
         return self.collection is not None
@@ -32,6 +34,7 @@ class GithubResearchRepository:
         payload["created_at"] = now
         payload["updated_at"] = now
         result = self.collection.insert_one(payload)
+        self.stats.increment("github_research_items")
         return self.get_by_id(str(result.inserted_id))
 
     def update_item(self, item_id: str, payload: dict[str, Any]):
@@ -51,6 +54,8 @@ class GithubResearchRepository:
         if not object_id:
             return False
         result = self.collection.delete_one({"_id": object_id})
+        if result.deleted_count:
+            self.stats.increment("github_research_items", -1)
         return bool(result.deleted_count)
 
     def get_by_id(self, item_id: str):
@@ -64,4 +69,4 @@ class GithubResearchRepository:
     def count_items(self) -> int:
         if self.collection is None:
             return 0
-        return self.collection.count_documents({})
+        return self.stats.get_count("github_research_items")
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pymongo import ASCENDING, ReturnDocument
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class JobsRepository:
+    """Background jobs persisted in ``jobs``.
+
+    A worker claims a job by leasing it until ``locked_until``; a job whose lease
+    runs out (crashed worker, killed process) becomes claimable again. Failures are
+    retried with exponential backoff until ``max_attempts`` is reached. Finished
+    jobs carry an ``expires_at`` so the TTL index cleans them up.
+    """
+
+    def __init__(self, db):
+        self.collection = db.jobs if db is not None else None
+
+    def available(self) -> bool:
+        return self.collection is not None
+
+    def enqueue(self, name: str, payload: dict[str, Any], max_attempts: int = 5, delay_seconds: float = 0):
+        if self.collection is None:
+            raise RuntimeError("Database unavailable")
+
+        now = datetime.now(timezone.utc)
+        result = self.collection.insert_one(
+            {
+                "name": name,
+                "payload": payload,
+                "status": JOB_QUEUED,
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "run_at": now + timedelta(seconds=delay_seconds),
+                "locked_by": None,
+                "locked_until": None,
+                "last_error": "",
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        return result.inserted_id
+
+    def claim(self, worker_id: str, lease_seconds: float) -> dict[str, Any] | None:
+        if self.collection is None:
+            return None
+
+        now = datetime.now(timezone.utc)
+        return self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": JOB_QUEUED, "run_at": {"$lte": now}},
+                    {"status": JOB_RUNNING, "locked_until": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": JOB_RUNNING,
+                    "locked_by": worker_id,
+                    "locked_until": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def complete(self, job: dict[str, Any], retention_seconds: float):
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"_id": job["_id"], "locked_by": job["locked_by"]},
+            {
+                "$set": {
+                    "status": JOB_DONE,
+                    "locked_until": None,
+                    "finished_at": now,
+                    "expires_at": now + timedelta(seconds=retention_seconds),
+                    "updated_at": now,
+                }
+            },
+        )
+
+    def fail(self, job: dict[str, Any], error: str, retry_base_seconds: float, retention_seconds: float) -> bool:
+        """Record a failed attempt; returns ``True`` when the job will be retried."""
+        now = datetime.now(timezone.utc)
+        attempts = int(job.get("attempts") or 0)
+        retry = attempts < int(job.get("max_attempts") or 1)
+
+        update: dict[str, Any] = {"locked_until": None, "last_error": error[:2000], "updated_at": now}
+        if retry:
+            update["status"] = JOB_QUEUED
+            update["run_at"] = now + timedelta(seconds=retry_base_seconds * 2 ** (attempts - 1))
+        else:
+            update["status"] = JOB_FAILED
+            update["finished_at"] = now
+            update["expires_at"] = now + timedelta(seconds=retention_seconds)
+
+        self.collection.update_one({"_id": job["_id"], "locked_by": job["locked_by"]}, {"$set": update})
+        return retry
+
+    def count_by_status(self) -> dict[str, int]:
+        if self.collection is None:
+            return {}
+        counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+        for row in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return counts
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+
+class LockRepository:
+    """Named leases in ``app_locks`` so one process at a time runs a piece of work.
+
+    A lock is a document keyed by name; taking it either inserts that document
+    or replaces one whose lease has run out. Leases expire on their own, so a
+    process that dies while holding one only delays the next holder.
+    """
+
+    def __init__(self, db):
+        self.collection = db.app_locks if db is not None else None
+
+    def available(self) -> bool:
+        return self.collection is not None
+
+    def acquire(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        if self.collection is None:
+            return True
+
+        now = datetime.now(timezone.utc)
+        try:
+            self.collection.update_one(
+                {"_id": name, "expires_at": {"$lte": now}},
+                {"$set": {"owner": owner, "acquired_at": now, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    def release(self, name: str, owner: str):
+        if self.collection is None:
+            return
+        self.collection.delete_one({"_id": name, "owner": owner})
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+
+from pymongo import DESCENDING
+
+
+class LoginThrottleRepository:
+    """Failed login timestamps per throttle key, shared by every worker.
+
+    Each failure is one small document in ``login_throttle`` that the TTL index
+    drops once it leaves its window, so a sliding-window check reads at most
+    ``limit`` entries for a key.
+    """
+
+    def __init__(self, db):
+        self.collection = db.login_throttle if db is not None else None
+
+    def available(self) -> bool:
+        return self.collection is not None
+
+    def recent(self, key: str, since: datetime, limit: int) -> list[datetime]:
+        """Newest failure times for ``key`` after ``since``, newest first."""
+        docs = (
+            self.collection.find({"key": key, "at": {"$gt": since}}, {"at": 1, "_id": 0})
+            .sort("at", DESCENDING)
+            .limit(limit)
+        )
+        return [_as_utc(doc["at"]) for doc in docs]
+
+    def record(self, windows: dict[str, int], now: datetime):
+        self.collection.insert_many(
+            [{"key": key, "at": now, "expires_at": now + timedelta(seconds=seconds)} for key, seconds in windows.items()],
+            ordered=False,
+        )
+
+    def clear(self, key: str):
+        self.collection.delete_many({"key": key})
+
+
+class MemoryLoginThrottleStore:
+    """Per-process stand-in for :class:`LoginThrottleRepository` when MongoDB is down."""
+
+    def __init__(self, max_entries_per_key: int = 100):
+        self._entries: dict[str, deque] = defaultdict(lambda: deque(maxlen=max_entries_per_key))
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return True
+
+    def recent(self, key: str, since: datetime, limit: int) -> list[datetime]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return []
+            while entries and entries[0] <= since:
+                entries.popleft()
+            return list(reversed(entries))[:limit]
+
+    def record(self, windows: dict[str, int], now: datetime):
+        with self._lock:
+            for key in windows:
+                self._entries[key].append(now)
+
+    def clear(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
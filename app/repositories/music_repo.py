@@ -3,12 +3,14 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
+from .stats_repo import CollectionStatsRepository
 from ..utils import maybe_object_id, serialize_doc
 
 
 class MusicRepository:
     def __init__(self, db):
         self.collection = db.music_links if db is not None else None
+        self.stats = CollectionStatsRepository(db)
 
     def available(self) -> bool:
         return self.collection is not None
@@ -33,6 +35,7 @@ class MusicRepository:
         payload["created_at"] = now
         payload["updated_at"] = now
         result = self.collection.insert_one(payload)
+        self.stats.increment("music_links")
         return self.get_by_id(str(result.inserted_id))
 
     def update_link(self, link_id: str, payload: dict[str, Any]):
@@ -52,6 +55,8 @@ class MusicRepository:
         if not object_id:
             return False
         result = self.collection.delete_one({"_id": object_id})
+        if result.deleted_count:
+            self.stats.increment("music_links", -1)
         return bool(result.deleted_count)
 
     def get_by_id(self, link_id: str):
@@ -65,4 +70,4 @@ class MusicRepository:
     def count_links(self) -> int:
         if self.collection is None:
             return 0
-        return self.collection.count_documents({})
+        return self.stats.get_count("music_links")
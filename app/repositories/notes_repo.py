@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from .stats_repo import CollectionStatsRepository
 from ..utils import maybe_object_id, serialize_doc
 
 
 class NotesRepository:
     def __init__(self, db):
         self.collection = db.notes_logs if db is not None else None
+        self.stats = CollectionStatsRepository(db)
 
     def available(self) -> bool:
         return self.collection is not None
@@ -30,6 +32,7 @@ class NotesRepository:
         if self.collection is None:
             raise RuntimeError("Database unavailable")
         result = self.collection.insert_one(payload)
+        self.stats.increment("notes_logs")
         created = self.collection.find_one({"_id": result.inserted_id})
         return serialize_doc(created)
 
@@ -53,7 +56,7 @@ class NotesRepository:
     def count_entries(self) -> int:
         if self.collection is None:
             return 0
-        return self.collection.count_documents({})
+        return self.stats.get_count("notes_logs")
 
     def delete_entry(self, entry_id: str) -> bool:
         if self.collection is None:
@@ -62,4 +65,6 @@ class NotesRepository:
         if not object_id:
             return False
         result = self.collection.delete_one({"_id": object_id})
+        if result.deleted_count:
+            self.stats.increment("notes_logs", -1)
         return result.deleted_count > 0
@@ -1,29 +1,40 @@
 from __future__ import annotations
 
+from typing import Any
+
 from pymongo import DESCENDING
 from pymongo.errors import DuplicateKeyError
 
+from .books_repo import BOOK_PROJECTIONS
+from .stats_repo import CollectionStatsRepository
 from ..utils import maybe_object_id, serialize_doc
 
+BOOK_SNAPSHOT_FIELDS = BOOK_PROJECTIONS["reading_card"]
+
+
+def book_snapshot(book: dict[str, Any]) -> dict[str, Any]:
+    """The book fields a reading list entry carries so listings need no join."""
+    return {field: book.get(field) for field in BOOK_SNAPSHOT_FIELDS}
+
 
 class ReadingRepository:
     def __init__(self, db):
         self.collection = db.reading_list if db is not None else None
+        self.stats = CollectionStatsRepository(db)
 
     def available(self) -> bool:
         return self.collection is not None
 
     def list_entries_page(self, page: int = 1, per_page: int = 24):
         if self.collection is None:
-            return [], 0
+            return []
 
         safe_page = max(page, 1)
         safe_per_page = max(per_page, 1)
         skip = (safe_page - 1) * safe_per_page
 
-        total = self.collection.count_documents({})
         docs = self.collection.find({}).sort("created_at", DESCENDING).skip(skip).limit(safe_per_page)
-        return [serialize_doc(doc) for doc in docs], total
+        return [serialize_doc(doc) for doc in docs]
 
     def list_entries(self, limit: int = 200):
         if self.collection is None:
@@ -41,6 +52,7 @@ class ReadingRepository:
         except DuplicateKeyError as exc:
             raise ValueError("Book is already in reading list") from exc
 
+        self.stats.increment("reading_list")
         created = self.collection.find_one({"_id": result.inserted_id})
         return serialize_doc(created)
 
@@ -53,6 +65,8 @@ class ReadingRepository:
             return False
 
         result = self.collection.delete_one({"_id": object_id})
+        if result.deleted_count:
+            self.stats.increment("reading_list", -1)
         return result.deleted_count > 0
 
     def update_entry(self, entry_id: str, payload: dict):
@@ -66,6 +80,18 @@ class ReadingRepository:
         self.collection.update_one({"_id": object_id}, {"$set": payload})
         return serialize_doc(self.collection.find_one({"_id": object_id}))
 
+    def update_book_snapshot(self, book_id: str, book: dict[str, Any]) -> int:
+        """Refresh the embedded copy of ``book`` on every entry that references it."""
+        if self.collection is None:
+            raise RuntimeError("Database unavailable")
+
+        object_id = maybe_object_id(book_id)
+        if not object_id:
+            return 0
+
+        result = self.collection.update_many({"book_id": object_id}, {"$set": {"book": book_snapshot(book)}})
+        return result.modified_count
+
     def count_by_book_id(self, book_id: str) -> int:
         if self.collection is None:
             return 0
@@ -79,4 +105,9 @@ class ReadingRepository:
     def count_entries(self) -> int:
         if self.collection is None:
             return 0
-        return self.collection.count_documents({})
+        return self.stats.get_count("reading_list")
+
+    def recount_entries(self) -> int:
+        if self.collection is None:
+            return 0
+        return self.stats.recount("reading_list")
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from flask import current_app, has_app_context
+
+from ..cache import app_cache
+
+
+def counter_key(collection: str, filters: dict[str, Any] | None = None) -> str:
+    if not filters:
+        return collection
+    return collection + "?" + "&".join(f"{field}={filters[field]}" for field in sorted(filters))
+
+
+class CollectionStatsRepository:
+    """Incrementally maintained document counts stored in ``collection_stats``.
+
+    A counter is seeded with ``count_documents`` the first time it is read and is
+    then kept current by ``increment`` calls from the owning repository. Counters
+    that have never been read are left alone by ``increment`` so a missing
+    document always means "count on next read" rather than "zero".
+
+    Counters drift when documents are written outside the repositories (shell,
+    imports, a crash between the write and the ``$inc``). A counter older than
+    ``COLLECTION_STATS_RECONCILE_SECONDS`` is therefore recounted on its next
+    read, callers that notice an inconsistency can :meth:`recount` it, and
+    ``tools/maintenance/reconcile_collection_stats.py`` recounts everything.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.collection = db.collection_stats if db is not None else None
+
+    def available(self) -> bool:
+        return self.collection is not None
+
+    def increment(self, collection: str, delta: int = 1, filters: dict[str, Any] | None = None):
+        if self.collection is None or not delta:
+            return
+
+        key = counter_key(collection, filters)
+        self.collection.update_one(
+            {"_id": key},
+            {"$inc": {"count": delta}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        )
+        cache = self._cache()
+        if cache is not None:
+            cache.pop(key)
+
+    def get_count(self, collection: str, filters: dict[str, Any] | None = None) -> int:
+        counts = self.get_counts({"count": (collection, filters)})
+        return counts["count"]
+
+    def get_counts(self, counters: dict[str, tuple[str, dict[str, Any] | None]]) -> dict[str, int]:
+        """Resolve several named counters with at most one ``collection_stats`` read."""
+        if self.collection is None:
+            return {name: 0 for name in counters}
+
+        cache = self._cache()
+        keys = {name: counter_key(collection, filters) for name, (collection, filters) in counters.items()}
+        resolved: dict[str, int] = {}
+        missing = object()
+        for key in set(keys.values()):
+            value = cache.get(key, missing) if cache is not None else missing
+            if value is not missing:
+                resolved[key] = value
+
+        pending = [key for key in set(keys.values()) if key not in resolved]
+        stale: set[str] = set()
+        if pending:
+            stale_before = _stale_before()
+            for doc in self.collection.find({"_id": {"$in": pending}}, {"count": 1, "reconciled_at": 1}):
+                resolved[doc["_id"]] = int(doc.get("count") or 0)
+                if stale_before is not None and _older_than(doc.get("reconciled_at"), stale_before):
+                    stale.add(doc["_id"])
+
+        for name, (collection, filters) in counters.items():
+            key = keys[name]
+            if key not in resolved:
+                resolved[key] = self._seed(key, collection, filters)
+            elif key in stale:
+                stale.discard(key)
+                resolved[key] = self.recount(collection, filters)
+            if cache is not None:
+                cache.set(key, resolved[key])
+
+        return {name: resolved[key] for name, key in keys.items()}
+
+    def reconcile(self) -> dict[str, int]:
+        """Recount every tracked counter from its source collection."""
+        if self.collection is None:
+            raise RuntimeError("Database unavailable")
+
+        reconciled: dict[str, int] = {}
+        for doc in self.collection.find({}):
+            collection = doc.get("collection")
+            if not collection:
+                continue
+            reconciled[doc["_id"]] = self.recount(collection, doc.get("filters") or None)
+        return reconciled
+
+    def recount(self, collection: str, filters: dict[str, Any] | None = None) -> int:
+        """Replace one counter with a fresh ``count_documents``."""
+        if self.collection is None:
+            raise RuntimeError("Database unavailable")
+
+        key = counter_key(collection, filters)
+        count = self.db[collection].count_documents(filters or {})
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"_id": key},
+            {
+                "$set": {
+                    "collection": collection,
+                    "filters": filters or {},
+                    "count": count,
+                    "updated_at": now,
+                    "reconciled_at": now,
+                }
+            },
+            upsert=True,
+        )
+        cache = self._cache()
+        if cache is not None:
+            cache.set(key, count)
+        return count
+
+    def _seed(self, key: str, collection: str, filters: dict[str, Any] | None) -> int:
+        count = self.db[collection].count_documents(filters or {})
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"_id": key},
+            {
+                "$setOnInsert": {
+                    "collection": collection,
+                    "filters": filters or {},
+                    "count": count,
+                    "updated_at": now,
+                    "reconciled_at": now,
+                }
+            },
+            upsert=True,
+        )
+        return count
+
+    @staticmethod
+    def _cache():
+        return app_cache("collection_counts", "COUNT_CACHE_TTL_SECONDS", default_ttl=30)
+
+
+def _stale_before() -> datetime | None:
+    if not has_app_context():
+        return None
+    max_age = current_app.config.get("COLLECTION_STATS_RECONCILE_SECONDS", 0)
+    if not max_age or max_age <= 0:
+        return None
+    return datetime.now(timezone.utc) - timedelta(seconds=max_age)
+
+
+def _older_than(value: datetime | None, cutoff: datetime) -> bool:
+    if value is None:
+        return True
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value < cutoff
@@ -1,18 +1,19 @@
 from __future__ import annotations
 
-import time
-
 from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, session, url_for
 
 from ..auth import login_admin, logout_admin, require_admin
-from ..db import get_db
+from ..registry import request_service
 from ..extensions import limiter
+from ..metrics import count
 from ..repositories.audit_repo import AuditRepository
 from ..services.auth_service import AuthService
 from ..services.books_service import BooksService
 from ..services.certification_service import CertificationService
+from ..services.dashboard_service import DashboardService
 from ..services.gallery_service import GalleryService
 from ..services.github_research_service import GithubResearchService
+from ..services.login_throttle_service import LoginThrottleService
 from ..services.music_service import MusicService
 from ..services.notes_service import NotesService
 from ..services.reading_service import ReadingService
@@ -22,43 +23,51 @@ admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
 
 def _auth_service() -> AuthService:
-    return AuthService(get_db())
+    return request_service(AuthService)
 
 
 def _books_service() -> BooksService:
-    return BooksService(get_db())
+    return request_service(BooksService)
+
+
+def _dashboard_service() -> DashboardService:
+    return request_service(DashboardService)
 
 
 def _gallery_service() -> GalleryService:
-    return GalleryService(get_db())
+    return request_service(GalleryService)
 
 
 def _certification_service() -> CertificationService:
-    return CertificationService(get_db())
+    return request_service(CertificationService)
 
 
 def _notes_service() -> NotesService:
-    return NotesService(get_db())
+    return request_service(NotesService)
 
 
 def _github_research_service() -> GithubResearchService:
-    return GithubResearchService(get_db())
+    return request_service(GithubResearchService)
 
 
 def _music_service() -> MusicService:
-    return MusicService(get_db())
+    return request_service(MusicService)
 
 
 def _site_settings_service() -> SiteSettingsService:
-    return SiteSettingsService(get_db())
+    return request_service(SiteSettingsService)
 
 
 def _reading_service() -> ReadingService:
-    return ReadingService(get_db())
+    return request_service(ReadingService)
+
+
+def _login_throttle_service() -> LoginThrottleService:
+    return request_service(LoginThrottleService)
 
 
 def _audit_repo() -> AuditRepository:
-    return AuditRepository(get_db())
+    return request_service(AuditRepository)
 
 
 def _safe_next(next_path: str | None):
@@ -89,22 +98,23 @@ def login():
     auth_service = _auth_service()
     username = (request.form.get("username") or "").strip()
     password = request.form.get("password") or ""
-    remote_addr = (request.headers.get("X-Forwarded-For") or request.remote_addr or "").split(",")[0].strip()
+    # Behind a proxy, ProxyFix (PROXY_FIX_X_FOR) has already resolved the client address.
+    remote_addr = request.remote_addr or ""
     user_agent = request.user_agent.string or ""
 
-    now = time.time()
-    locked_until = session.get("admin_locked_until", 0)
-    if locked_until and now < locked_until:
-        wait_seconds = int(locked_until - now)
-        auth_service.log_failed_admin_login(
-            username=username,
-            password=password,
-            reason="locked_out",
-            remote_addr=remote_addr,
-            user_agent=user_agent,
-        )
-        flash(f"Too many attempts. Try again in {wait_seconds}s.", "error")
-        return render_template("admin/login.html", next_path=next_path or ""), 429
+    throttle = _login_throttle_service()
+    retry_after = throttle.retry_after(remote_addr=remote_addr, username=username)
+    if retry_after:
+        count("login_throttled_total")
+        if throttle.note_rejection(remote_addr=remote_addr, username=username, retry_after=retry_after):
+            auth_service.log_failed_admin_login(
+                username=username,
+                password=password,
+                reason="throttled",
+                remote_addr=remote_addr,
+                user_agent=user_agent,
+            )
+        return _throttled_login_response(next_path, retry_after)
 
     user = None
     if auth_service.available():
@@ -125,13 +135,7 @@ def login():
             flash("Database unavailable. Signed in using environment credentials.", "warning")
 
     if not user:
-        failed = int(session.get("admin_failed_attempts", 0)) + 1
-        session["admin_failed_attempts"] = failed
-
-        if failed >= 3:
-            backoff_seconds = min(300, 2 ** (failed - 2))
-            session["admin_locked_until"] = now + backoff_seconds
-
+        throttle.record_failure(remote_addr=remote_addr, username=username)
         auth_service.log_failed_admin_login(
             username=username,
             password=password,
@@ -139,14 +143,25 @@ def login():
             remote_addr=remote_addr,
             user_agent=user_agent,
         )
+        retry_after = throttle.username_retry_after(username)
+        if retry_after:
+            return _throttled_login_response(next_path, retry_after)
         flash("Invalid username or password", "error")
         return render_template("admin/login.html", next_path=next_path or ""), 401
 
+    throttle.reset(remote_addr=remote_addr, username=username)
     login_admin(user)
     flash("Signed in successfully", "success")
     return redirect(_safe_next(next_path))
 
 
+def _throttled_login_response(next_path: str | None, retry_after: int):
+    flash(f"Too many attempts. Try again in {retry_after}s.", "error")
+    response = current_app.make_response((render_template("admin/login.html", next_path=next_path or ""), 429))
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+
 @admin_bp.route("/logout", methods=["POST"])
 @require_admin
 def logout():
@@ -186,19 +201,10 @@ def manage():
             flash(str(exc), "error")
         return redirect(url_for("admin.manage"))
 
-    books_service = _books_service()
-    gallery_service = _gallery_service()
     return render_template(
         "admin/manage/content.html",
-        books_count=books_service.count_books(),
-        reading_count=_reading_service().count_entries(),
-        certification_count=_certification_service().count_badges(),
-        gallery_count=gallery_service.count_items(),
-        github_research_count=_github_research_service().count_items(),
-        music_count=_music_service().count_links(),
-        notes_count=_notes_service().count_entries(),
-        failed_logins_count=_auth_service().count_failed_admin_logins(),
         home_notice_banner_text=site_settings_service.get_home_notice_banner_text(),
+        **_dashboard_service().content_counts(),
     )
 
 
@@ -504,7 +510,8 @@ def notes_delete(entry_id):
 def login_attempts():
     auth_service = _auth_service()
     attempts = auth_service.list_failed_admin_logins(limit_raw=request.args.get("limit"))
-    return render_template("admin/login_attempts.html", attempts=attempts)
+    summary = auth_service.summarize_failed_admin_logins()
+    return render_template("admin/login_attempts.html", attempts=attempts, summary=summary)
 
 
 @admin_bp.route("/books/<book_id>/edit", methods=["GET", "POST"])
@@ -1,6 +1,8 @@
 from flask import Blueprint, abort, jsonify, request
 
-from ..db import get_db
+from ..conditional import conditional_get
+from ..db import get_read_db
+from ..registry import request_service
 from ..services.books_service import BooksService
 from ..services.gallery_service import GalleryService
 
@@ -8,8 +10,9 @@ api_bp = Blueprint("api", __name__, url_prefix="/api")
 
 
 @api_bp.route("/books")
+@conditional_get(collections=("books",), args=("query", "cursor", "limit"), per_session=False)
 def books_list():
-    books_service = BooksService(get_db())
+    books_service = request_service(BooksService, get_read_db())
     query = request.args.get("query", "").strip()
     cursor = request.args.get("cursor")
     limit_raw = request.args.get("limit")
@@ -19,8 +22,9 @@ def books_list():
 
 
 @api_bp.route("/books/<id_or_slug>")
+@conditional_get(collections=("books",), per_session=False)
 def books_detail(id_or_slug):
-    books_service = BooksService(get_db())
+    books_service = request_service(BooksService, get_read_db())
     book = books_service.get_public_book(id_or_slug)
     if not book:
         abort(404, description="Book not found")
@@ -28,8 +32,9 @@ def books_detail(id_or_slug):
 
 
 @api_bp.route("/gallery")
+@conditional_get(collections=("gallery_items",), args=("category", "cursor", "limit"), per_session=False)
 def gallery_list():
-    gallery_service = GalleryService(get_db())
+    gallery_service = request_service(GalleryService, get_read_db())
 
     category = request.args.get("category", "all")
     cursor = request.args.get("cursor")
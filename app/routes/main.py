@@ -1,10 +1,34 @@
-from bson import ObjectId
-from flask import Blueprint, Response, abort, current_app, jsonify, redirect, render_template, request, send_from_directory, url_for
-
-from ..db import get_db
+from datetime import datetime, timezone
+
+from flask import (
+    Blueprint,
+    abort,
+    current_app,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    send_from_directory,
+    url_for,
+)
+
+from ..conditional import conditional_get
+from ..db import get_read_db, without_query_deadline
+from ..health import get_health_monitor
+from ..media_cache import CachingBlobReader, get_media_cache
+from ..media_response import blob_response, file_response
+from ..metrics import count, get_metrics, metrics_authorized
+from ..page_cache import cached_page
+from ..registry import request_service
 from ..services.books_service import BooksService
 from ..services.certification_service import CertificationService
 from ..services.gallery_service import GalleryService
+from ..services.media_storage_service import (
+    GALLERY_BLOB_BUCKET,
+    NOTES_AUDIO_BLOB_BUCKET,
+    RESEARCH_PDF_BLOB_BUCKET,
+    blob_repository,
+)
 from ..services.github_research_service import GithubResearchService
 from ..services.music_service import MusicService
 from ..services.notes_service import NotesService
@@ -15,38 +39,39 @@ main_bp = Blueprint("main", __name__)
 
 
 def _books_service() -> BooksService:
-    return BooksService(get_db())
+    return request_service(BooksService, get_read_db())
 
 
 def _gallery_service() -> GalleryService:
-    return GalleryService(get_db())
+    return request_service(GalleryService, get_read_db())
 
 
 def _certification_service() -> CertificationService:
-    return CertificationService(get_db())
+    return request_service(CertificationService, get_read_db())
 
 
 def _notes_service() -> NotesService:
-    return NotesService(get_db())
+    return request_service(NotesService, get_read_db())
 
 
 def _github_research_service() -> GithubResearchService:
-    return GithubResearchService(get_db())
+    return request_service(GithubResearchService, get_read_db())
 
 
 def _music_service() -> MusicService:
-    return MusicService(get_db())
+    return request_service(MusicService, get_read_db())
 
 
 def _site_settings_service() -> SiteSettingsService:
-    return SiteSettingsService(get_db())
+    return request_service(SiteSettingsService, get_read_db())
 
 
 def _reading_service() -> ReadingService:
-    return ReadingService(get_db())
+    return request_service(ReadingService, get_read_db())
 
 
 @main_bp.route("/")
+@cached_page(collections=("site_settings",))
 def home():
     return render_template(
         "pages/index.html",
@@ -60,6 +85,7 @@ def gallery():
 
 
 @main_bp.route("/github-research")
+@cached_page(collections=("github_research_items",))
 def github_research():
     github_research_service = _github_research_service()
     return render_template(
@@ -70,6 +96,8 @@ def github_research():
 
 
 @main_bp.route("/books")
+@conditional_get(collections=("books",), args=("q", "page"))
+@cached_page(collections=("books",), args=("q", "page"))
 def books():
     query = (request.args.get("q") or "").strip()
     page_data = _books_service().list_public_books_page(
@@ -90,12 +118,15 @@ def books():
 
 
 @main_bp.route("/certification")
+@cached_page(collections=("certifications",))
 def certification():
     badges = _certification_service().list_public_badges()
     return render_template("pages/certification.html", badges=badges)
 
 
 @main_bp.route("/music")
+@conditional_get(collections=("music_links",), args=("sort",))
+@cached_page(collections=("music_links",), args=("sort",))
 def music():
     sort = (request.args.get("sort") or "newest").strip().lower()
     if sort not in {"newest", "oldest"}:
@@ -105,6 +136,8 @@ def music():
 
 
 @main_bp.route("/reading")
+@conditional_get(collections=("reading_list", "books"), args=("page",))
+@cached_page(collections=("reading_list", "books"), args=("page",))
 def reading():
     page_data = _reading_service().list_public_books_page(page_raw=request.args.get("page"), per_page_raw="24")
     return render_template(
@@ -124,6 +157,8 @@ def fun():
 
 
 @main_bp.route("/notes")
+@conditional_get(collections=("notes_logs",), args=("kind", "sort"))
+@cached_page(collections=("notes_logs",), args=("kind", "sort"))
 def notes():
     kind = (request.args.get("kind") or "").strip().lower()
     sort = (request.args.get("sort") or "newest").strip().lower()
@@ -142,18 +177,24 @@ def contact():
 
 
 @main_bp.route("/gallery/sketches")
+@conditional_get(collections=("gallery_items",))
+@cached_page(collections=("gallery_items",))
 def gallery_sketches():
     items, _ = _gallery_service().list_public_items(category="sketches", limit_raw="24")
     return render_template("pages/gallery_sketches.html", items=items)
 
 
 @main_bp.route("/gallery/moments")
+@conditional_get(collections=("gallery_items",))
+@cached_page(collections=("gallery_items",))
 def gallery_moments():
     items, _ = _gallery_service().list_public_items(category="moments", limit_raw="24")
     return render_template("pages/gallery_moments.html", items=items)
 
 
 @main_bp.route("/gallery/all")
+@conditional_get(collections=("gallery_items",))
+@cached_page(collections=("gallery_items",))
 def gallery_all():
     items, _ = _gallery_service().list_public_items(category="all", limit_raw="24")
     return render_template("pages/gallery_all.html", items=items)
@@ -166,72 +207,93 @@ def edit():
 
 @main_bp.route("/healthz")
 def healthz():
-    db = get_db()
-    if db is None:
+    snapshot = get_health_monitor().snapshot()
+    database = snapshot["dependencies"]["database"]
+    if snapshot.get("stale"):
+        return jsonify({"status": "degraded", "database": "stale"}), 503
+    if database["status"] == "unconfigured":
         return jsonify({"status": "degraded", "database": "unconfigured"}), 503
-
-    try:
-        db.command("ping")
-    except Exception as exc:
-        return jsonify({"status": "degraded", "database": "down", "error": str(exc)}), 503
+    if database["status"] != "up":
+        return jsonify({"status": "degraded", "database": "down", "error": database.get("error", "")}), 503
 
     return jsonify({"status": "ok", "database": "up"})
 
 
+@main_bp.route("/readyz")
+def readyz():
+    snapshot = get_health_monitor().snapshot()
+    age = (datetime.now(timezone.utc) - snapshot["checked_at"]).total_seconds()
+    payload = {
+        "status": snapshot["status"],
+        "checked_at": snapshot["checked_at"].isoformat(),
+        "age_seconds": round(age, 3),
+        "dependencies": snapshot["dependencies"],
+    }
+    if snapshot.get("stale"):
+        payload["stale"] = True
+    return jsonify(payload), 200 if snapshot["status"] == "ok" else 503
+
+
+@main_bp.route("/metrics")
+def metrics():
+    registry = get_metrics()
+    if registry is None or not metrics_authorized():
+        abort(404)
+    return current_app.response_class(registry.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
 @main_bp.route("/robots.txt")
 def robots_txt():
     return send_from_directory(current_app.static_folder, "robots.txt", mimetype="text/plain")
 
 
-@main_bp.route("/media/gallery/<media_id>/<path:filename>")
-def gallery_media(media_id, filename):
-    db = get_db()
-    if db is None or not ObjectId.is_valid(media_id):
-        abort(404)
+def _blob_response(bucket: str, media_id: str, mimetype: str | None = None, inline_filename: str | None = None):
+    cache = get_media_cache()
+    cached = cache.get(bucket, media_id) if cache is not None else None
+    if cache is not None:
+        count("media_cache_requests_total", result="hit" if cached else "miss")
 
-    blob = db.gallery_upload_blobs.find_one({"_id": ObjectId(media_id)})
-    if not blob:
+    repo = blob_repository(bucket)
+    manifest = cached[1] if cached else repo.get_manifest(media_id)
+    if not manifest:
         abort(404)
 
-    return Response(
-        blob.get("data", b""),
-        mimetype=blob.get("content_type") or "application/octet-stream",
-        headers={"Cache-Control": "public, max-age=31536000, immutable"},
-    )
+    headers = {}
+    if inline_filename:
+        headers["Content-Disposition"] = f'inline; filename="{manifest.get("filename") or inline_filename}"'
 
+    if cached:
+        try:
+            return file_response(cached[0], manifest, mimetype=mimetype, headers=headers)
+        except FileNotFoundError:
+            # Evicted by another worker's prune between get() and send_file.
+            manifest = repo.get_manifest(media_id)
+            if not manifest:
+                abort(404)
+    if cache is not None:
+        # Stream straight from MongoDB; a full read fills the cache on the way out.
+        repo = CachingBlobReader(repo, cache, bucket, media_id)
+    return blob_response(repo, manifest, mimetype=mimetype, headers=headers)
 
-@main_bp.route("/media/notes-audio/<media_id>/<path:filename>")
-def notes_audio_media(media_id, filename):
-    db = get_db()
-    if db is None or not ObjectId.is_valid(media_id):
-        abort(404)
 
-    blob = db.notes_audio_blobs.find_one({"_id": ObjectId(media_id)})
-    if not blob:
-        abort(404)
+@main_bp.route("/media/gallery/<media_id>/<path:filename>")
+@without_query_deadline
+def gallery_media(media_id, filename):
+    return _blob_response(GALLERY_BLOB_BUCKET, media_id)
 
-    return Response(
-        blob.get("data", b""),
-        mimetype=blob.get("content_type") or "application/octet-stream",
-        headers={"Cache-Control": "public, max-age=31536000, immutable"},
-    )
+
+@main_bp.route("/media/notes-audio/<media_id>/<path:filename>")
+@without_query_deadline
+def notes_audio_media(media_id, filename):
+    return _blob_response(NOTES_AUDIO_BLOB_BUCKET, media_id)
 
 
 @main_bp.route("/media/research-pdf/<media_id>/<path:filename>")
+@without_query_deadline
 def research_pdf_media(media_id, filename):
-    db = get_db()
-    if db is None or not ObjectId.is_valid(media_id):
-        abort(404)
-
-    blob = db.research_pdf_blobs.find_one({"_id": ObjectId(media_id)})
-    if not blob:
-        abort(404)
-
-    return Response(
-        blob.get("data", b""),
+    return _blob_response(
+        RESEARCH_PDF_BLOB_BUCKET,
+        media_id,
         mimetype="application/pdf",
-        headers={
-            "Cache-Control": "public, max-age=31536000, immutable",
-            "Content-Disposition": f'inline; filename="{blob.get("filename", "research.pdf")}"',
-        },
+        inline_filename="research.pdf",
     )
@@ -1,6 +1,7 @@
 from .auth_service import AuthService
 from .books_service import BooksService
 from .certification_service import CertificationService
+from .dashboard_service import DashboardService
 from .gallery_service import GalleryService
 from .github_research_service import GithubResearchService
 from .music_service import MusicService
@@ -12,6 +13,7 @@ __all__ = [
     "AuthService",
     "BooksService",
     "CertificationService",
+    "DashboardService",
     "GalleryService",
     "GithubResearchService",
     "MusicService",
@@ -1,12 +1,38 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app, has_app_context
 from passlib.hash import pbkdf2_sha256
 
+from ..config import Config
+from ..db import get_db
+from ..jobs import enqueue_job, job_handler
 from ..repositories.admin_repo import AdminRepository
 from ..repositories.audit_repo import AuditRepository
 from ..utils import parse_positive_int
 
 
+def password_hasher():
+    """``pbkdf2_sha256`` configured with ``ADMIN_PASSWORD_HASH_ROUNDS``."""
+    if has_app_context():
+        rounds = current_app.config.get("ADMIN_PASSWORD_HASH_ROUNDS", Config.ADMIN_PASSWORD_HASH_ROUNDS)
+    else:
+        rounds = Config.ADMIN_PASSWORD_HASH_ROUNDS
+    return pbkdf2_sha256.using(rounds=rounds)
+
+
+def _bootstrap_fingerprint(username: str, password: str, password_hash: str) -> str | None:
+    """HMAC under the app secret of the env credentials, the stored hash and the hash rounds."""
+    if not has_app_context() or not current_app.secret_key:
+        return None
+    rounds = current_app.config.get("ADMIN_PASSWORD_HASH_ROUNDS", Config.ADMIN_PASSWORD_HASH_ROUNDS)
+    message = "\0".join((username, password_hash, str(rounds), password)).encode("utf-8")
+    return hmac.new(str(current_app.secret_key).encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
 class AuthService:
     FAILED_LOGIN_ACTION = "auth.login_failed"
 
@@ -23,10 +49,14 @@ class AuthService:
             return None
 
         password_hash = user.get("password_hash")
-        if not password_hash or not pbkdf2_sha256.verify(password, password_hash):
+        hasher = password_hasher()
+        if not password_hash or not hasher.verify(password, password_hash):
             return None
 
-        self.admin_repo.touch_last_login(username)
+        if hasher.needs_update(password_hash):
+            self.admin_repo.update_password_hash(username, hasher.hash(password))
+
+        enqueue_job("admin.touch_last_login", username=username, at=datetime.now(timezone.utc))
         self.audit_repo.log(
             actor=username,
             action="auth.login",
@@ -80,18 +110,66 @@ class AuthService:
     def count_failed_admin_logins(self) -> int:
         return self.audit_repo.count_by_action(self.FAILED_LOGIN_ACTION)
 
+    def summarize_failed_admin_logins(self, days: int = 7, limit: int = 10):
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(days=days - 1)
+        action = self.FAILED_LOGIN_ACTION
+        return {
+            "days": days,
+            "total": self.audit_repo.count_by_action(action),
+            "last_24_hours": self.audit_repo.count_since(action, now - timedelta(hours=23), period="hour"),
+            "last_days": self.audit_repo.count_since(action, since, period="day"),
+            "top_remote_addrs": self.audit_repo.top_values(action, "remote_addr", since, limit=limit),
+            "top_usernames": self.audit_repo.top_values(action, "attempted_username", since, limit=limit),
+        }
+
+    def admin_matches(self, username: str, password: str) -> bool:
+        """Whether the stored admin is active and already hashes ``password`` with current parameters."""
+        user = self.admin_repo.get_by_username(username)
+        if not user or not user.get("is_active", True) or not user.get("password_hash"):
+            return False
+
+        hasher = password_hasher()
+        return not hasher.needs_update(user["password_hash"]) and hasher.verify(password, user["password_hash"])
+
+    def bootstrap_is_current(self, username: str, password: str) -> bool:
+        """Whether these credentials were already applied by a bootstrap, without running pbkdf2.
+
+        :meth:`bootstrap_admin` records a fingerprint of the credentials it
+        applied; any later change to the stored hash or the hash rounds
+        invalidates it, so a mismatch just means bootstrapping again.
+        """
+        user = self.admin_repo.get_by_username(username)
+        if not user or not user.get("is_active", True) or not user.get("password_hash"):
+            return False
+        stored = user.get("bootstrap_fingerprint")
+        expected = _bootstrap_fingerprint(username, password, user["password_hash"])
+        return bool(stored and expected) and hmac.compare_digest(stored, expected)
+
     def bootstrap_admin(self, username: str, password: str):
         if not self.admin_repo.available():
             raise RuntimeError("MongoDB is required for bootstrapping admin users")
 
-        password_hash = pbkdf2_sha256.hash(password)
-        user = self.admin_repo.upsert_admin(username=username, password_hash=password_hash)
-
-        self.audit_repo.log(
-            actor=username,
-            action="auth.bootstrap",
-            entity="admin_user",
-            entity_id=user.get("id", ""),
-        )
+        if self.admin_matches(username, password):
+            user = self.admin_repo.get_by_username(username)
+        else:
+            password_hash = password_hasher().hash(password)
+            user = self.admin_repo.upsert_admin(username=username, password_hash=password_hash)
+
+            self.audit_repo.log(
+                actor=username,
+                action="auth.bootstrap",
+                entity="admin_user",
+                entity_id=user.get("id", ""),
+            )
 
+        fingerprint = _bootstrap_fingerprint(username, password, user["password_hash"])
+        if fingerprint and user.get("bootstrap_fingerprint") != fingerprint:
+            self.admin_repo.set_bootstrap_fingerprint(username, fingerprint)
+            user = self.admin_repo.get_by_username(username)
         return user
+
+
+@job_handler("admin.touch_last_login")
+def _touch_last_login_job(username: str, at: datetime):
+    AdminRepository(get_db()).touch_last_login(username, at=at)
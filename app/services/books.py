@@ -1,8 +1,27 @@
 from pathlib import Path
 import json
+import marshal
+import os
+import sys
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_FILE = BASE_DIR / "static" / "data" / "books.json"
+SNAPSHOT_FILE = BASE_DIR / "instance" / "books_snapshot.marshal"
+SNAPSHOT_FORMAT = 1
+
+# Only the fields the public and preview payloads read are kept in the snapshot.
+SNAPSHOT_FIELDS = (
+    "id",
+    "slug",
+    "original_title",
+    "title",
+    "subtitle",
+    "authors",
+    "first_publish_year",
+    "cover_url",
+    "description",
+    "updated_at",
+)
 
 
 def load_books():
@@ -13,3 +32,54 @@ def load_books():
 def save_books(books):
     with open(DATA_FILE, "w", encoding="utf-8") as f:
         json.dump(books, f, indent=2)
+
+
+def compact_book(book):
+    compact = {field: book.get(field) for field in SNAPSHOT_FIELDS}
+    updated_at = compact.get("updated_at")
+    if hasattr(updated_at, "isoformat"):
+        compact["updated_at"] = updated_at.isoformat()
+    return compact
+
+
+def read_snapshot(source=DATA_FILE, snapshot=None):
+    """Return the snapshotted books, or None when the snapshot is missing or stale."""
+    try:
+        payload = marshal.loads(Path(snapshot or SNAPSHOT_FILE).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("format") != SNAPSHOT_FORMAT or payload.get("python") != list(sys.version_info[:2]):
+        return None
+
+    signature = source_signature(source)
+    if signature is not None and payload.get("source") != signature:
+        return None
+
+    books = payload.get("books")
+    return books if isinstance(books, list) else None
+
+
+def write_snapshot(books, source=DATA_FILE, snapshot=None):
+    snapshot = Path(snapshot or SNAPSHOT_FILE)
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "python": list(sys.version_info[:2]),
+        "source": source_signature(source),
+        "books": [compact_book(book) for book in books],
+    }
+
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = snapshot.with_name(f"{snapshot.name}.{os.getpid()}.tmp")
+    temp_path.write_bytes(marshal.dumps(payload))
+    os.replace(temp_path, snapshot)
+
+
+def source_signature(source):
+    try:
+        stat = Path(source).stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
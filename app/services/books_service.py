@@ -2,34 +2,106 @@ from __future__ import annotations
 
 import json
 import re
+import time
 from functools import lru_cache
-from pathlib import Path
 from datetime import datetime, timezone
 from typing import Any
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
-from flask import current_app
+from flask import current_app, has_app_context
 
+from ..cache import app_cache
+from ..metrics import observe
 from ..repositories.books_repo import BooksRepository
+from ..repositories.content_version_repo import ContentVersionRepository
 from ..repositories.reading_repo import ReadingRepository
-from ..utils import ensure_unique_slug, extract_year, parse_positive_int, slugify
+from ..utils import (
+    ensure_unique_slug,
+    extract_year,
+    normalize_search_text,
+    parse_positive_int,
+    search_prefixes,
+    search_query_tokens,
+    search_words,
+    slugify,
+)
+from .books import DATA_FILE as BOOKS_DATA_FILE, compact_book, read_snapshot, write_snapshot
 
 _ISBN_PATTERN = re.compile(r"^[0-9Xx \-]+$")
 
 
+def _page_anchor_cache():
+    return app_cache("books_page_anchors", "BOOKS_PAGE_ANCHOR_TTL_SECONDS", default_ttl=86400, maxsize=16)
+
+
+def _search_count_cache():
+    return app_cache("books_search_counts", "COUNT_CACHE_TTL_SECONDS", default_ttl=30)
+
+
+def _clear_listing_caches():
+    for cache in (_page_anchor_cache(), _search_count_cache()):
+        if cache is not None:
+            cache.clear()
+
+
+class _FallbackCatalogue:
+    """Immutable lookup structures over the JSON catalogue, built once per process."""
+
+    def __init__(self, books: list[dict[str, Any]]):
+        self.books = tuple(books)
+        self.by_key: dict[str, dict[str, Any]] = {}
+        token_positions: dict[str, list[int]] = {}
+        search_keys = []
+
+        for position, book in enumerate(self.books):
+            for key in (book.get("slug"), book.get("id")):
+                if key:
+                    self.by_key.setdefault(key, book)
+
+            fields = [book.get("title") or "", book.get("original_title") or "", " ".join(book.get("authors") or [])]
+            search_keys.append(tuple(normalize_search_text(field) for field in fields))
+            words = [word for field in fields for word in search_words(field)]
+            for token in search_prefixes(words):
+                token_positions.setdefault(token, []).append(position)
+
+        self.search_keys = tuple(search_keys)
+        self.token_index = {token: tuple(positions) for token, positions in token_positions.items()}
+        self.search = lru_cache(maxsize=256)(self._search)
+
+    def _search(self, query: str) -> tuple[dict[str, Any], ...]:
+        query_text = normalize_search_text((query or "").strip())
+        if not query_text:
+            return self.books
+
+        # Same semantics as BooksRepository._search_filter: tokenizable queries
+        # match word prefixes only, shorter ones fall back to a substring scan.
+        tokens = search_query_tokens(query_text)
+        if tokens:
+            postings = sorted((self.token_index.get(token, ()) for token in tokens), key=len)
+            matches = set(postings[0]).intersection(*postings[1:])
+            return tuple(self.books[position] for position in sorted(matches))
+
+        return tuple(
+            book
+            for book, keys in zip(self.books, self.search_keys)
+            if any(query_text in key for key in keys)
+        )
+
+
 class BooksService:
     def __init__(self, db):
         self.repo = BooksRepository(db)
         self.reading_repo = ReadingRepository(db)
+        self.versions = ContentVersionRepository(db)
 
     def list_public_books(self, query: str = "", limit_raw: str | None = None, cursor: str | None = None):
         limit = parse_positive_int(limit_raw, default=20, max_value=50)
 
         if not self.repo.available():
             return self._list_fallback_books(query=query, limit=limit, cursor=cursor)
-        books, next_cursor = self.repo.list_books(query=query, limit=limit, cursor=cursor)
+        books, next_cursor = self.repo.list_books(query=query, limit=limit, cursor=cursor, projection="card")
         return [self._to_public_payload(book) for book in books], next_cursor
 
     def list_public_books_page(self, query: str = "", page_raw: str | None = None, per_page_raw: str | None = None):
@@ -53,14 +125,18 @@ class BooksService:
                 "has_next": safe_page < total_pages,
             }
 
-        books, total = self.repo.list_books_page(query=query, page=page, per_page=per_page)
-        total_pages = max(1, (total + per_page - 1) // per_page)
-
-        # If page is out of range, clamp to the last available page.
-        if total > 0 and page > total_pages:
-            page = total_pages
-            books, total = self.repo.list_books_page(query=query, page=page, per_page=per_page)
+        if query:
+            total = self._count_matching(query)
+            page = self._clamp_page(page, total=total, per_page=per_page)
+            books = self.repo.search_books_page(query=query, page=page, per_page=per_page, projection="card")
+        else:
+            # Browse pages seek from cached _id anchors, so deep pages cost the same as page 1.
+            anchors, total = self._page_anchors(per_page)
+            page = self._clamp_page(page, total=total, per_page=per_page)
+            anchor = anchors[page - 1] if anchors else None
+            books = self.repo.list_books_from(anchor, limit=per_page, projection="card")
 
+        total_pages = max(1, (total + per_page - 1) // per_page)
         return {
             "items": [self._to_public_payload(book) for book in books],
             "page": page,
@@ -73,16 +149,9 @@ class BooksService:
 
     def get_public_book(self, id_or_slug: str):
         if not self.repo.available():
-            book = next(
-                (
-                    candidate
-                    for candidate in self._fallback_books()
-                    if candidate.get("slug") == id_or_slug or candidate.get("id") == id_or_slug
-                ),
-                None,
-            )
+            book = self._fallback_catalogue().by_key.get(id_or_slug)
             return self._to_public_payload(book)
-        book = self.repo.get_by_id_or_slug(id_or_slug)
+        book = self.repo.get_by_id_or_slug(id_or_slug, projection="detail")
         return self._to_public_payload(book)
 
     def list_preview_books(self, limit: int = 8):
@@ -99,14 +168,14 @@ class BooksService:
         if not self.repo.available():
             return []
 
-        docs, _ = self.repo.list_books(query=query, limit=limit)
+        docs, _ = self.repo.list_books(query=query, limit=limit, projection="admin_row")
         return [self._to_admin_payload(doc) for doc in docs]
 
     def get_admin_book(self, book_id: str):
         if not self.repo.available():
             return None
 
-        doc = self.repo.get_by_id(book_id)
+        doc = self.repo.get_by_id(book_id, projection="detail")
         return self._to_admin_payload(doc)
 
     def update_admin_book(self, book_id: str, form_data: dict[str, Any]):
@@ -140,6 +209,9 @@ class BooksService:
         }
 
         updated = self.repo.update_book(book_id, update_fields)
+        if updated:
+            self.reading_repo.update_book_snapshot(book_id, updated)
+        self._content_changed()
         return self._to_admin_payload(updated)
 
     def create_admin_book(self, form_data: dict[str, Any]):
@@ -177,6 +249,7 @@ class BooksService:
                 "created_at": now,
             }
         )
+        self._content_changed()
         return self._to_admin_payload(created)
 
     def delete_admin_book(self, book_id: str) -> bool:
@@ -187,7 +260,10 @@ class BooksService:
         if reading_refs > 0:
             raise ValueError("Remove this book from reading list before deleting")
 
-        return self.repo.delete_book(book_id)
+        deleted = self.repo.delete_book(book_id)
+        if deleted:
+            self._content_changed()
+        return deleted
 
     def search_open_books(self, query: str, limit_raw: str | None = None):
         query_text = (query or "").strip()
@@ -217,11 +293,14 @@ class BooksService:
 
         url = f"{api_base}/search.json?{urlencode(params)}"
         request = Request(url=url, headers=request_headers)
+        started = time.perf_counter()
         try:
             with urlopen(request, timeout=8) as response:
                 body = response.read().decode("utf-8")
         except (HTTPError, OSError, TimeoutError, URLError):
+            observe("external_request_duration_seconds", time.perf_counter() - started, service="openlibrary", outcome="error")
             return []
+        observe("external_request_duration_seconds", time.perf_counter() - started, service="openlibrary", outcome="ok")
 
         try:
             data = json.loads(body)
@@ -282,6 +361,7 @@ class BooksService:
                 "created_at": now,
             }
         )
+        self._content_changed()
         return self._to_admin_payload(created)
 
     def normalize_source_book(self, raw_book: dict[str, Any], used_slugs: set[str] | None = None):
@@ -328,6 +408,30 @@ class BooksService:
             return len(self._fallback_books())
         return self.repo.count_books()
 
+    def _content_changed(self):
+        _clear_listing_caches()
+        self.versions.bump("books")
+
+    def _count_matching(self, query: str) -> int:
+        cache = _search_count_cache()
+        if cache is None:
+            return self.repo.count_matching(query)
+        return cache.get_or_set(query, lambda: self.repo.count_matching(query))
+
+    def _page_anchors(self, per_page: int):
+        cache = _page_anchor_cache()
+        if cache is None:
+            return self.repo.list_page_anchors(per_page=per_page)
+        # Keyed by the books generation, so anchors are rebuilt after an admin write
+        # in any worker rather than every time a short TTL runs out.
+        version = self.versions.get_versions(("books",)).get("books", {}).get("version", 0)
+        return cache.get_or_set((per_page, version), lambda: self.repo.list_page_anchors(per_page=per_page))
+
+    @staticmethod
+    def _clamp_page(page: int, total: int, per_page: int) -> int:
+        total_pages = max(1, (total + per_page - 1) // per_page)
+        return min(max(page, 1), total_pages)
+
     def _list_fallback_books(self, query: str, limit: int, cursor: str | None):
         books = self._search_fallback_books(query=query)
         offset = 0
@@ -346,27 +450,35 @@ class BooksService:
         return [self._to_public_payload(book) for book in page_slice], next_cursor
 
     def _search_fallback_books(self, query: str):
-        books = self._fallback_books()
-        query_text = (query or "").strip().lower()
-        if not query_text:
-            return books
+        return self._fallback_catalogue().search(query)
 
-        return [
-            book
-            for book in books
-            if query_text in ((book.get("title") or "").lower())
-            or query_text in ((book.get("original_title") or "").lower())
-            or query_text in (" ".join(book.get("authors") or []).lower())
-        ]
+    def _fallback_books(self):
+        return self._fallback_catalogue().books
 
     @staticmethod
     @lru_cache(maxsize=1)
-    def _fallback_books():
-        base_dir = Path(__file__).resolve().parents[2]
-        books_path = base_dir / "static" / "data" / "books.json"
+    def _fallback_catalogue():
+        return _FallbackCatalogue(BooksService._load_fallback_books())
+
+    @staticmethod
+    def _load_fallback_books():
+        books = read_snapshot()
+        if books is not None:
+            return books
+
+        books = BooksService.build_fallback_books()
+        if books:
+            try:
+                write_snapshot(books)
+            except OSError as exc:
+                if has_app_context():
+                    current_app.logger.warning("Unable to write books snapshot: %s", exc)
+        return books
 
+    @staticmethod
+    def build_fallback_books():
         try:
-            raw = json.loads(books_path.read_text(encoding="utf-8"))
+            raw = json.loads(BOOKS_DATA_FILE.read_text(encoding="utf-8"))
         except (OSError, json.JSONDecodeError):
             return []
 
@@ -381,7 +493,7 @@ class BooksService:
                 continue
             doc = service.normalize_source_book(entry, used_slugs=used_slugs)
             doc["id"] = doc.get("slug")
-            normalized.append(doc)
+            normalized.append(compact_book(doc))
         return normalized
 
     def _to_preview_payload(self, book: dict[str, Any] | None):
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 
+from ..repositories.content_version_repo import ContentVersionRepository
 from ..repositories.certification_repo import CertificationRepository
 
 
@@ -13,6 +14,7 @@ _UUID_PATTERN = re.compile(
 class CertificationService:
     def __init__(self, db):
         self.repo = CertificationRepository(db)
+        self.versions = ContentVersionRepository(db)
 
     def list_public_badges(self):
         if not self.repo.available():
@@ -29,6 +31,7 @@ class CertificationService:
             raise RuntimeError("MongoDB is required for certification management")
         badge = self._validate_payload(payload)
         created = self.repo.insert_badge(badge)
+        self.versions.bump("certifications")
         return self._serialize_badge(created)
 
     def update_badge(self, badge_id: str, payload: dict):
@@ -36,12 +39,15 @@ class CertificationService:
             raise RuntimeError("MongoDB is required for certification management")
         badge = self._validate_payload(payload)
         updated = self.repo.update_badge(badge_id, badge)
+        self.versions.bump("certifications")
         return self._serialize_badge(updated)
 
     def delete_badge(self, badge_id: str):
         if not self.repo.available():
             raise RuntimeError("MongoDB is required for certification management")
-        return self.repo.delete_badge(badge_id)
+        deleted = self.repo.delete_badge(badge_id)
+        self.versions.bump("certifications")
+        return deleted
 
     def count_badges(self) -> int:
         if not self.repo.available():
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from ..repositories.stats_repo import CollectionStatsRepository
+from .auth_service import AuthService
+from .books_service import BooksService
+
+
+class DashboardService:
+    COUNTERS = {
+        "books_count": ("books", None),
+        "reading_count": ("reading_list", None),
+        "certification_count": ("certifications", None),
+        "gallery_count": ("gallery_items", None),
+        "github_research_count": ("github_research_items", None),
+        "music_count": ("music_links", None),
+        "notes_count": ("notes_logs", None),
+    }
+
+    def __init__(self, db):
+        self.stats_repo = CollectionStatsRepository(db)
+        self.auth_service = AuthService(db)
+
+    def content_counts(self) -> dict[str, int]:
+        if not self.stats_repo.available():
+            counts = {name: 0 for name in self.COUNTERS}
+            counts["books_count"] = BooksService(db=None).count_books()
+            counts["failed_logins_count"] = 0
+            return counts
+
+        counts = self.stats_repo.get_counts(self.COUNTERS)
+        counts["failed_logins_count"] = self.auth_service.count_failed_admin_logins()
+        return counts
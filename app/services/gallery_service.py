@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from .media_storage_service import delete_image, upload_image
+from .media_storage_service import create_image_variants, delete_image, delete_image_variants, upload_image
+from ..db import get_db
+from ..jobs import enqueue_job, job_handler
+from ..repositories.content_version_repo import ContentVersionRepository
 from ..repositories.gallery_repo import GalleryRepository
 from ..utils import parse_positive_int
 
@@ -14,6 +17,7 @@ VALID_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 class GalleryService:
     def __init__(self, db):
         self.repo = GalleryRepository(db)
+        self.versions = ContentVersionRepository(db)
 
     def list_public_items(self, category: str = "", limit_raw: str | None = None, cursor: str | None = None):
         limit = parse_positive_int(limit_raw, default=20, max_value=50)
@@ -37,10 +41,13 @@ class GalleryService:
 
         item = self._validate_payload(payload)
         self._attach_uploaded_image(item, file_storage)
+        self._reset_image_variants(item)
         now = datetime.now(timezone.utc)
         item["created_at"] = now
         item["updated_at"] = now
         created = self.repo.insert_item(item)
+        self.versions.bump("gallery_items")
+        self._schedule_image_variants(created)
         return self._serialize_item(created)
 
     def update_item(self, item_id: str, payload: dict, file_storage=None):
@@ -50,13 +57,20 @@ class GalleryService:
         current_item = self.repo.get_by_id(item_id)
         item = self._validate_payload(payload)
         self._attach_uploaded_image(item, file_storage)
+        new_public_id = self._public_id(item)
+        old_public_id = self._public_id(current_item or {})
+        image_changed = new_public_id != old_public_id
+        if image_changed:
+            self._reset_image_variants(item)
         item["updated_at"] = datetime.now(timezone.utc)
         updated = self.repo.update_item(item_id, item)
+        self.versions.bump("gallery_items")
 
-        new_public_id = self._public_id(item)
-        old_public_id = self._public_id(current_item or {})
-        if new_public_id and old_public_id and old_public_id != new_public_id:
+        if new_public_id and old_public_id and image_changed:
             delete_image(old_public_id)
+        if current_item and image_changed:
+            delete_image_variants(current_item.get("image_variants"))
+            self._schedule_image_variants(updated)
 
         return self._serialize_item(updated)
 
@@ -66,8 +80,10 @@ class GalleryService:
 
         current_item = self.repo.get_by_id(item_id)
         deleted = self.repo.delete_item(item_id)
+        self.versions.bump("gallery_items")
         if deleted and current_item:
             delete_image(self._public_id(current_item))
+            delete_image_variants(current_item.get("image_variants"))
         return deleted
 
     def set_item_archived(self, item_id: str, archived: bool):
@@ -75,6 +91,7 @@ class GalleryService:
             raise RuntimeError("MongoDB is required for gallery management")
 
         updated = self.repo.set_published(item_id=item_id, is_published=not archived)
+        self.versions.bump("gallery_items")
         return self._serialize_item(updated)
 
     def upload_item_image(self, file_storage):
@@ -132,6 +149,33 @@ class GalleryService:
         item["image_url"] = upload_result["image_url"]
         item["storage_public_id"] = upload_result["public_id"]
 
+    def generate_image_variants(self, item_id: str, storage_public_id: str) -> bool:
+        result = create_image_variants(storage_public_id)
+        if not result:
+            return False
+
+        attached = self.repo.set_image_variants(
+            item_id,
+            storage_public_id,
+            image_width=result["image_width"],
+            variants=result["image_variants"],
+        )
+        if not attached:
+            delete_image_variants(result["image_variants"])
+            return False
+
+        self.versions.bump("gallery_items")
+        return True
+
+    def _reset_image_variants(self, item: dict):
+        item["image_width"] = None
+        item["image_variants"] = []
+
+    def _schedule_image_variants(self, item: dict | None):
+        public_id = self._public_id(item or {})
+        if public_id:
+            enqueue_job("gallery.create_image_variants", item_id=item["id"], storage_public_id=public_id)
+
     def _public_id(self, item: dict):
         return (item.get("storage_public_id") or item.get("cloudinary_public_id") or "").strip()
 
@@ -148,4 +192,20 @@ class GalleryService:
             value = payload.get(field)
             if hasattr(value, "isoformat"):
                 payload[field] = value.isoformat()
+        payload["srcset"] = self._srcset(payload)
         return payload
+
+    def _srcset(self, item: dict) -> str:
+        variants = item.get("image_variants") or []
+        if not variants or not item.get("image_url"):
+            return ""
+
+        candidates = [f"{variant['url']} {variant['width']}w" for variant in variants]
+        if item.get("image_width"):
+            candidates.append(f"{item['image_url']} {item['image_width']}w")
+        return ", ".join(candidates)
+
+
+@job_handler("gallery.create_image_variants")
+def _create_image_variants_job(item_id: str, storage_public_id: str):
+    GalleryService(get_db()).generate_image_variants(item_id, storage_public_id)
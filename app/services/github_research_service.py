@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from urllib.parse import urlparse
 
+from ..repositories.content_version_repo import ContentVersionRepository
 from ..repositories.github_research_repo import GithubResearchRepository
 from .media_storage_service import delete_research_pdf, upload_research_pdf
 
@@ -11,6 +12,7 @@ class GithubResearchService:
 
     def __init__(self, db):
         self.repo = GithubResearchRepository(db)
+        self.versions = ContentVersionRepository(db)
 
     def list_public_repositories(self):
         if not self.repo.available():
@@ -32,6 +34,7 @@ class GithubResearchService:
             raise RuntimeError("MongoDB is required for GitHub and research management")
         item = self._validate_payload(payload, file_storage=file_storage)
         created = self.repo.insert_item(item)
+        self.versions.bump("github_research_items")
         return self._serialize_item(created)
 
     def update_item(self, item_id: str, payload: dict, file_storage=None):
@@ -40,6 +43,7 @@ class GithubResearchService:
         current_item = self.repo.get_by_id(item_id)
         item = self._validate_payload(payload, file_storage=file_storage, current_item=current_item)
         updated = self.repo.update_item(item_id, item)
+        self.versions.bump("github_research_items")
         old_public_id = (current_item or {}).get("storage_public_id", "")
         new_public_id = item.get("storage_public_id", old_public_id)
         if old_public_id and old_public_id != new_public_id:
@@ -51,6 +55,7 @@ class GithubResearchService:
             raise RuntimeError("MongoDB is required for GitHub and research management")
         current_item = self.repo.get_by_id(item_id)
         deleted = self.repo.delete_item(item_id)
+        self.versions.bump("github_research_items")
         if deleted:
             delete_research_pdf((current_item or {}).get("storage_public_id", ""))
         return deleted
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+from ..repositories.login_throttle_repo import LoginThrottleRepository, MemoryLoginThrottleStore
+
+_memory_store_lock = threading.Lock()
+
+
+class LoginThrottleService:
+    """Sliding-window limits on failed admin logins.
+
+    Two kinds of limit apply:
+
+    * Hard limits, keyed by client address and by address plus username, are
+      checked before the password hash is verified, so throttled requests cost
+      one small indexed read.
+    * A soft limit, keyed by username alone, only applies once the credentials
+      have failed. A valid password still gets in from a fresh address, so
+      failures spread across many addresses slow an attacker down without
+      locking the real admin out.
+
+    Backed by MongoDB so every worker shares the same view, with a per-process
+    memory store when the database is unavailable.
+    """
+
+    def __init__(self, db):
+        repo = LoginThrottleRepository(db)
+        self.store = repo if repo.available() else _memory_store()
+
+    def retry_after(self, remote_addr: str, username: str) -> int:
+        """Seconds until this address may try again, or ``0`` if it may go ahead now."""
+        return self._retry_after(self._hard_rules(remote_addr, username))
+
+    def username_retry_after(self, username: str) -> int:
+        """Seconds until failures for ``username`` stop being answered with a delay."""
+        return self._retry_after(self._username_rules(username))
+
+    def record_failure(self, remote_addr: str, username: str):
+        rules = self._hard_rules(remote_addr, username) + self._username_rules(username)
+        windows = {key: window for key, _, window in rules}
+        if windows:
+            self.store.record(windows, datetime.now(timezone.utc))
+
+    def note_rejection(self, remote_addr: str, username: str, retry_after: int) -> bool:
+        """Remember a throttled attempt; ``True`` only for the first one until the throttle lifts.
+
+        Lets the caller audit one event per throttled address instead of one per
+        request, so a flood of rejected attempts does not turn into a flood of writes.
+        """
+        key = f"throttled:{remote_addr}" if remote_addr else f"throttled:{_username_key(username)}"
+        now = datetime.now(timezone.utc)
+        if self.store.recent(key, since=now - timedelta(seconds=retry_after), limit=1):
+            return False
+        self.store.record({key: retry_after}, now)
+        return True
+
+    def reset(self, remote_addr: str, username: str):
+        if username:
+            self.store.clear(_username_key(username))
+            self.store.clear(_address_username_key(remote_addr, username))
+
+    def _retry_after(self, rules: list[tuple[str, int, int]]) -> int:
+        now = datetime.now(timezone.utc)
+        wait = 0.0
+        for key, limit, window in rules:
+            recent = self.store.recent(key, since=now - timedelta(seconds=window), limit=limit)
+            if len(recent) >= limit:
+                wait = max(wait, (recent[-1] + timedelta(seconds=window) - now).total_seconds())
+        return max(0, math.ceil(wait))
+
+    @staticmethod
+    def _hard_rules(remote_addr: str, username: str) -> list[tuple[str, int, int]]:
+        config = current_app.config
+        rules = []
+        if remote_addr:
+            rules.append(
+                (
+                    f"ip:{remote_addr}",
+                    config.get("LOGIN_THROTTLE_IP_LIMIT", 20),
+                    config.get("LOGIN_THROTTLE_IP_WINDOW_SECONDS", 900),
+                )
+            )
+        if username:
+            rules.append(
+                (
+                    _address_username_key(remote_addr, username),
+                    config.get("LOGIN_THROTTLE_USERNAME_LIMIT", 5),
+                    config.get("LOGIN_THROTTLE_USERNAME_WINDOW_SECONDS", 900),
+                )
+            )
+        return [rule for rule in rules if rule[1] > 0]
+
+    @staticmethod
+    def _username_rules(username: str) -> list[tuple[str, int, int]]:
+        config = current_app.config
+        limit = config.get("LOGIN_THROTTLE_USERNAME_LIMIT", 5)
+        if not username or limit <= 0:
+            return []
+        return [(_username_key(username), limit, config.get("LOGIN_THROTTLE_USERNAME_WINDOW_SECONDS", 900))]
+
+
+def _username_key(username: str) -> str:
+    return f"user:{username.strip().casefold()}"
+
+
+def _address_username_key(remote_addr: str, username: str) -> str:
+    return f"ipuser:{remote_addr}:{username.strip().casefold()}"
+
+
+def _memory_store() -> MemoryLoginThrottleStore:
+    with _memory_store_lock:
+        store = current_app.extensions.get("login_throttle_memory")
+        if store is None:
+            store = MemoryLoginThrottleStore()
+            current_app.extensions["login_throttle_memory"] = store
+        return store
@@ -1,42 +1,79 @@
 from __future__ import annotations
 
+import io
 from pathlib import Path
 from uuid import uuid4
 
-from bson import ObjectId
-from bson.binary import Binary
 from flask import current_app, url_for
 from werkzeug.utils import secure_filename
 
+from ..jobs import enqueue_job, job_handler
+from ..media_cache import configure_media_cache, get_media_cache
+from ..repositories.blob_repo import ChunkedBlobRepository
+
+try:
+    from PIL import Image, ImageOps
+    from PIL import features as pil_features
+except ImportError:  # Pillow is optional: without it galleries serve originals only.
+    Image = None
+
 ALLOWED_AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".ogg", ".aac", ".flac", ".webm"}
 MAX_AUDIO_UPLOAD_SIZE = 20 * 1024 * 1024
 ALLOWED_PDF_EXTENSIONS = {".pdf"}
 MAX_PDF_UPLOAD_SIZE = 25 * 1024 * 1024
 
+GALLERY_BLOB_BUCKET = "gallery_upload_blobs"
+NOTES_AUDIO_BLOB_BUCKET = "notes_audio_blobs"
+RESEARCH_PDF_BLOB_BUCKET = "research_pdf_blobs"
+MEDIA_BLOB_BUCKETS = (GALLERY_BLOB_BUCKET, NOTES_AUDIO_BLOB_BUCKET, RESEARCH_PDF_BLOB_BUCKET)
+IMAGE_VARIANT_WIDTHS = (320, 960)
+IMAGE_VARIANT_QUALITY = 80
+
 
 def configure_media_storage(app):
     app.logger.info("Media storage backend: MongoDB")
+    configure_media_cache(app)
 
 
-def upload_image(file_storage):
-    db = current_app.extensions.get("mongo_db")
-    if db is None:
+def blob_repository(bucket: str) -> ChunkedBlobRepository:
+    return ChunkedBlobRepository(current_app.extensions.get("mongo_db"), bucket)
+
+
+def _upload_repository(bucket: str) -> ChunkedBlobRepository:
+    repo = blob_repository(bucket)
+    if not repo.available():
         raise RuntimeError("MongoDB is unavailable for upload storage")
+    return repo
+
+
+def _delete_blob(bucket: str, public_id: str):
+    if not public_id or not public_id.startswith("mongo:"):
+        return
+    enqueue_job("media.delete_blob", bucket=bucket, public_id=public_id)
+
+
+@job_handler("media.delete_blob")
+def _delete_blob_job(bucket: str, public_id: str):
+    media_id = public_id.removeprefix("mongo:").strip()
+    blob_repository(bucket).delete(media_id)
+    cache = get_media_cache()
+    if cache is not None:
+        cache.discard(bucket, media_id)
+
+
+def upload_image(file_storage):
+    repo = _upload_repository(GALLERY_BLOB_BUCKET)
 
     original_name = secure_filename(file_storage.filename or "")
     suffix = Path(original_name).suffix.lower() or ".bin"
     filename = original_name or f"{uuid4().hex}{suffix}"
 
     file_storage.stream.seek(0)
-    content = file_storage.stream.read()
-    result = db.gallery_upload_blobs.insert_one(
-        {
-            "filename": filename,
-            "content_type": file_storage.mimetype or "application/octet-stream",
-            "data": Binary(content),
-        }
+    file_id = repo.put(
+        file_storage.stream,
+        filename=filename,
+        content_type=file_storage.mimetype or "application/octet-stream",
     )
-    file_id = result.inserted_id
 
     return {
         "image_url": url_for("main.gallery_media", media_id=str(file_id), filename=filename),
@@ -45,24 +82,75 @@ def upload_image(file_storage):
 
 
 def delete_image(public_id: str):
-    if not public_id or not public_id.startswith("mongo:"):
-        return
-
-    object_id_raw = public_id.removeprefix("mongo:").strip()
-    if not ObjectId.is_valid(object_id_raw):
-        return
-
-    db = current_app.extensions.get("mongo_db")
-    if db is None:
-        return
-
-    db.gallery_upload_blobs.delete_one({"_id": ObjectId(object_id_raw)})
+    _delete_blob(GALLERY_BLOB_BUCKET, public_id)
+
+
+def create_image_variants(public_id: str) -> dict:
+    """Store downscaled copies of an uploaded gallery image next to the original.
+
+    Returns ``{"image_width": ..., "image_variants": [...]}`` where each variant has
+    its own media id, or an empty dict when Pillow is unavailable or the original
+    cannot be decoded. Widths at or above the original's are skipped.
+    """
+    if Image is None or not public_id or not public_id.startswith("mongo:"):
+        return {}
+
+    repo = blob_repository(GALLERY_BLOB_BUCKET)
+    manifest = repo.get_manifest(public_id.removeprefix("mongo:").strip())
+    if not manifest:
+        return {}
+
+    if pil_features.check("webp"):
+        image_format, content_type, extension = "WEBP", "image/webp", "webp"
+    else:
+        image_format, content_type, extension = "JPEG", "image/jpeg", "jpg"
+    stem = Path(manifest.get("filename") or "image").stem
+
+    variants = []
+    try:
+        with Image.open(io.BytesIO(b"".join(repo.iter_bytes(manifest)))) as original:
+            if getattr(original, "is_animated", False):
+                return {}
+            image = ImageOps.exif_transpose(original)
+            width, height = image.size
+            if image_format == "JPEG" and image.mode not in {"RGB", "L"}:
+                image = image.convert("RGB")
+
+            for target_width in IMAGE_VARIANT_WIDTHS:
+                if target_width >= width:
+                    break
+                target_height = max(1, round(height * target_width / width))
+                buffer = io.BytesIO()
+                image.resize((target_width, target_height), Image.Resampling.LANCZOS).save(
+                    buffer, format=image_format, quality=IMAGE_VARIANT_QUALITY
+                )
+                buffer.seek(0)
+
+                filename = f"{stem}-{target_width}w.{extension}"
+                file_id = repo.put(buffer, filename=filename, content_type=content_type)
+                variants.append(
+                    {
+                        "width": target_width,
+                        "url": url_for("main.gallery_media", media_id=str(file_id), filename=filename),
+                        "public_id": f"mongo:{file_id}",
+                        "content_type": content_type,
+                    }
+                )
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        current_app.logger.warning("Unable to create image variants for %s: %s", public_id, exc)
+        delete_image_variants(variants)
+        return {}
+
+    return {"image_width": width, "image_variants": variants}
+
+
+def delete_image_variants(variants: list[dict] | None):
+    for variant in variants or []:
+        delete_image(variant.get("public_id", ""))
 
 
 def upload_note_audio(file_storage):
-    db = current_app.extensions.get("mongo_db")
-    if db is None:
-        raise RuntimeError("MongoDB is unavailable for upload storage")
+    repo = _upload_repository(NOTES_AUDIO_BLOB_BUCKET)
 
     original_name = secure_filename(file_storage.filename or "")
     suffix = Path(original_name).suffix.lower()
@@ -71,18 +159,13 @@ def upload_note_audio(file_storage):
 
     filename = original_name or f"{uuid4().hex}{suffix or '.bin'}"
     file_storage.stream.seek(0)
-    content = file_storage.stream.read()
-    if len(content) > MAX_AUDIO_UPLOAD_SIZE:
-        raise ValueError("Audio file is too large (max 20MB)")
-
-    result = db.notes_audio_blobs.insert_one(
-        {
-            "filename": filename,
-            "content_type": file_storage.mimetype or "application/octet-stream",
-            "data": Binary(content),
-        }
+    file_id = repo.put(
+        file_storage.stream,
+        filename=filename,
+        content_type=file_storage.mimetype or "application/octet-stream",
+        max_size=MAX_AUDIO_UPLOAD_SIZE,
+        too_large_message="Audio file is too large (max 20MB)",
     )
-    file_id = result.inserted_id
 
     return {
         "audio_url": url_for("main.notes_audio_media", media_id=str(file_id), filename=filename),
@@ -92,24 +175,11 @@ def upload_note_audio(file_storage):
 
 
 def delete_note_audio(public_id: str):
-    if not public_id or not public_id.startswith("mongo:"):
-        return
-
-    object_id_raw = public_id.removeprefix("mongo:").strip()
-    if not ObjectId.is_valid(object_id_raw):
-        return
-
-    db = current_app.extensions.get("mongo_db")
-    if db is None:
-        return
-
-    db.notes_audio_blobs.delete_one({"_id": ObjectId(object_id_raw)})
+    _delete_blob(NOTES_AUDIO_BLOB_BUCKET, public_id)
 
 
 def upload_research_pdf(file_storage):
-    db = current_app.extensions.get("mongo_db")
-    if db is None:
-        raise RuntimeError("MongoDB is unavailable for upload storage")
+    repo = _upload_repository(RESEARCH_PDF_BLOB_BUCKET)
 
     original_name = secure_filename(file_storage.filename or "")
     suffix = Path(original_name).suffix.lower()
@@ -118,18 +188,13 @@ def upload_research_pdf(file_storage):
 
     filename = original_name or f"{uuid4().hex}.pdf"
     file_storage.stream.seek(0)
-    content = file_storage.stream.read()
-    if len(content) > MAX_PDF_UPLOAD_SIZE:
-        raise ValueError("PDF file is too large (max 25MB)")
-
-    result = db.research_pdf_blobs.insert_one(
-        {
-            "filename": filename,
-            "content_type": "application/pdf",
-            "data": Binary(content),
-        }
+    file_id = repo.put(
+        file_storage.stream,
+        filename=filename,
+        content_type="application/pdf",
+        max_size=MAX_PDF_UPLOAD_SIZE,
+        too_large_message="PDF file is too large (max 25MB)",
     )
-    file_id = result.inserted_id
 
     return {
         "pdf_url": url_for("main.research_pdf_media", media_id=str(file_id), filename=filename),
@@ -139,15 +204,4 @@ def upload_research_pdf(file_storage):
 
 
 def delete_research_pdf(public_id: str):
-    if not public_id or not public_id.startswith("mongo:"):
-        return
-
-    object_id_raw = public_id.removeprefix("mongo:").strip()
-    if not ObjectId.is_valid(object_id_raw):
-        return
-
-    db = current_app.extensions.get("mongo_db")
-    if db is None:
-        return
-
-    db.research_pdf_blobs.delete_one({"_id": ObjectId(object_id_raw)})
+    _delete_blob(RESEARCH_PDF_BLOB_BUCKET, public_id)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 
+from ..repositories.content_version_repo import ContentVersionRepository
 from ..repositories.music_repo import MusicRepository
 
 
@@ -11,6 +12,7 @@ _YOUTUBE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
 class MusicService:
     def __init__(self, db):
         self.repo = MusicRepository(db)
+        self.versions = ContentVersionRepository(db)
 
     def list_public_links(self, sort: str = "newest"):
         if not self.repo.available():
@@ -30,6 +32,7 @@ class MusicService:
             raise RuntimeError("MongoDB is required for music management")
         link = self._validate_payload(payload)
         created = self.repo.insert_link(link)
+        self.versions.bump("music_links")
         return self._serialize_link(created)
 
     def update_link(self, link_id: str, payload: dict):
@@ -37,12 +40,15 @@ class MusicService:
             raise RuntimeError("MongoDB is required for music management")
         link = self._validate_payload(payload)
         updated = self.repo.update_link(link_id, link)
+        self.versions.bump("music_links")
         return self._serialize_link(updated)
 
     def delete_link(self, link_id: str):
         if not self.repo.available():
             raise RuntimeError("MongoDB is required for music management")
-        return self.repo.delete_link(link_id)
+        deleted = self.repo.delete_link(link_id)
+        self.versions.bump("music_links")
+        return deleted
 
     def count_links(self) -> int:
         if not self.repo.available():
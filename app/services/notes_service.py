@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+from ..repositories.content_version_repo import ContentVersionRepository
 from ..repositories.notes_repo import NotesRepository
 from .media_storage_service import delete_note_audio, upload_note_audio
 from ..utils import parse_positive_int
@@ -14,6 +15,7 @@ MAX_UPLOAD_SIZE = 2 * 1024 * 1024
 class NotesService:
     def __init__(self, db):
         self.repo = NotesRepository(db)
+        self.versions = ContentVersionRepository(db)
 
     def list_public_entries(self, limit_raw: str | None = None, kind: str = "", sort: str = "newest"):
         limit = parse_positive_int(limit_raw, default=50, max_value=200)
@@ -46,7 +48,9 @@ class NotesService:
             audio_file_storage=audio_file_storage,
         )
         payload["created_at"] = datetime.now(timezone.utc)
-        return self._serialize_entry(self.repo.insert_entry(payload))
+        created = self.repo.insert_entry(payload)
+        self.versions.bump("notes_logs")
+        return self._serialize_entry(created)
 
     def update_entry(self, entry_id: str, form_data, file_storage=None, audio_file_storage=None):
         if not self.repo.available():
@@ -64,6 +68,7 @@ class NotesService:
         )
         payload["updated_at"] = datetime.now(timezone.utc)
         updated = self.repo.update_entry(entry_id, payload)
+        self.versions.bump("notes_logs")
         old_audio_public_id = (current_entry or {}).get("audio_storage_public_id", "")
         new_audio_public_id = payload.get("audio_storage_public_id", old_audio_public_id)
         if old_audio_public_id and old_audio_public_id != new_audio_public_id:
@@ -75,6 +80,7 @@ class NotesService:
             raise RuntimeError("MongoDB is required for notes/log uploads")
         current_entry = self.repo.get_by_id(entry_id)
         deleted = self.repo.delete_entry(entry_id)
+        self.versions.bump("notes_logs")
         if deleted:
             delete_note_audio((current_entry or {}).get("audio_storage_public_id", ""))
         return deleted
@@ -4,7 +4,8 @@ from datetime import datetime, timezone
 from typing import Any
 
 from ..repositories.books_repo import BooksRepository
-from ..repositories.reading_repo import ReadingRepository
+from ..repositories.content_version_repo import ContentVersionRepository
+from ..repositories.reading_repo import ReadingRepository, book_snapshot
 from ..utils import maybe_object_id, parse_positive_int
 
 
@@ -14,6 +15,7 @@ class ReadingService:
     def __init__(self, db):
         self.repo = ReadingRepository(db)
         self.books_repo = BooksRepository(db)
+        self.versions = ContentVersionRepository(db)
 
     def list_public_books_page(self, page_raw: str | None = None, per_page_raw: str | None = None):
         page = parse_positive_int(page_raw, default=1, max_value=100000)
@@ -22,19 +24,22 @@ class ReadingService:
         if not self.repo.available() or not self.books_repo.available():
             return self._empty_page(per_page=per_page)
 
-        entries, total = self.repo.list_entries_page(page=page, per_page=per_page)
+        total = self.repo.count_entries()
         total_pages = max(1, (total + per_page - 1) // per_page)
-
-        if total > 0 and page > total_pages:
-            page = total_pages
-            entries, total = self.repo.list_entries_page(page=page, per_page=per_page)
+        page = min(page, total_pages)
+        entries = self.repo.list_entries_page(page=page, per_page=per_page)
+        if not entries and total:
+            # The cached counter promised rows that are not there: it has drifted.
+            total = self.repo.recount_entries()
+            total_pages = max(1, (total + per_page - 1) // per_page)
+            if page > total_pages:
+                page = total_pages
+                entries = self.repo.list_entries_page(page=page, per_page=per_page)
 
         books_by_id = self._books_map(entries)
         items = []
         for entry in entries:
-            book_id = entry.get("book_id")
-            normalized_book_id = str(book_id) if book_id is not None else ""
-            items.append(self._to_public_book_payload(books_by_id.get(normalized_book_id), entry=entry))
+            items.append(self._to_public_book_payload(self._entry_book(entry, books_by_id), entry=entry))
         items = [item for item in items if item]
 
         return {
@@ -65,7 +70,7 @@ class ReadingService:
         if not normalized_book_id:
             raise ValueError("Choose a book from library before adding")
 
-        existing_book = self.books_repo.get_by_id(normalized_book_id)
+        existing_book = self.books_repo.get_by_id(normalized_book_id, projection="reading_card")
         if not existing_book:
             raise ValueError("Book not found")
         object_id = maybe_object_id(existing_book["id"])
@@ -77,11 +82,13 @@ class ReadingService:
         entry = self.repo.insert_entry(
             {
                 "book_id": object_id,
+                "book": book_snapshot(existing_book),
                 "reading_note": note,
                 "created_at": now,
                 "updated_at": now,
             }
         )
+        self.versions.bump("reading_list")
 
         return self._to_admin_entry_payload(
             entry,
@@ -96,12 +103,16 @@ class ReadingService:
             "reading_note": self._normalize_reading_note(reading_note),
             "updated_at": datetime.now(timezone.utc),
         }
-        return self.repo.update_entry(entry_id, payload)
+        updated = self.repo.update_entry(entry_id, payload)
+        self.versions.bump("reading_list")
+        return updated
 
     def remove_entry(self, entry_id: str) -> bool:
         if not self.repo.available():
             raise RuntimeError("MongoDB is required for reading list updates")
-        return self.repo.delete_entry(entry_id)
+        deleted = self.repo.delete_entry(entry_id)
+        self.versions.bump("reading_list")
+        return deleted
 
     def count_entries(self) -> int:
         if not self.repo.available():
@@ -109,11 +120,12 @@ class ReadingService:
         return self.repo.count_entries()
 
     def _books_map(self, entries: list[dict[str, Any]]):
+        """Books for entries written before snapshots were embedded; usually empty."""
         seen: set[str] = set()
         book_ids: list[str] = []
         for entry in entries:
             book_id = entry.get("book_id")
-            if book_id is None:
+            if book_id is None or isinstance(entry.get("book"), dict):
                 continue
             normalized_book_id = str(book_id)
             if normalized_book_id in seen:
@@ -121,13 +133,24 @@ class ReadingService:
             seen.add(normalized_book_id)
             book_ids.append(normalized_book_id)
 
-        books = self.books_repo.list_by_ids(book_ids)
+        if not book_ids:
+            return {}
+        books = self.books_repo.list_by_ids(book_ids, projection="reading_card")
         return {
             book.get("id"): book
             for book in books
             if isinstance(book, dict) and isinstance(book.get("id"), str)
         }
 
+    @staticmethod
+    def _entry_book(entry: dict[str, Any], books_by_id: dict[str, dict[str, Any]]):
+        book_id = entry.get("book_id")
+        normalized_book_id = str(book_id) if book_id is not None else ""
+        snapshot = entry.get("book")
+        if isinstance(snapshot, dict):
+            return {**snapshot, "id": normalized_book_id}
+        return books_by_id.get(normalized_book_id)
+
     def _to_public_book_payload(self, book: dict[str, Any] | None, entry: dict[str, Any] | None = None):
         if not book:
             return None
@@ -168,13 +191,12 @@ class ReadingService:
             created_at = created_at.isoformat()
 
         book_id = entry.get("book_id")
-        normalized_book_id = str(book_id) if book_id is not None else ""
         return {
             "id": entry.get("id"),
-            "book_id": normalized_book_id,
+            "book_id": str(book_id) if book_id is not None else "",
             "reading_note": (entry.get("reading_note") or "").strip(),
             "created_at": created_at,
-            "book": self._to_admin_book_payload(books_by_id.get(normalized_book_id)),
+            "book": self._to_admin_book_payload(self._entry_book(entry, books_by_id)),
         }
 
     def _normalize_reading_note(self, note: str | None):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from ..repositories.content_version_repo import ContentVersionRepository
 from ..repositories.site_settings_repo import SiteSettingsRepository
 
 HOME_NOTICE_BANNER_KEY = "home_notice_banner_text"
@@ -10,6 +11,7 @@ MAX_NOTICE_BANNER_LENGTH = 240
 class SiteSettingsService:
     def __init__(self, db):
         self.repo = SiteSettingsRepository(db)
+        self.versions = ContentVersionRepository(db)
 
     def get_home_notice_banner_text(self) -> str:
         if not self.repo.available():
@@ -34,4 +36,5 @@ class SiteSettingsService:
             raise ValueError(f"Notice banner text must be {MAX_NOTICE_BANNER_LENGTH} characters or fewer")
 
         setting = self.repo.upsert_setting(HOME_NOTICE_BANNER_KEY, text) or {}
+        self.versions.bump("site_settings")
         return (setting.get("value") or "").strip()
@@ -1,10 +1,15 @@
 import re
+import unicodedata
 from typing import Any
 
 from bson import ObjectId
 
 _slug_pattern = re.compile(r"[^a-z0-9]+")
 _year_pattern = re.compile(r"(1[5-9]\d{2}|20\d{2})")
+_search_word_pattern = re.compile(r"\w+")
+
+SEARCH_MIN_TOKEN_LENGTH = 2
+SEARCH_MAX_TOKEN_LENGTH = 20
 
 
 def slugify(text: str) -> str:
@@ -22,6 +27,35 @@ def ensure_unique_slug(base_slug: str, used_slugs: set[str]) -> str:
     return slug
 
 
+def normalize_search_text(text: Any) -> str:
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    without_marks = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return without_marks.casefold()
+
+
+def search_words(text: Any) -> list[str]:
+    return _search_word_pattern.findall(normalize_search_text(text))
+
+
+def search_prefixes(words: list[str]) -> list[str]:
+    prefixes: set[str] = set()
+    for word in words:
+        for size in range(SEARCH_MIN_TOKEN_LENGTH, min(len(word), SEARCH_MAX_TOKEN_LENGTH) + 1):
+            prefixes.add(word[:size])
+    return sorted(prefixes)
+
+
+def search_query_tokens(query: str) -> list[str]:
+    tokens: list[str] = []
+    for word in search_words(query):
+        if len(word) < SEARCH_MIN_TOKEN_LENGTH:
+            continue
+        token = word[:SEARCH_MAX_TOKEN_LENGTH]
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
 def extract_year(value: Any) -> int | None:
     if value is None:
         return None
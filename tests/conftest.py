@@ -3,7 +3,7 @@ import pytest
 
 from app import create_app
 from app.config import TestConfig
-from app.db import ensure_indexes
+from app.db import ensure_schema
 from app.services.auth_service import AuthService
 
 
@@ -20,7 +20,7 @@ def app():
     flask_app = create_app(MongoTestConfig)
 
     mongo_db = mongomock.MongoClient().archive_test
-    ensure_indexes(mongo_db)
+    ensure_schema(mongo_db)
 
     flask_app.extensions["mongo_db"] = mongo_db
     flask_app.extensions["mongo_client"] = None
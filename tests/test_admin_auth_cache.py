@@ -0,0 +1,115 @@
+from passlib.hash import pbkdf2_sha256
+
+from app.repositories.admin_repo import AdminRepository
+from app.services.auth_service import AuthService
+
+
+def test_deactivation_elsewhere_blocks_the_next_login(app):
+    db = app.extensions["mongo_db"]
+    username = app.config["ADMIN_USERNAME"]
+    password = app.config["ADMIN_PASSWORD"]
+
+    with app.app_context():
+        service = AuthService(db)
+        assert service.authenticate_admin(username, password) is not None
+
+        # Written by another worker or straight to the database.
+        db.admin_users.update_one({"username": username}, {"$set": {"is_active": False}})
+        assert AdminRepository(db).get_by_username(username)["is_active"] is False
+        assert service.authenticate_admin(username, password) is None
+
+        db.admin_users.update_one(
+            {"username": username},
+            {"$set": {"is_active": True, "password_hash": pbkdf2_sha256.hash("rotated")}},
+        )
+        assert service.authenticate_admin(username, password) is None
+        assert service.authenticate_admin(username, "rotated") is not None
+
+
+def test_login_rehashes_outdated_hash_and_records_last_login(app):
+    db = app.extensions["mongo_db"]
+    username = app.config["ADMIN_USERNAME"]
+    password = app.config["ADMIN_PASSWORD"]
+    db.admin_users.update_one(
+        {"username": username},
+        {"$set": {"password_hash": pbkdf2_sha256.using(rounds=1000).hash(password)}},
+    )
+    app.config["ADMIN_PASSWORD_HASH_ROUNDS"] = 2000
+
+    with app.app_context():
+        assert AuthService(db).authenticate_admin(username, password) is not None
+
+    stored = db.admin_users.find_one({"username": username})
+    assert stored["password_hash"].startswith("$pbkdf2-sha256$2000$")
+    assert stored["last_login_at"] is not None
+
+
+def test_bootstrap_skips_rehash_when_env_password_is_unchanged(app):
+    db = app.extensions["mongo_db"]
+    username = app.config["ADMIN_USERNAME"]
+    before = db.admin_users.find_one({"username": username})
+    audits_before = db.audit_logs.count_documents({"action": "auth.bootstrap"})
+
+    with app.app_context():
+        AuthService(db).bootstrap_admin(username, app.config["ADMIN_PASSWORD"])
+        assert db.admin_users.find_one({"username": username})["password_hash"] == before["password_hash"]
+        assert db.audit_logs.count_documents({"action": "auth.bootstrap"}) == audits_before
+
+        AuthService(db).bootstrap_admin(username, "a-new-password")
+    after = db.admin_users.find_one({"username": username})
+    assert after["password_hash"] != before["password_hash"]
+    assert db.audit_logs.count_documents({"action": "auth.bootstrap"}) == audits_before + 1
+
+
+def test_env_bootstrap_waits_for_lock_held_by_another_worker(app):
+    from app import ADMIN_BOOTSTRAP_LOCK, bootstrap_admin_from_env
+    from app.repositories.lock_repo import LockRepository
+
+    db = app.extensions["mongo_db"]
+    username = app.config["ADMIN_USERNAME"]
+    app.config["ADMIN_PASSWORD"] = "rotated-password"
+    before = db.admin_users.find_one({"username": username})["password_hash"]
+
+    locks = LockRepository(db)
+    assert locks.acquire(ADMIN_BOOTSTRAP_LOCK, "other-worker", ttl_seconds=60)
+    with app.app_context():
+        bootstrap_admin_from_env(app)
+    assert db.admin_users.find_one({"username": username})["password_hash"] == before
+
+    locks.release(ADMIN_BOOTSTRAP_LOCK, "other-worker")
+    with app.app_context():
+        bootstrap_admin_from_env(app)
+    assert db.admin_users.find_one({"username": username})["password_hash"] != before
+    assert db.app_locks.count_documents({}) == 0
+
+
+def test_env_bootstrap_skips_pbkdf2_once_credentials_are_applied(app, monkeypatch):
+    from app import bootstrap_admin_from_env
+
+    db = app.extensions["mongo_db"]
+    username = app.config["ADMIN_USERNAME"]
+    calls = []
+    original_verify = pbkdf2_sha256.verify.__func__
+
+    def counting_verify(cls, secret, hash):
+        calls.append(secret)
+        return original_verify(cls, secret, hash)
+
+    monkeypatch.setattr(pbkdf2_sha256, "verify", classmethod(counting_verify))
+
+    # The fixture's bootstrap left a fingerprint, so later workers neither lock nor verify.
+    with app.app_context():
+        bootstrap_admin_from_env(app)
+        bootstrap_admin_from_env(app)
+    assert calls == []
+    assert db.app_locks.count_documents({}) == 0
+
+    # Changing the hash rounds invalidates the fingerprint: one rehash, then skipped again.
+    audits_before = db.audit_logs.count_documents({"action": "auth.bootstrap"})
+    app.config["ADMIN_PASSWORD_HASH_ROUNDS"] = 2000
+    with app.app_context():
+        bootstrap_admin_from_env(app)
+        bootstrap_admin_from_env(app)
+    assert calls == []
+    assert db.audit_logs.count_documents({"action": "auth.bootstrap"}) == audits_before + 1
+    assert db.admin_users.find_one({"username": username})["password_hash"].startswith("$pbkdf2-sha256$2000$")
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+
+from app.repositories.audit_repo import AuditRepository
+
+
+def login(client):
+    username = client.application.config["ADMIN_USERNAME"]
+    password = client.application.config["ADMIN_PASSWORD"]
+    return client.post(
+        "/admin/login",
+        data={"username": username, "password": password},
+        follow_redirects=False,
+    )
+
+
+def _failed_login(client, username, remote_addr):
+    return client.post(
+        "/admin/login",
+        data={"username": username, "password": "wrong"},
+        environ_base={"REMOTE_ADDR": remote_addr},
+        follow_redirects=False,
+    )
+
+
+def test_audit_rows_get_per_action_retention(app):
+    app.config["AUDIT_RETENTION_DAYS_BY_ACTION"] = {"auth.login_failed": 30}
+    app.config["AUDIT_RETENTION_DAYS"] = 365
+    db = app.extensions["mongo_db"]
+
+    with app.app_context():
+        repo = AuditRepository(db)
+        repo.log(actor="x", action="auth.login_failed", entity="admin_login")
+        repo.log(actor="admin", action="gallery.create", entity="gallery_item")
+
+    failed = db.audit_logs.find_one({"action": "auth.login_failed"})
+    created = db.audit_logs.find_one({"action": "gallery.create"})
+    assert failed["expires_at"] - failed["timestamp"] == timedelta(days=30)
+    assert created["expires_at"] - created["timestamp"] == timedelta(days=365)
+
+
+def test_failed_login_rollups_feed_dashboard_and_summary(app, client):
+    attacker = app.test_client()
+    _failed_login(attacker, "alice", "10.0.0.1")
+    _failed_login(attacker, "alice", "10.0.0.1")
+    _failed_login(attacker, "bob", "10.0.0.2")
+
+    db = app.extensions["mongo_db"]
+    day_row = db.audit_rollups.find_one(
+        {"period": "day", "action": "auth.login_failed", "dimension": "remote_addr", "value": "10.0.0.1"}
+    )
+    assert day_row["count"] == 2
+    assert "expires_at" not in day_row
+    assert db.audit_rollups.find_one({"period": "hour", "dimension": "action", "value": "auth.login_failed"})["expires_at"]
+
+    # Raw rows aging out must not change the all-time total.
+    db.audit_logs.delete_many({"action": "auth.login_failed"})
+
+    login(client)
+    dashboard = client.get("/admin/manage").get_data(as_text=True)
+    assert '<p class="metric-value">3</p>' in dashboard
+
+    with app.app_context():
+        from app.services.auth_service import AuthService
+
+        summary = AuthService(db).summarize_failed_admin_logins()
+    assert summary["last_24_hours"] == 3
+    assert summary["top_remote_addrs"][0] == {"value": "10.0.0.1", "count": 2}
+    assert [row["value"] for row in summary["top_usernames"]] == ["alice", "bob"]
+
+    page = client.get("/admin/login-attempts")
+    assert page.status_code == 200
+    assert "10.0.0.1: 2" in page.get_data(as_text=True)
+
+
+def test_rollup_windows_exclude_older_buckets(app):
+    db = app.extensions["mongo_db"]
+    old = datetime.now(timezone.utc) - timedelta(days=10)
+
+    with app.app_context():
+        repo = AuditRepository(db)
+        repo.write_many(
+            [
+                {
+                    "actor": "x",
+                    "action": "auth.login_failed",
+                    "entity": "admin_login",
+                    "timestamp": old,
+                    "metadata": {"remote_addr": "10.9.9.9"},
+                }
+            ]
+        )
+        assert repo.count_by_action("auth.login_failed") == 1
+        assert repo.count_since("auth.login_failed", datetime.now(timezone.utc) - timedelta(days=6), period="day") == 0
+        assert repo.top_values("auth.login_failed", "remote_addr", datetime.now(timezone.utc) - timedelta(days=6)) == []
+
+
+def test_audit_rows_are_kept_unless_retention_is_configured(app):
+    db = app.extensions["mongo_db"]
+
+    with app.app_context():
+        AuditRepository(db).log(actor="x", action="auth.login_failed", entity="admin_login")
+
+    assert db.audit_logs.find_one({"action": "auth.login_failed"})["expires_at"] is None
+
+
+def test_counts_fall_back_to_raw_log_until_rollups_are_backfilled(app):
+    db = app.extensions["mongo_db"]
+    db.schema_migrations.delete_one({"_id": "audit_rollups"})
+    # Logged before rollups existed, so only the raw row knows about it.
+    db.audit_logs.insert_one(
+        {
+            "actor": "x",
+            "action": "auth.login_failed",
+            "entity": "admin_login",
+            "timestamp": datetime.now(timezone.utc) - timedelta(hours=1),
+            "metadata": {"remote_addr": "10.7.7.7", "attempted_username": "mallory"},
+        }
+    )
+
+    with app.app_context():
+        repo = AuditRepository(db)
+        since = datetime.now(timezone.utc) - timedelta(days=6)
+        assert repo.count_by_action("auth.login_failed") == 1
+        assert repo.count_since("auth.login_failed", since, period="day") == 1
+        assert repo.top_values("auth.login_failed", "remote_addr", since) == [{"value": "10.7.7.7", "count": 1}]
+
+        repo.rollups.mark_complete()
+        assert repo.count_by_action("auth.login_failed") == 0
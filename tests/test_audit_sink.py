@@ -0,0 +1,56 @@
+from app.audit_sink import BufferedAuditSink
+from app.repositories.audit_repo import AuditRepository
+
+
+def _install_sink(app, **options):
+    sink = BufferedAuditSink(app, flush_seconds=3600, **options)
+    app.extensions["audit_sink"] = sink
+    return sink
+
+
+def test_buffered_audit_events_are_written_in_one_batch_on_flush(app):
+    db = app.extensions["mongo_db"]
+    db.audit_logs.delete_many({})
+    sink = _install_sink(app, batch_size=50)
+
+    with app.app_context():
+        repo = AuditRepository(db)
+        for index in range(3):
+            repo.log(actor="admin", action="gallery.create", entity="gallery_item", entity_id=str(index))
+
+        assert db.audit_logs.count_documents({}) == 0
+        assert sink.pending() == 3
+
+        assert sink.flush() == 3
+    assert db.audit_logs.count_documents({"action": "gallery.create"}) == 3
+
+
+def test_full_audit_buffer_falls_back_to_synchronous_insert(app):
+    db = app.extensions["mongo_db"]
+    db.audit_logs.delete_many({})
+    _install_sink(app, max_events=1, batch_size=50)
+
+    with app.app_context():
+        repo = AuditRepository(db)
+        repo.log(actor="admin", action="music.create", entity="music_link", entity_id="buffered")
+        repo.log(actor="admin", action="music.create", entity="music_link", entity_id="direct")
+
+    assert [doc["entity_id"] for doc in db.audit_logs.find({})] == ["direct"]
+
+
+def test_audit_reads_include_buffered_events(app, client):
+    sink = _install_sink(app, batch_size=50)
+
+    response = client.post(
+        "/admin/login",
+        data={"username": "nobody", "password": "wrong"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 401
+    assert sink.pending() == 1
+
+    with app.app_context():
+        repo = AuditRepository(app.extensions["mongo_db"])
+        assert repo.count_by_action("auth.login_failed") == 1
+        assert sink.pending() == 0
+        assert repo.list_by_action("auth.login_failed")[0]["metadata"]["attempted_username"] == "nobody"
@@ -44,3 +44,68 @@ def test_books_page_paginates(app, client):
     html = response.get_data(as_text=True)
     assert "Page 1 of 2" in html
     assert 'href="/books?page=2"' in html
+
+
+def test_books_page_seeks_to_requested_page(app, client):
+    seed_many_books(app, total=50)
+
+    html = client.get("/books?page=3").get_data(as_text=True)
+    assert "Page 3 of 3" in html
+    assert "Library Book 48" in html
+    assert "Library Book 47" not in html
+    assert 'href="/books?page=2"' in html
+
+
+def test_books_page_clamps_out_of_range_page(app, client):
+    seed_many_books(app, total=30)
+
+    html = client.get("/books?page=400").get_data(as_text=True)
+    assert "Page 2 of 2" in html
+    assert "Library Book 29" in html
+
+
+def test_books_page_anchors_are_reused_between_requests(app, client, monkeypatch):
+    from app.repositories.books_repo import BooksRepository
+
+    seed_many_books(app, total=30)
+    calls = []
+    original = BooksRepository.list_page_anchors
+
+    def counting(self, per_page=24):
+        calls.append(per_page)
+        return original(self, per_page=per_page)
+
+    monkeypatch.setattr(BooksRepository, "list_page_anchors", counting)
+
+    client.get("/books")
+    client.get("/books?page=2")
+    assert calls == [24]
+
+
+def test_books_page_anchors_follow_the_books_content_version(app, monkeypatch):
+    from app.repositories.books_repo import BooksRepository
+    from app.repositories.content_version_repo import ContentVersionRepository
+    from app.services.books_service import BooksService
+
+    seed_many_books(app, total=30)
+    db = app.extensions["mongo_db"]
+    calls = []
+    original = BooksRepository.list_page_anchors
+
+    def counting(self, per_page=24):
+        calls.append(per_page)
+        return original(self, per_page=per_page)
+
+    monkeypatch.setattr(BooksRepository, "list_page_anchors", counting)
+
+    with app.app_context():
+        service = BooksService(db)
+        service.list_public_books_page(page_raw="2")
+        service.list_public_books_page(page_raw="1")
+        assert calls == [24]
+
+        # Another worker's admin write bumps the version without touching this process's caches.
+        ContentVersionRepository(db).collection.update_one({"_id": "books"}, {"$inc": {"version": 1}}, upsert=True)
+        app.extensions["content_versions"].clear()
+        service.list_public_books_page(page_raw="2")
+        assert calls == [24, 24]
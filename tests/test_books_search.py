@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+from app.repositories.books_repo import BooksRepository
+
+
+def seed_search_books(app):
+    repo = BooksRepository(app.extensions["mongo_db"])
+    now = datetime.now(timezone.utc)
+    for slug, title, authors in [
+        ("garden-notes", "Notes from the Garden", ["Amélie Durand"]),
+        ("gardening", "Gardening", ["Someone Else"]),
+        ("city-notes", "City Notes", ["Paul Gardener"]),
+    ]:
+        repo.insert_book(
+            {
+                "slug": slug,
+                "original_title": title,
+                "title": title,
+                "subtitle": "",
+                "authors": authors,
+                "first_publish_year": 2001,
+                "cover_url": None,
+                "description": "",
+                "google_info": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+
+
+def test_books_search_matches_prefixes_and_ignores_diacritics(app, client):
+    seed_search_books(app)
+
+    response = client.get("/api/books?query=AMELIE")
+    assert [item["slug"] for item in response.get_json()["items"]] == ["garden-notes"]
+
+    response = client.get("/api/books?query=gard")
+    assert {item["slug"] for item in response.get_json()["items"]} == {"garden-notes", "gardening", "city-notes"}
+
+
+def test_books_search_ranks_title_word_matches_first(app, client):
+    seed_search_books(app)
+
+    response = client.get("/api/books?query=gardening")
+    assert [item["slug"] for item in response.get_json()["items"]] == ["gardening"]
+
+    response = client.get("/api/books?query=notes garden")
+    slugs = [item["slug"] for item in response.get_json()["items"]]
+    assert slugs[0] == "garden-notes"
+    assert set(slugs) == {"garden-notes", "city-notes"}
+
+
+def test_books_search_paginates_ranked_results_with_offset_cursor(app, client):
+    seed_search_books(app)
+
+    first = client.get("/api/books?query=gard&limit=2").get_json()
+    assert len(first["items"]) == 2
+    assert first["next_cursor"] == "2"
+
+    second = client.get(f"/api/books?query=gard&limit=2&cursor={first['next_cursor']}").get_json()
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+
+
+def test_books_search_short_query_uses_substring_fallback(app, client):
+    seed_search_books(app)
+
+    response = client.get("/api/books?query=y")
+    assert [item["slug"] for item in response.get_json()["items"]] == ["city-notes"]
+
+
+def test_book_edit_refreshes_search_fields(app):
+    seed_search_books(app)
+    repo = BooksRepository(app.extensions["mongo_db"])
+    book = repo.get_by_slug("gardening")
+
+    repo.update_book(book["id"], {"title": "Orchards"})
+
+    items, _ = repo.list_books(query="orchard")
+    assert [item["slug"] for item in items] == ["gardening"]
@@ -55,3 +55,72 @@ def test_normalize_source_book_handles_no_result_and_slug_uniqueness():
     assert one["cover_url"] is None
     assert one["slug"] == "a-title"
     assert two["slug"].startswith("a-title-")
+
+
+FALLBACK_BOOKS = [
+    {"id": "walden", "slug": "walden", "title": "Walden", "original_title": "Walden", "authors": ["Thoreau"]},
+    {"id": "emile", "slug": "emile", "title": "Émile", "original_title": "Emile", "authors": ["Rousseau"]},
+    {"id": "walk", "slug": "walk", "title": "Walking", "original_title": "Walking", "authors": ["Thoreau"]},
+    {"id": "poldark", "slug": "poldark", "title": "Poldark", "original_title": "Poldark", "authors": ["Cornwall Press"]},
+]
+
+
+def test_fallback_catalogue_indexes_slugs_and_search_tokens():
+    from app.services.books_service import _FallbackCatalogue
+
+    catalogue = _FallbackCatalogue(FALLBACK_BOOKS)
+
+    assert catalogue.by_key["emile"]["title"] == "Émile"
+    assert [book["slug"] for book in catalogue.search("wal")] == ["walden", "walk"]
+    assert [book["slug"] for book in catalogue.search("EMILE")] == ["emile"]
+    assert [book["slug"] for book in catalogue.search("thoreau walk")] == ["walk"]
+    # Tokenizable queries match word prefixes only, as in MongoDB: no infix hits.
+    assert catalogue.search("usse") == ()
+    assert catalogue.search("zzzz") == ()
+    # Queries too short to tokenize scan for substrings.
+    assert [book["slug"] for book in catalogue.search("k")] == ["walk", "poldark"]
+    assert catalogue.search("") == catalogue.books
+
+
+def test_fallback_catalogue_search_matches_mongo_search():
+    import mongomock
+
+    from app.repositories.books_repo import BooksRepository, book_search_fields
+    from app.services.books_service import _FallbackCatalogue
+
+    db = mongomock.MongoClient().fallback_parity
+    db.books.insert_many([{**book, **book_search_fields(book)} for book in FALLBACK_BOOKS])
+    repo = BooksRepository(db)
+    catalogue = _FallbackCatalogue(FALLBACK_BOOKS)
+
+    for query in ("wal", "corn", "usse", "thoreau walk", "zzzz", "k", "p"):
+        mongo_slugs = sorted(book["slug"] for book in repo.search_books_page(query, per_page=50))
+        fallback_slugs = sorted(book["slug"] for book in catalogue.search(query))
+        assert fallback_slugs == mongo_slugs, query
+
+
+def test_fallback_public_book_lookup_uses_slug_index(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.services.books.SNAPSHOT_FILE", tmp_path / "books_snapshot.marshal")
+    BooksService._fallback_catalogue.cache_clear()
+    service = BooksService(db=None)
+    first = service._fallback_books()[0]
+
+    assert service.get_public_book(first["slug"])["slug"] == first["slug"]
+    assert service.get_public_book("missing-slug-for-sure") is None
+
+
+def test_books_snapshot_round_trip_and_staleness(tmp_path):
+    from app.services.books import read_snapshot, write_snapshot
+
+    source = tmp_path / "books.json"
+    snapshot = tmp_path / "books.snapshot"
+    source.write_text("[]", encoding="utf-8")
+    book = {"id": "a", "slug": "a", "title": "A", "google_info": {"large": "blob"}}
+
+    write_snapshot([book], source=source, snapshot=snapshot)
+    loaded = read_snapshot(source=source, snapshot=snapshot)
+    assert loaded[0]["slug"] == "a"
+    assert "google_info" not in loaded[0]
+
+    source.write_text("[{}]", encoding="utf-8")
+    assert read_snapshot(source=source, snapshot=snapshot) is None
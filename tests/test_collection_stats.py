@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+
+from app.repositories.stats_repo import CollectionStatsRepository
+from app.services.music_service import MusicService
+
+
+def login(client):
+    username = client.application.config["ADMIN_USERNAME"]
+    password = client.application.config["ADMIN_PASSWORD"]
+    return client.post(
+        "/admin/login",
+        data={"username": username, "password": password},
+        follow_redirects=False,
+    )
+
+
+def test_counter_is_seeded_once_then_maintained_by_writes(app):
+    db = app.extensions["mongo_db"]
+    db.music_links.insert_many([{"title": "a"}, {"title": "b"}])
+
+    with app.app_context():
+        service = MusicService(db)
+        assert service.count_links() == 2
+        assert db.collection_stats.find_one({"_id": "music_links"})["count"] == 2
+
+        created = service.create_link({"title": "c", "youtube_url": "dQw4w9WgXcQ", "is_published": "1"})
+        assert service.count_links() == 3
+
+        service.delete_link(created["id"])
+        assert service.count_links() == 2
+
+
+def test_reconcile_recounts_drifted_counters(app):
+    db = app.extensions["mongo_db"]
+    stats = CollectionStatsRepository(db)
+    db.notes_logs.insert_one({"title": "n", "created_at": datetime.now(timezone.utc)})
+
+    with app.app_context():
+        assert stats.get_count("notes_logs") == 1
+        db.notes_logs.insert_one({"title": "untracked"})
+        assert stats.reconcile() == {"notes_logs": 2}
+        assert stats.get_count("notes_logs") == 2
+
+
+def test_admin_dashboard_reads_counts_in_one_query(app, client, monkeypatch):
+    db = app.extensions["mongo_db"]
+    db.books.insert_one({"slug": "x", "title": "X"})
+    login(client)
+    client.get("/admin/manage")
+
+    finds = []
+    original_find = type(db.collection_stats).find
+
+    def counting_find(self, *args, **kwargs):
+        if self.name == "collection_stats":
+            finds.append(args)
+        return original_find(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(db.collection_stats), "find", counting_find)
+    app.extensions["collection_counts"].clear()
+
+    response = client.get("/admin/manage")
+    assert response.status_code == 200
+    assert len(finds) == 1
+
+
+def test_counter_is_recounted_once_it_is_older_than_the_reconcile_interval(app):
+    db = app.extensions["mongo_db"]
+    stats = CollectionStatsRepository(db)
+    db.notes_logs.insert_one({"title": "n"})
+
+    with app.app_context():
+        assert stats.get_count("notes_logs") == 1
+        db.notes_logs.insert_one({"title": "untracked"})
+        app.extensions["collection_counts"].clear()
+        assert stats.get_count("notes_logs") == 1
+
+        db.collection_stats.update_one({"_id": "notes_logs"}, {"$unset": {"reconciled_at": ""}})
+        app.extensions["collection_counts"].clear()
+        assert stats.get_count("notes_logs") == 2
+        assert db.collection_stats.find_one({"_id": "notes_logs"})["reconciled_at"] is not None
+
+
+def test_reading_page_past_the_real_end_reconciles_the_counter(app):
+    db = app.extensions["mongo_db"]
+    book_id = db.books.insert_one({"slug": "a", "title": "A"}).inserted_id
+    db.reading_list.insert_one({"book_id": book_id, "created_at": datetime.now(timezone.utc)})
+    db.collection_stats.insert_one(
+        {"_id": "reading_list", "collection": "reading_list", "filters": {}, "count": 30, "reconciled_at": datetime.now(timezone.utc)}
+    )
+
+    with app.app_context():
+        from app.services.reading_service import ReadingService
+
+        result = ReadingService(db).list_public_books_page(page_raw="2", per_page_raw="24")
+
+    assert result["total"] == 1
+    assert result["page"] == 1
+    assert [item["slug"] for item in result["items"]] == ["a"]
+    assert db.collection_stats.find_one({"_id": "reading_list"})["count"] == 1
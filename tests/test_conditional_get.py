@@ -0,0 +1,60 @@
+from app.services.gallery_service import GalleryService
+
+
+def test_public_page_returns_304_for_matching_etag(client):
+    first = client.get("/books")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+
+    revalidated = client.get("/books", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b""
+
+    other_page = client.get("/books?page=2", headers={"If-None-Match": etag})
+    assert other_page.status_code == 200
+
+
+def test_api_etag_changes_when_collection_is_written(app, client):
+    first = client.get("/api/gallery")
+    etag = first.headers["ETag"]
+    assert "Cookie" not in first.headers.get("Vary", "")
+
+    with app.test_request_context():
+        GalleryService(app.extensions["mongo_db"]).create_item(
+            {"category": "sketches", "title": "New", "image_url": "https://example.com/a.jpg", "is_published": "1"}
+        )
+
+    refreshed = client.get("/api/gallery", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert refreshed.headers["Last-Modified"]
+
+    since = client.get("/api/gallery", headers={"If-Modified-Since": refreshed.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+
+def test_missing_book_detail_is_not_cached_as_304(client):
+    response = client.get("/api/books/does-not-exist")
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+def test_etag_changes_with_the_deployed_build(app, client):
+    etag = client.get("/api/books").headers["ETag"]
+
+    app.config["BUILD_ID"] = "next-release"
+    app.extensions.pop("build_id", None)
+    response = client.get("/api/books", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_fallback_etag_follows_the_books_data_file(app, client, monkeypatch):
+    app.extensions["mongo_db"] = None
+    monkeypatch.setattr("app.conditional.source_signature", lambda: [1, 100])
+    etag = client.get("/api/books").headers["ETag"]
+    assert client.get("/api/books", headers={"If-None-Match": etag}).status_code == 304
+
+    monkeypatch.setattr("app.conditional.source_signature", lambda: [2, 120])
+    assert client.get("/api/books", headers={"If-None-Match": etag}).status_code == 200
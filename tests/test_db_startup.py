@@ -0,0 +1,131 @@
+import time
+
+import mongomock
+from pymongo import _csot
+from pymongo.read_preferences import Primary
+
+from app import create_app
+from app.config import TestConfig
+from app.db import SCHEMA_VERSION, ensure_schema, without_query_deadline
+
+
+def test_ensure_schema_runs_once_per_version(monkeypatch):
+    db = mongomock.MongoClient()["schema_test"]
+    calls = []
+    monkeypatch.setattr("app.db.ensure_indexes", lambda target: calls.append(target))
+
+    assert ensure_schema(db) is True
+    assert db.schema_migrations.find_one({"_id": "indexes"})["version"] == SCHEMA_VERSION
+    assert ensure_schema(db) is False
+    assert len(calls) == 1
+
+    assert ensure_schema(db, force=True) is True
+    assert len(calls) == 2
+
+
+def test_stale_schema_version_is_migrated(monkeypatch):
+    db = mongomock.MongoClient()["schema_test"]
+    db.schema_migrations.insert_one({"_id": "indexes", "version": SCHEMA_VERSION - 1})
+    monkeypatch.setattr("app.db.ensure_indexes", lambda target: None)
+
+    assert ensure_schema(db) is True
+    assert db.schema_migrations.find_one({"_id": "indexes"})["version"] == SCHEMA_VERSION
+
+
+def test_lazy_connect_does_not_block_startup_on_unreachable_server():
+    class LazyConfig(TestConfig):
+        MONGODB_URI = "mongodb://127.0.0.1:9/?directConnection=true"
+        MONGODB_TLS = False
+        MONGODB_CONNECT_MODE = "lazy"
+        MONGODB_SERVER_SELECTION_TIMEOUT_MS = 2000
+
+    started = time.monotonic()
+    app = create_app(LazyConfig)
+
+    assert time.monotonic() - started < 1.5
+    assert app.extensions["mongo_db"] is not None
+    app.extensions["mongo_client"].close()
+
+
+def test_client_pool_options_and_public_read_preference(caplog):
+    class PoolConfig(TestConfig):
+        MONGODB_URI = "mongodb://127.0.0.1:9/?directConnection=true"
+        MONGODB_TLS = False
+        MONGODB_CONNECT_MODE = "lazy"
+        MONGODB_MAX_POOL_SIZE = 7
+        MONGODB_WAIT_QUEUE_TIMEOUT_MS = 250
+        MONGODB_PUBLIC_READ_PREFERENCE = "secondaryPreferred"
+        MONGODB_PUBLIC_READ_MAX_STALENESS_SECONDS = 120
+
+    app = create_app(PoolConfig)
+    client = app.extensions["mongo_client"]
+    try:
+        assert client.options.pool_options.max_pool_size == 7
+        assert client.options.pool_options.wait_queue_timeout == 0.25
+
+        read_preference = app.extensions["mongo_read_db"].read_preference
+        assert read_preference.mongos_mode == "secondaryPreferred"
+        assert read_preference.max_staleness == 120
+        assert app.extensions["mongo_db"].read_preference == Primary()
+        # Secondary reads switch the page cache and ETags off; say so at startup.
+        assert "page cache and ETag revalidation are disabled" in caplog.text
+    finally:
+        client.close()
+
+
+def test_read_requests_run_under_a_query_deadline():
+    class DeadlineConfig(TestConfig):
+        MONGODB_URI = "mongodb://127.0.0.1:9/?directConnection=true"
+        MONGODB_TLS = False
+        MONGODB_CONNECT_MODE = "lazy"
+        MONGODB_MAX_TIME_MS = 1500
+
+    app = create_app(DeadlineConfig)
+    seen = {}
+
+    @app.route("/_deadline")
+    def deadline_probe():
+        seen["bounded"] = _csot.get_timeout()
+        return ""
+
+    @app.route("/_unbounded")
+    @without_query_deadline
+    def unbounded_probe():
+        seen["unbounded"] = _csot.get_timeout()
+        return ""
+
+    client = app.test_client()
+    client.get("/_deadline")
+    client.get("/_unbounded")
+    app.extensions["mongo_client"].close()
+
+    assert seen["bounded"] == 1.5
+    assert seen["unbounded"] is None
+    assert _csot.get_timeout() is None
+
+
+def test_lazy_warmup_retries_until_the_server_answers(app):
+    from pymongo.errors import ServerSelectionTimeoutError
+
+    from app.db import _warm_up
+
+    class FlakyAdmin:
+        attempts = 0
+
+        def command(self, name):
+            FlakyAdmin.attempts += 1
+            if FlakyAdmin.attempts < 3:
+                raise ServerSelectionTimeoutError("down")
+
+    class FlakyDb:
+        name = "flaky"
+        client = type("Client", (), {"admin": FlakyAdmin()})()
+
+    delays = []
+    ready = []
+    app.config["MONGODB_AUTO_MIGRATE"] = False
+    _warm_up(app, FlakyDb(), on_ready=ready.append, sleep=delays.append)
+
+    assert FlakyAdmin.attempts == 3
+    assert delays == [1.0, 2.0]
+    assert ready == [app]
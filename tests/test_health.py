@@ -0,0 +1,80 @@
+import os
+from datetime import timedelta
+
+from app.health import HealthMonitor
+
+
+class CountingDb:
+    def __init__(self, fail=False):
+        self.pings = 0
+        self.fail = fail
+
+    def command(self, name):
+        self.pings += 1
+        if self.fail:
+            raise RuntimeError("no primary")
+        return {"ok": 1}
+
+
+def test_readyz_reports_dependency_latency(client):
+    response = client.get("/readyz")
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["status"] == "ok"
+    assert payload["dependencies"]["database"]["status"] == "up"
+    assert payload["dependencies"]["database"]["latency_ms"] >= 0
+    assert payload["dependencies"]["media_cache"]["status"] == "disabled"
+
+
+def test_healthz_keeps_degraded_contract(app, client):
+    app.extensions["mongo_db"] = None
+    response = client.get("/healthz")
+    assert response.status_code == 503
+    assert response.get_json() == {"status": "degraded", "database": "unconfigured"}
+
+    app.extensions["mongo_db"] = CountingDb(fail=True)
+    response = client.get("/healthz")
+    assert response.status_code == 503
+    assert response.get_json() == {"status": "degraded", "database": "down", "error": "no primary"}
+    assert client.get("/readyz").status_code == 503
+
+
+def test_probes_are_served_from_the_cached_result(app, client):
+    db = CountingDb()
+    app.extensions["mongo_db"] = db
+    monitor = HealthMonitor(app, interval_seconds=3600)
+    app.extensions["health_monitor"] = monitor
+
+    for _ in range(3):
+        assert client.get("/healthz").status_code == 200
+    assert client.get("/readyz").status_code == 200
+
+    # The background thread and at most one inline fallback check; probes add none.
+    assert 1 <= db.pings <= 2
+
+
+def test_probes_report_a_stale_result_as_degraded(app, client):
+    app.extensions["mongo_db"] = CountingDb()
+    monitor = HealthMonitor(app, interval_seconds=15)
+    app.extensions["health_monitor"] = monitor
+    # Pretend the monitor thread is already running but has been stuck for a minute.
+    monitor._pid = os.getpid()
+    result = monitor.refresh()
+    result["checked_at"] -= timedelta(seconds=60)
+
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    payload = response.get_json()
+    assert payload["status"] == "degraded"
+    assert payload["stale"] is True
+    assert payload["age_seconds"] >= 60
+    assert payload["dependencies"]["database"]["status"] == "up"
+
+    response = client.get("/healthz")
+    assert response.status_code == 503
+    assert response.get_json() == {"status": "degraded", "database": "stale"}
+
+    monitor.refresh()
+    assert client.get("/healthz").status_code == 200
+    assert "stale" not in client.get("/readyz").get_json()
@@ -0,0 +1,115 @@
+import io
+from datetime import datetime, timedelta, timezone
+
+from app.jobs import enqueue_job, job_handler, run_pending_jobs
+from app.repositories.jobs_repo import JobsRepository
+
+calls = []
+
+
+@job_handler("tests.record")
+def _record_job(value: str):
+    calls.append(value)
+
+
+@job_handler("tests.explode")
+def _explode_job():
+    raise RuntimeError("boom")
+
+
+def login(client):
+    username = client.application.config["ADMIN_USERNAME"]
+    password = client.application.config["ADMIN_PASSWORD"]
+    return client.post(
+        "/admin/login",
+        data={"username": username, "password": password},
+        follow_redirects=False,
+    )
+
+
+def test_worker_mode_persists_jobs_until_a_worker_runs_them(app):
+    app.config["JOBS_MODE"] = "worker"
+    calls.clear()
+    db = app.extensions["mongo_db"]
+
+    with app.app_context():
+        enqueue_job("tests.record", value="hello")
+
+    assert calls == []
+    assert db.jobs.find_one({"name": "tests.record"})["status"] == "queued"
+
+    assert run_pending_jobs(app, worker_id="test-worker") == 1
+    assert calls == ["hello"]
+    job = db.jobs.find_one({"name": "tests.record"})
+    assert job["status"] == "done"
+    assert job["attempts"] == 1
+    assert job["expires_at"] > datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def test_failed_jobs_back_off_then_give_up(app):
+    app.config.update(JOBS_MODE="worker", JOBS_MAX_ATTEMPTS=2, JOBS_RETRY_BASE_SECONDS=60)
+    db = app.extensions["mongo_db"]
+
+    with app.app_context():
+        enqueue_job("tests.explode")
+
+    assert run_pending_jobs(app) == 1
+    job = db.jobs.find_one({"name": "tests.explode"})
+    assert job["status"] == "queued"
+    assert "boom" in job["last_error"]
+    assert job["run_at"] > datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=50)
+
+    # Not due yet, so nothing is claimed.
+    assert run_pending_jobs(app) == 0
+
+    db.jobs.update_one({"_id": job["_id"]}, {"$set": {"run_at": datetime.now(timezone.utc) - timedelta(seconds=1)}})
+    assert run_pending_jobs(app) == 1
+    job = db.jobs.find_one({"_id": job["_id"]})
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+
+
+def test_expired_lease_makes_running_job_claimable_again(app):
+    repo = JobsRepository(app.extensions["mongo_db"])
+    job_id = repo.enqueue("tests.record", {"value": "again"})
+
+    first = repo.claim("worker-a", lease_seconds=300)
+    assert first["_id"] == job_id
+    assert repo.claim("worker-b", lease_seconds=300) is None
+
+    repo.collection.update_one({"_id": job_id}, {"$set": {"locked_until": datetime.now(timezone.utc) - timedelta(seconds=1)}})
+    second = repo.claim("worker-b", lease_seconds=300)
+    assert second["_id"] == job_id
+    assert second["attempts"] == 2
+
+    # The first worker lost its lease and can no longer complete the job.
+    repo.complete(first, retention_seconds=60)
+    assert repo.collection.find_one({"_id": job_id})["status"] == "running"
+
+
+def test_note_delete_defers_audio_blob_removal_to_worker(app, client):
+    db = app.extensions["mongo_db"]
+    login(client)
+    app.config["JOBS_MODE"] = "worker"
+
+    client.post(
+        "/admin/notes",
+        data={
+            "title": "Audio note",
+            "is_published": "1",
+            "audio_file": (io.BytesIO(b"RIFF....WAVEfmt "), "sample.wav", "audio/wav"),
+        },
+        content_type="multipart/form-data",
+        follow_redirects=False,
+    )
+    note = db.notes_logs.find_one({"title": "Audio note"})
+
+    response = client.post(f"/admin/notes/{note['_id']}/delete", follow_redirects=False)
+
+    assert response.status_code == 302
+    assert db.notes_logs.find_one({"_id": note["_id"]}) is None
+    assert db.notes_audio_blobs.count_documents({}) == 1
+
+    assert run_pending_jobs(app) == 1
+    assert db.notes_audio_blobs.count_documents({}) == 0
+    assert db.notes_audio_blobs_chunks.count_documents({}) == 0
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from app import create_app
+from app.config import TestConfig
+from app.services.login_throttle_service import LoginThrottleService
+
+
+def _attempt(app, username, password, remote_addr="10.1.1.1", headers=None):
+    # A fresh client per attempt: dropping the session cookie must not reset the throttle.
+    return app.test_client().post(
+        "/admin/login",
+        data={"username": username, "password": password},
+        environ_base={"REMOTE_ADDR": remote_addr},
+        headers=headers or {},
+        follow_redirects=False,
+    )
+
+
+def test_address_and_username_throttle_blocks_before_password_check(app, monkeypatch):
+    app.config.update(LOGIN_THROTTLE_USERNAME_LIMIT=3, LOGIN_THROTTLE_IP_LIMIT=100)
+    username = app.config["ADMIN_USERNAME"]
+    for _ in range(3):
+        assert _attempt(app, username, "wrong").status_code in {401, 429}
+
+    verified = []
+    monkeypatch.setattr(
+        "app.services.auth_service.pbkdf2_sha256.verify",
+        lambda *args: verified.append(args) or True,
+    )
+    response = _attempt(app, username, app.config["ADMIN_PASSWORD"])
+
+    assert response.status_code == 429
+    assert 0 < int(response.headers["Retry-After"]) <= 900
+    assert verified == []
+    db = app.extensions["mongo_db"]
+    assert db.audit_logs.find_one({"metadata.reason": "throttled"}) is not None
+
+
+def test_throttled_attempts_are_counted_but_audited_once(app):
+    app.config.update(LOGIN_THROTTLE_USERNAME_LIMIT=0, LOGIN_THROTTLE_IP_LIMIT=2)
+    for _ in range(2):
+        _attempt(app, "someone", "wrong", remote_addr="10.9.9.9")
+
+    # Stay within LOGIN_RATE_LIMIT so every rejection comes from the throttle.
+    for index in range(3):
+        assert _attempt(app, f"user{index}", "wrong", remote_addr="10.9.9.9").status_code == 429
+    assert _attempt(app, "someone", "wrong", remote_addr="10.9.9.10").status_code == 401
+
+    db = app.extensions["mongo_db"]
+    assert db.audit_logs.count_documents({"metadata.reason": "throttled"}) == 1
+    assert db.audit_logs.count_documents({"metadata.reason": "invalid_credentials"}) == 3
+    assert "login_throttled_total 3" in app.extensions["metrics"].render()
+
+
+def test_username_throttle_slows_failures_but_admits_valid_password(app):
+    app.config.update(LOGIN_THROTTLE_USERNAME_LIMIT=3, LOGIN_THROTTLE_IP_LIMIT=100)
+    username = app.config["ADMIN_USERNAME"]
+    for index in range(3):
+        _attempt(app, username, "wrong", remote_addr=f"10.3.3.{index}")
+
+    # Failures for the username from yet another address are answered with a delay...
+    failed = _attempt(app, username, "wrong", remote_addr="10.4.4.4")
+    assert failed.status_code == 429
+    assert int(failed.headers["Retry-After"]) > 0
+
+    # ...but the real admin is not locked out.
+    assert _attempt(app, username, app.config["ADMIN_PASSWORD"], remote_addr="10.5.5.5").status_code == 302
+
+
+def test_ip_throttle_spans_usernames(app):
+    app.config.update(LOGIN_THROTTLE_IP_LIMIT=2, LOGIN_THROTTLE_USERNAME_LIMIT=100)
+
+    assert _attempt(app, "alice", "x").status_code == 401
+    assert _attempt(app, "bob", "x").status_code == 401
+    assert _attempt(app, "carol", "x").status_code == 429
+    assert _attempt(app, "carol", "x", remote_addr="10.9.9.9").status_code == 401
+
+
+def test_forwarded_for_is_ignored_without_proxy_fix(app):
+    app.config.update(LOGIN_THROTTLE_IP_LIMIT=2, LOGIN_THROTTLE_USERNAME_LIMIT=100)
+
+    for index in range(2):
+        _attempt(app, f"user{index}", "x", headers={"X-Forwarded-For": f"192.0.2.{index}"})
+
+    spoofed = _attempt(app, "carol", "x", headers={"X-Forwarded-For": "192.0.2.99"})
+    assert spoofed.status_code == 429
+
+
+def test_proxy_fix_trusts_only_configured_hops():
+    class ProxiedConfig(TestConfig):
+        PROXY_FIX_X_FOR = 1
+        LOGIN_THROTTLE_IP_LIMIT = 2
+        LOGIN_THROTTLE_USERNAME_LIMIT = 100
+        MONGODB_URI = ""
+
+    app = create_app(ProxiedConfig)
+    # The proxy appends the real client; the client-supplied entries in front are ignored.
+    for index in range(2):
+        _attempt(app, f"user{index}", "x", remote_addr="10.0.0.1", headers={"X-Forwarded-For": f"192.0.2.{index}, 203.0.113.7"})
+
+    assert _attempt(app, "carol", "x", remote_addr="10.0.0.1", headers={"X-Forwarded-For": "203.0.113.7"}).status_code == 429
+    assert _attempt(app, "carol", "x", remote_addr="10.0.0.1", headers={"X-Forwarded-For": "203.0.113.8"}).status_code == 401
+
+
+def test_successful_login_clears_username_failures(app):
+    app.config.update(LOGIN_THROTTLE_USERNAME_LIMIT=3, LOGIN_THROTTLE_IP_LIMIT=100)
+    username = app.config["ADMIN_USERNAME"]
+
+    _attempt(app, username, "wrong")
+    _attempt(app, username, "wrong")
+    assert _attempt(app, username, app.config["ADMIN_PASSWORD"]).status_code == 302
+
+    db = app.extensions["mongo_db"]
+    assert db.login_throttle.count_documents({"key": f"user:{username.casefold()}"}) == 0
+    assert db.login_throttle.count_documents({"key": f"ipuser:10.1.1.1:{username.casefold()}"}) == 0
+
+
+def test_memory_store_applies_sliding_window_without_database(app):
+    app.config.update(LOGIN_THROTTLE_USERNAME_LIMIT=2, LOGIN_THROTTLE_USERNAME_WINDOW_SECONDS=60)
+
+    with app.app_context():
+        throttle = LoginThrottleService(db=None)
+        throttle.record_failure("", "admin")
+        assert throttle.username_retry_after("admin") == 0
+        throttle.record_failure("", "Admin")
+        assert 0 < throttle.username_retry_after("admin") <= 60
+        assert 0 < throttle.retry_after("", "admin") <= 60
+
+        # Entries older than the window no longer count.
+        entries = throttle.store._entries["user:admin"]
+        for index in range(len(entries)):
+            entries[index] -= timedelta(seconds=61)
+        assert throttle.username_retry_after("admin") == 0
+        assert LoginThrottleService(db=None).store is throttle.store
@@ -0,0 +1,302 @@
+import io
+import os
+
+import pytest
+
+from app.media_cache import MediaDiskCache
+from app.repositories.blob_repo import ChunkedBlobRepository
+
+
+def login(client):
+    username = client.application.config["ADMIN_USERNAME"]
+    password = client.application.config["ADMIN_PASSWORD"]
+    return client.post(
+        "/admin/login",
+        data={"username": username, "password": password},
+        follow_redirects=False,
+    )
+
+
+def test_blob_repository_writes_chunks_and_reads_ranges(app):
+    repo = ChunkedBlobRepository(app.extensions["mongo_db"], "gallery_upload_blobs")
+    content = bytes(range(256)) * 10
+
+    file_id = repo.put(io.BytesIO(content), filename="blob.bin", content_type="application/octet-stream", chunk_size=100)
+
+    manifest = repo.get_manifest(str(file_id))
+    assert manifest["length"] == len(content)
+    assert manifest["chunk_count"] == 26
+    assert "data" not in repo.files.find_one({"_id": file_id})
+    assert repo.chunks.count_documents({"files_id": file_id}) == 26
+
+    assert b"".join(repo.iter_bytes(manifest)) == content
+    assert b"".join(repo.iter_bytes(manifest, 150, 420)) == content[150:421]
+    assert b"".join(repo.iter_bytes(manifest, 2500)) == content[2500:]
+
+    repo.delete(str(file_id))
+    assert repo.get_manifest(str(file_id)) is None
+    assert repo.chunks.count_documents({"files_id": file_id}) == 0
+
+
+def test_blob_repository_rejects_oversized_stream_without_leaving_chunks(app):
+    repo = ChunkedBlobRepository(app.extensions["mongo_db"], "notes_audio_blobs")
+
+    with pytest.raises(ValueError, match="too big"):
+        repo.put(
+            io.BytesIO(b"x" * 350),
+            filename="big.wav",
+            content_type="audio/wav",
+            max_size=300,
+            too_large_message="too big",
+            chunk_size=100,
+        )
+
+    assert repo.files.count_documents({}) == 0
+    assert repo.chunks.count_documents({}) == 0
+
+
+def test_blob_repository_migrates_inline_blob(app):
+    repo = ChunkedBlobRepository(app.extensions["mongo_db"], "research_pdf_blobs")
+    file_id = repo.files.insert_one({"filename": "old.pdf", "content_type": "application/pdf", "data": b"%PDF-old"}).inserted_id
+
+    assert b"".join(repo.iter_bytes(repo.get_manifest(str(file_id)))) == b"%PDF-old"
+    assert repo.migrate_inline(file_id, chunk_size=3) is True
+    assert repo.migrate_inline(file_id, chunk_size=3) is False
+
+    manifest = repo.get_manifest(str(file_id))
+    assert manifest["storage"] == "chunked"
+    assert manifest["chunk_count"] == 3
+    assert b"".join(repo.iter_bytes(manifest)) == b"%PDF-old"
+
+
+def test_uploaded_gallery_image_is_streamed_back(client):
+    login(client)
+    upload = client.post(
+        "/admin/gallery/upload",
+        data={"image": (io.BytesIO(b"fake image bytes"), "sample.png", "image/png")},
+        follow_redirects=False,
+    )
+    image_url = upload.get_json()["image_url"]
+
+    response = client.get(image_url)
+
+    assert response.status_code == 200
+    assert response.data == b"fake image bytes"
+    assert response.headers["Content-Length"] == str(len(b"fake image bytes"))
+    assert response.mimetype == "image/png"
+
+
+def test_legacy_inline_research_pdf_is_still_served(app, client):
+    db = app.extensions["mongo_db"]
+    blob = db.research_pdf_blobs.insert_one({"filename": "legacy.pdf", "content_type": "application/pdf", "data": b"%PDF-1.4"})
+
+    response = client.get(f"/media/research-pdf/{blob.inserted_id}/legacy.pdf")
+
+    assert response.status_code == 200
+    assert response.data == b"%PDF-1.4"
+    assert response.headers["Content-Disposition"] == 'inline; filename="legacy.pdf"'
+
+
+def test_missing_media_returns_404(client):
+    assert client.get("/media/notes-audio/not-an-id/missing.wav").status_code == 404
+    assert client.get("/media/notes-audio/0123456789abcdef01234567/missing.wav").status_code == 404
+
+
+def _chunked_audio(app, content: bytes):
+    repo = ChunkedBlobRepository(app.extensions["mongo_db"], "notes_audio_blobs")
+    file_id = repo.put(io.BytesIO(content), filename="clip.wav", content_type="audio/wav", chunk_size=10)
+    return f"/media/notes-audio/{file_id}/clip.wav", str(file_id)
+
+
+def test_media_single_range_returns_partial_content(app, client):
+    content = bytes(range(100))
+    url, _ = _chunked_audio(app, content)
+
+    response = client.get(url, headers={"Range": "bytes=15-34"})
+
+    assert response.status_code == 206
+    assert response.data == content[15:35]
+    assert response.headers["Content-Range"] == "bytes 15-34/100"
+    assert response.headers["Content-Length"] == "20"
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+    suffix = client.get(url, headers={"Range": "bytes=-5"})
+    assert suffix.status_code == 206
+    assert suffix.data == content[-5:]
+
+
+def test_media_multiple_ranges_return_multipart_byteranges(app, client):
+    content = bytes(range(100))
+    url, _ = _chunked_audio(app, content)
+
+    response = client.get(url, headers={"Range": "bytes=0-4,50-59"})
+
+    assert response.status_code == 206
+    assert response.mimetype == "multipart/byteranges"
+    body = response.data
+    assert response.headers["Content-Length"] == str(len(body))
+    assert b"Content-Range: bytes 0-4/100\r\n\r\n" + content[0:5] in body
+    assert b"Content-Range: bytes 50-59/100\r\n\r\n" + content[50:60] in body
+    assert body.endswith(f"--{response.mimetype_params['boundary']}--\r\n".encode("ascii"))
+
+
+def test_media_unsatisfiable_range_returns_416(app, client):
+    url, _ = _chunked_audio(app, b"short")
+
+    response = client.get(url, headers={"Range": "bytes=100-200"})
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == "bytes */5"
+
+
+def test_media_if_range_mismatch_returns_full_body(app, client):
+    content = bytes(range(50))
+    url, file_id = _chunked_audio(app, content)
+
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"something-else"'})
+    assert stale.status_code == 200
+    assert stale.data == content
+
+    fresh = client.get(url, headers={"Range": "bytes=0-9", "If-Range": f'"{file_id}"'})
+    assert fresh.status_code == 206
+    assert fresh.data == content[:10]
+
+    assert client.get(url, headers={"If-None-Match": f'"{file_id}"'}).status_code == 304
+
+
+def test_media_disk_cache_serves_repeat_requests_without_database(app, client, tmp_path):
+    app.extensions["media_cache"] = MediaDiskCache(tmp_path, max_bytes=1024 * 1024)
+    content = bytes(range(100))
+    url, file_id = _chunked_audio(app, content)
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.data == content
+
+    # Drop the blob from MongoDB: the cached copy must still be served.
+    repo = ChunkedBlobRepository(app.extensions["mongo_db"], "notes_audio_blobs")
+    repo.files.delete_many({})
+    repo.chunks.delete_many({})
+
+    second = client.get(url)
+    assert second.status_code == 200
+    assert second.data == content
+    assert second.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+    ranged = client.get(url, headers={"Range": "bytes=10-19"})
+    assert ranged.status_code == 206
+    assert ranged.data == content[10:20]
+
+    multi = client.get(url, headers={"Range": "bytes=0-1,90-91"})
+    assert multi.status_code == 206
+    assert content[90:92] in multi.data
+
+    assert client.get(url, headers={"If-None-Match": f'"{file_id}"'}).status_code == 304
+
+
+def test_media_cache_miss_streams_ranges_and_survives_evicted_files(app, client, tmp_path):
+    cache = MediaDiskCache(tmp_path, max_bytes=1024 * 1024)
+    app.extensions["media_cache"] = cache
+    content = bytes(range(100))
+    url, file_id = _chunked_audio(app, content)
+
+    # A small range on a miss is answered from MongoDB without copying the blob first.
+    ranged = client.get(url, headers={"Range": "bytes=0-9"})
+    assert ranged.status_code == 206
+    assert ranged.data == content[:10]
+    assert list(tmp_path.glob("*.blob")) == []
+
+    full = client.get(url)
+    assert full.data == content
+    cached = list(tmp_path.glob("*.blob"))
+    assert len(cached) == 1
+
+    # Another worker's prune removes the file after get(): fall back to MongoDB.
+    original_get = cache.get
+
+    def get_then_evict(bucket, media_id):
+        hit = original_get(bucket, media_id)
+        cached[0].unlink()
+        return hit
+
+    cache.get = get_then_evict
+    again = client.get(url)
+    assert again.status_code == 200
+    assert again.data == content
+
+
+def test_media_disk_cache_evicts_least_recently_used(app, tmp_path):
+    cache = MediaDiskCache(tmp_path, max_bytes=25)
+    manifest = {"_id": "x", "content_type": "audio/wav", "length": 10}
+
+    with app.app_context():
+        cache.fill("notes_audio_blobs", "a", {**manifest, "_id": "a"}, [b"a" * 10])
+        cache.fill("notes_audio_blobs", "b", {**manifest, "_id": "b"}, [b"b" * 10])
+        os.utime(cache.get("notes_audio_blobs", "b")[0], (0, 0))
+        assert cache.get("notes_audio_blobs", "a") is not None
+        cache.fill("notes_audio_blobs", "c", {**manifest, "_id": "c"}, [b"c" * 10])
+
+    assert cache.get("notes_audio_blobs", "b") is None
+    assert cache.get("notes_audio_blobs", "a")[0].read_bytes() == b"a" * 10
+    assert cache.get("notes_audio_blobs", "c")[1]["length"] == 10
+
+
+def _png_bytes(width: int, height: int) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 120, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_gallery_upload_creates_image_variants_with_srcset(app, client):
+    login(client)
+    db = app.extensions["mongo_db"]
+
+    response = client.post(
+        "/admin/gallery",
+        data={
+            "category": "sketches",
+            "title": "big sketch",
+            "is_published": "1",
+            "image": (io.BytesIO(_png_bytes(1200, 600)), "big.png", "image/png"),
+        },
+        content_type="multipart/form-data",
+        follow_redirects=False,
+    )
+    assert response.status_code == 302
+
+    item = db.gallery_items.find_one({"title": "big sketch"})
+    assert item["image_width"] == 1200
+    assert [variant["width"] for variant in item["image_variants"]] == [320, 960]
+
+    thumb = client.get(item["image_variants"][0]["url"])
+    assert thumb.status_code == 200
+    PILImage = pytest.importorskip("PIL.Image")
+    assert PILImage.open(io.BytesIO(thumb.data)).size == (320, 160)
+
+    page = client.get("/gallery/sketches")
+    assert f'{item["image_variants"][0]["url"]} 320w' in page.get_data(as_text=True)
+    assert f'{item["image_url"]} 1200w' in page.get_data(as_text=True)
+
+    client.post(f"/admin/gallery/{item['_id']}/delete", follow_redirects=False)
+    assert db.gallery_upload_blobs.count_documents({}) == 0
+
+
+def test_gallery_variants_skip_images_smaller_than_targets(app, client):
+    login(client)
+    db = app.extensions["mongo_db"]
+
+    client.post(
+        "/admin/gallery",
+        data={
+            "category": "moments",
+            "title": "small moment",
+            "is_published": "1",
+            "image": (io.BytesIO(_png_bytes(500, 400)), "small.png", "image/png"),
+        },
+        content_type="multipart/form-data",
+        follow_redirects=False,
+    )
+
+    item = db.gallery_items.find_one({"title": "small moment"})
+    assert [variant["width"] for variant in item["image_variants"]] == [320]
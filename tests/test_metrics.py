@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+from app.metrics import MetricsRegistry
+
+
+def test_metrics_endpoint_requires_token_or_admin(app, client):
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+
+    client.get("/api/books")
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert "# TYPE http_requests_total counter" in body
+    assert 'http_requests_total{endpoint="api.books_list",method="GET",status="200"} 1' in body
+    assert 'http_request_duration_seconds_bucket{endpoint="api.books_list",method="GET",le="+Inf"} 1' in body
+    assert 'http_request_duration_seconds_count{endpoint="api.books_list",method="GET"} 1' in body
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    registry.observe("external_request_duration_seconds", 0.02, service="openlibrary", outcome="ok")
+    registry.observe("external_request_duration_seconds", 3.0, service="openlibrary", outcome="ok")
+    registry.inc("page_cache_requests_total", result='say "hi"')
+
+    body = registry.render()
+
+    labels = 'outcome="ok",service="openlibrary"'
+    assert f'external_request_duration_seconds_bucket{{{labels},le="0.01"}} 0' in body
+    assert f'external_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in body
+    assert f'external_request_duration_seconds_bucket{{{labels},le="5.0"}} 2' in body
+    assert f"external_request_duration_seconds_sum{{{labels}}} 3.02" in body
+    assert 'page_cache_requests_total{result="say \\"hi\\""} 1' in body
+
+
+def test_worker_files_are_summed_on_scrape(tmp_path):
+    first = MetricsRegistry(tmp_path, flush_seconds=3600)
+    second = MetricsRegistry(tmp_path, flush_seconds=3600)
+    first.inc("media_bytes_served_total", 100, endpoint="main.gallery_media")
+    second.inc("media_bytes_served_total", 50, endpoint="main.gallery_media")
+    second.flush()
+
+    body = first.render()
+
+    assert 'media_bytes_served_total{endpoint="main.gallery_media"} 150' in body
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 2
+
+
+def test_files_of_dead_workers_are_removed_at_startup(tmp_path):
+    worker = subprocess.Popen([sys.executable, "-c", "pass"])
+    worker.wait()
+    stale = tmp_path / f"metrics-{worker.pid}-deadbeef.json"
+    stale.write_text('{"counters": [["page_cache_requests_total", {"result": "hit"}, 7]]}', encoding="utf-8")
+    live = tmp_path / f"metrics-{os.getpid()}-cafef00d.json"
+    live.write_text('{"counters": [["page_cache_requests_total", {"result": "hit"}, 2]]}', encoding="utf-8")
+
+    registry = MetricsRegistry(tmp_path, flush_seconds=3600)
+
+    assert not stale.exists()
+    assert live.exists()
+    assert 'page_cache_requests_total{result="hit"} 2' in registry.render()
+
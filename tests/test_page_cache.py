@@ -0,0 +1,69 @@
+from pymongo.read_preferences import SecondaryPreferred
+
+from app.page_cache import FilesystemPageCacheBackend
+
+
+def login(client):
+    username = client.application.config["ADMIN_USERNAME"]
+    password = client.application.config["ADMIN_PASSWORD"]
+    return client.post(
+        "/admin/login",
+        data={"username": username, "password": password},
+        follow_redirects=False,
+    )
+
+
+def test_public_page_is_served_from_cache_until_content_changes(app, client):
+    first = client.get("/music")
+    assert first.headers["X-Page-Cache"] == "miss"
+    assert client.get("/music").headers["X-Page-Cache"] == "hit"
+
+    admin = app.test_client()
+    login(admin)
+    admin.post(
+        "/admin/music",
+        data={"title": "Fresh Track", "youtube_url": "https://youtu.be/dQw4w9WgXcQ", "is_published": "on"},
+    )
+
+    refreshed = client.get("/music")
+    assert refreshed.headers["X-Page-Cache"] == "miss"
+    assert "Fresh Track" in refreshed.get_data(as_text=True)
+
+
+def test_page_cache_key_includes_declared_query_args(client):
+    assert client.get("/notes?kind=log").headers["X-Page-Cache"] == "miss"
+    assert client.get("/notes?kind=note").headers["X-Page-Cache"] == "miss"
+    assert client.get("/notes?kind=log&utm_source=x").headers["X-Page-Cache"] == "hit"
+
+
+def test_admin_sessions_bypass_page_cache(client):
+    client.get("/music")
+    login(client)
+    client.get("/admin/manage")
+
+    response = client.get("/music")
+    assert response.status_code == 200
+    assert "X-Page-Cache" not in response.headers
+
+
+def test_filesystem_backend_round_trip_and_expiry(tmp_path):
+    backend = FilesystemPageCacheBackend(tmp_path, max_entries=1)
+    page = {"status": 200, "content_type": "text/html; charset=utf-8", "body": b"<p>hi</p>"}
+
+    backend.set("a", page, ttl_seconds=60)
+    assert backend.get("a")["body"] == b"<p>hi</p>"
+
+    backend.set("b", page, ttl_seconds=-1)
+    assert backend.get("b") is None
+    assert len(list(tmp_path.glob("*.page"))) == 1
+
+
+def test_secondary_reads_skip_page_cache_and_validators(app, client):
+    db = app.extensions["mongo_db"]
+    app.extensions["mongo_read_db"] = db.with_options(read_preference=SecondaryPreferred())
+
+    client.get("/music")
+    response = client.get("/music")
+
+    assert "X-Page-Cache" not in response.headers
+    assert response.headers.get("ETag") is None
@@ -0,0 +1,82 @@
+import logging
+from types import SimpleNamespace
+
+from app.query_profiler import QUERY_LISTENER
+
+
+def login(client):
+    username = client.application.config["ADMIN_USERNAME"]
+    password = client.application.config["ADMIN_PASSWORD"]
+    return client.post(
+        "/admin/login",
+        data={"username": username, "password": password},
+        follow_redirects=False,
+    )
+
+
+def _emit(request_id, command_name, command, duration_ms, failed=False):
+    QUERY_LISTENER.started(SimpleNamespace(request_id=request_id, command_name=command_name, command=command))
+    finished = SimpleNamespace(request_id=request_id, duration_micros=int(duration_ms * 1000))
+    if failed:
+        QUERY_LISTENER.failed(finished)
+    else:
+        QUERY_LISTENER.succeeded(finished)
+
+
+def _add_probe(app):
+    @app.route("/_queries")
+    def query_probe():
+        _emit(1, "find", {"find": "books", "filter": {}}, 4.0)
+        _emit(2, "getMore", {"getMore": 99, "collection": "books"}, 1.5)
+        _emit(3, "count", {"count": "reading_list"}, 2.5, failed=True)
+        return ""
+
+
+def test_server_timing_reports_request_queries(app, client):
+    _add_probe(app)
+    app.config.update(QUERY_PROFILER_SERVER_TIMING=True, METRICS_TOKEN="scrape-secret")
+    operator = {"Authorization": "Bearer scrape-secret"}
+
+    response = client.get("/_queries", headers=operator)
+
+    assert response.headers["Server-Timing"] == 'db;dur=8.0;desc="3 queries"'
+    # Commands outside a request are not attributed to anything.
+    _emit(4, "find", {"find": "books"}, 1.0)
+    assert client.get("/healthz", headers=operator).headers["Server-Timing"].endswith('desc="0 queries"')
+
+
+def test_server_timing_is_hidden_from_anonymous_visitors(app, client):
+    _add_probe(app)
+    assert "Server-Timing" not in client.get("/_queries").headers
+
+    app.config["QUERY_PROFILER_SERVER_TIMING"] = True
+    assert "Server-Timing" not in client.get("/_queries").headers
+    assert "Server-Timing" not in client.get("/_queries", headers={"Authorization": "Bearer guess"}).headers
+
+    login(client)
+    assert client.get("/_queries").headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_requests_over_budget_are_logged(app, client, caplog):
+    _add_probe(app)
+    app.config.update(QUERY_BUDGET_COUNT=2, QUERY_BUDGET_MS=0)
+
+    with caplog.at_level(logging.WARNING):
+        client.get("/_queries")
+
+    messages = [record.getMessage() for record in caplog.records if "Query budget exceeded" in record.getMessage()]
+    assert len(messages) == 1
+    assert "'books.find': 1" in messages[0]
+    assert "'books.getMore': 1" in messages[0]
+    assert "'failed': 1" in messages[0]
+
+
+def test_debug_footer_is_shown_to_admins_only(app, client):
+    app.config["QUERY_PROFILER_DEBUG_FOOTER"] = True
+
+    assert b'class="query-profile"' not in client.get("/reading").data
+
+    login(client)
+    response = client.get("/admin/manage")
+    assert b'class="query-profile"' in response.data
+    assert b"queries," in response.data
@@ -86,3 +86,58 @@ def test_reading_page_shows_reading_note(app, client):
     html = response.get_data(as_text=True)
     assert "Reading note:" in html
     assert "halfway through this book" in html
+
+
+def login(client):
+    username = client.application.config["ADMIN_USERNAME"]
+    password = client.application.config["ADMIN_PASSWORD"]
+    return client.post(
+        "/admin/login",
+        data={"username": username, "password": password},
+        follow_redirects=False,
+    )
+
+
+def test_reading_page_uses_embedded_snapshots_without_loading_books(app, client, monkeypatch):
+    book_ids = seed_many_books(app, total=1)
+    db = app.extensions["mongo_db"]
+    now = datetime.now(timezone.utc)
+    db.reading_list.insert_one(
+        {
+            "book_id": book_ids[0],
+            "book": {"slug": "book-0", "title": "Snapshot Title", "authors": ["Author 0"]},
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    monkeypatch.setattr(
+        "app.repositories.books_repo.BooksRepository.list_by_ids",
+        lambda self, ids: (_ for _ in ()).throw(AssertionError("books were queried")),
+    )
+
+    html = client.get("/reading").get_data(as_text=True)
+
+    assert "Snapshot Title" in html
+
+
+def test_book_snapshot_follows_admin_add_and_edit(app, client):
+    book_id = seed_many_books(app, total=1)[0]
+    db = app.extensions["mongo_db"]
+    login(client)
+
+    client.post("/admin/reading", data={"book_id": str(book_id), "reading_note": ""}, follow_redirects=False)
+    entry = db.reading_list.find_one({"book_id": book_id})
+    assert entry["book"]["title"] == "Book 0"
+    assert entry["book"]["cover_url"] == "https://example.com/0.jpg"
+
+    client.post(
+        f"/admin/books/{book_id}/edit",
+        data={"title": "Book Zero", "slug": "book-zero", "author": "Someone Else"},
+        follow_redirects=False,
+    )
+    entry = db.reading_list.find_one({"book_id": book_id})
+    assert entry["book"]["title"] == "Book Zero"
+    assert entry["book"]["authors"] == ["Someone Else"]
+    assert entry["book"]["cover_url"] is None
+
+    assert "Book Zero" in client.get("/reading").get_data(as_text=True)
@@ -0,0 +1,106 @@
+from app.registry import identity_map, request_service
+from app.repositories.books_repo import BooksRepository
+from app.services.books_service import BooksService
+
+
+def _seed_books(db, count=2):
+    ids = db.books.insert_many(
+        [{"slug": f"book-{index}", "title": f"Book {index}", "authors": ["Author"]} for index in range(count)]
+    ).inserted_ids
+    return [str(book_id) for book_id in ids]
+
+
+def test_services_are_shared_within_a_request_only(app, client):
+    seen = []
+
+    @app.route("/_registry")
+    def registry_probe():
+        first = request_service(BooksService)
+        assert request_service(BooksService) is first
+        assert request_service(BooksService, app.extensions["mongo_db"]) is first
+        seen.append(first)
+        return ""
+
+    client.get("/_registry")
+    client.get("/_registry")
+
+    assert len(seen) == 2
+    assert seen[0] is not seen[1]
+
+
+def test_identity_map_skips_books_already_loaded(app, monkeypatch):
+    db = app.extensions["mongo_db"]
+    book_ids = _seed_books(db)
+
+    with app.test_request_context("/"):
+        repo = BooksRepository(db)
+        assert repo.get_by_id(book_ids[0])["title"] == "Book 0"
+
+        queried = []
+        original_find = repo.collection.find
+        monkeypatch.setattr(repo.collection, "find", lambda *args, **kwargs: queried.append(args[0]) or original_find(*args, **kwargs))
+        monkeypatch.setattr(repo.collection, "find_one", lambda *args, **kwargs: queried.append(args[0]))
+
+        assert repo.get_by_id(book_ids[0])["slug"] == "book-0"
+        books = repo.list_by_ids(book_ids)
+
+        assert sorted(book["slug"] for book in books) == ["book-0", "book-1"]
+        assert len(queried) == 1
+        assert [str(value) for value in queried[0]["_id"]["$in"]] == [book_ids[1]]
+
+
+def test_identity_map_returns_copies_and_drops_written_books(app):
+    db = app.extensions["mongo_db"]
+    book_id = _seed_books(db, count=1)[0]
+
+    with app.test_request_context("/"):
+        repo = BooksRepository(db)
+        repo.get_by_id(book_id)["title"] = "Mutated by caller"
+        assert repo.get_by_id(book_id)["title"] == "Book 0"
+
+        updated = repo.update_book(book_id, {"title": "Renamed"})
+        assert updated["title"] == "Renamed"
+        assert identity_map("books")[book_id]["title"] == "Renamed"
+
+        repo.delete_book(book_id)
+        assert repo.get_by_id(book_id) is None
+
+
+def test_views_read_only_their_projection(app, client):
+    db = app.extensions["mongo_db"]
+    db.books.insert_one(
+        {
+            "slug": "heavy-book",
+            "title": "Heavy Book",
+            "authors": ["Author"],
+            "description": "kept",
+            "google_info": {"description": "x" * 10000},
+        }
+    )
+
+    with app.test_request_context("/"):
+        repo = BooksRepository(db)
+        card = repo.get_by_id_or_slug("heavy-book", projection="card")
+        assert card["description"] == "kept"
+        assert "google_info" not in card
+
+        row = repo.list_books(projection="admin_row")[0][0]
+        assert "description" not in row
+        assert "google_info" not in row
+
+    payload = client.get("/api/books/heavy-book").get_json()
+    assert payload["title"] == "Heavy Book"
+    assert payload["description"] == "kept"
+
+
+def test_projected_books_never_stand_in_for_full_documents(app):
+    db = app.extensions["mongo_db"]
+    book_id = _seed_books(db, count=1)[0]
+    db.books.update_many({}, {"$set": {"google_info": {"title": "Imported"}}})
+
+    with app.test_request_context("/"):
+        repo = BooksRepository(db)
+        assert "google_info" not in repo.get_by_id(book_id, projection="reading_card")
+        assert "google_info" in repo.get_by_id(book_id)
+        # Once the full document is loaded it also answers projected reads.
+        assert "google_info" in repo.list_by_ids([book_id], projection="card")[0]
@@ -7,6 +7,7 @@ class CsrfConfig(Config):
     SECRET_KEY = "test-secret"
     MONGODB_URI = ""
     WTF_CSRF_ENABLED = True
+    MEDIA_CACHE_MAX_BYTES = 0
     ADMIN_USERNAME = "admin_test"
     ADMIN_PASSWORD = "password123_test"
 
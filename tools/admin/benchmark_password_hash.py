@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from passlib.hash import pbkdf2_sha256
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.config import Config  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Time pbkdf2_sha256 verification on this machine to pick ADMIN_PASSWORD_HASH_ROUNDS"
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        nargs="+",
+        default=[29000, 60000, 120000, 240000, 480000],
+        help="Round counts to measure",
+    )
+    parser.add_argument("--target-ms", type=float, default=150.0, help="Acceptable median verify time")
+    parser.add_argument("--samples", type=int, default=5, help="Verifications per round count")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print(f"Current ADMIN_PASSWORD_HASH_ROUNDS: {Config.ADMIN_PASSWORD_HASH_ROUNDS}")
+    recommended = None
+    for rounds in sorted(args.rounds):
+        hasher = pbkdf2_sha256.using(rounds=rounds)
+        password_hash = hasher.hash("benchmark-password")
+        timings = []
+        for _ in range(args.samples):
+            started = time.perf_counter()
+            hasher.verify("benchmark-password", password_hash)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        median_ms = statistics.median(timings)
+        print(f"- rounds={rounds}: median {median_ms:.1f}ms")
+        if median_ms <= args.target_ms:
+            recommended = rounds
+
+    if recommended is None:
+        print(f"No measured round count verifies within {args.target_ms:.0f}ms")
+    else:
+        print(f"Recommended ADMIN_PASSWORD_HASH_ROUNDS={recommended}")
+
+
+if __name__ == "__main__":
+    main()
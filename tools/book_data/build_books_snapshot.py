@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.books import SNAPSHOT_FILE, write_snapshot  # noqa: E402
+from app.services.books_service import BooksService  # noqa: E402
+
+
+def main():
+    books = BooksService.build_fallback_books()
+    if not books:
+        raise SystemExit("No books found in static/data/books.json")
+
+    write_snapshot(books)
+    print("Snapshot written")
+    print(f"- books: {len(books)}")
+    print(f"- path: {SNAPSHOT_FILE}")
+    print(f"- bytes: {SNAPSHOT_FILE.stat().st_size}")
+
+
+if __name__ == "__main__":
+    main()
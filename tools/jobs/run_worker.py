@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app import create_app  # noqa: E402
+from app.jobs import default_worker_id, run_pending_jobs  # noqa: E402
+from app.repositories.jobs_repo import JobsRepository  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run queued background jobs (blob deletes, image variants)")
+    parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+    parser.add_argument("--poll-interval", type=float, default=None, help="Seconds between polls when idle")
+    parser.add_argument("--status", action="store_true", help="Print job counts by status and exit")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    app = create_app()
+    db = app.extensions.get("mongo_db")
+    if db is None:
+        raise SystemExit("MongoDB is unavailable; check MONGODB_URI")
+
+    if args.status:
+        for status, count in JobsRepository(db).count_by_status().items():
+            print(f"- {status}: {count}")
+        return
+
+    worker_id = default_worker_id()
+    poll_interval = args.poll_interval or app.config.get("JOBS_POLL_INTERVAL_SECONDS", 5)
+    print(f"Job worker {worker_id} started")
+    while True:
+        processed = run_pending_jobs(app, worker_id=worker_id)
+        if processed:
+            print(f"- processed: {processed}")
+        if args.once:
+            break
+        time.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from pymongo import ASCENDING, MongoClient, UpdateOne
+from pymongo.server_api import ServerApi
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.config import Config  # noqa: E402
+from app.db import ensure_indexes  # noqa: E402
+from app.repositories.audit_repo import audit_expires_at  # noqa: E402
+from app.repositories.audit_rollup_repo import AuditRollupRepository  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Rebuild audit_rollups from audit_logs and stamp retention on rows written before it existed"
+    )
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", ""), help="MongoDB connection URI")
+    parser.add_argument(
+        "--db-name",
+        default=os.getenv("MONGODB_DB_NAME", "archive"),
+        help="MongoDB database name",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Audit rows per batch")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not args.mongo_uri:
+        raise SystemExit("Missing --mongo-uri or MONGODB_URI")
+
+    client = MongoClient(args.mongo_uri, server_api=ServerApi("1"))
+    client.admin.command("ping")
+    db = client[args.db_name]
+    ensure_indexes(db)
+
+    rollups = AuditRollupRepository(db)
+    rollups.clear()
+
+    processed = 0
+    stamped = 0
+    batch = []
+    cursor = db.audit_logs.find({}).sort("timestamp", ASCENDING).batch_size(args.batch_size)
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= args.batch_size:
+            stamped += _flush(db, rollups, batch)
+            processed += len(batch)
+            batch = []
+    if batch:
+        stamped += _flush(db, rollups, batch)
+        processed += len(batch)
+    rollups.mark_complete()
+
+    print("Rebuild complete")
+    print(f"- audit_rows: {processed}")
+    print(f"- retention_stamped: {stamped}")
+
+
+def _flush(db, rollups: AuditRollupRepository, batch: list[dict]) -> int:
+    rollups.record(batch, hourly_retention_days=Config.AUDIT_ROLLUP_HOURLY_RETENTION_DAYS)
+    updates = [
+        UpdateOne({"_id": doc["_id"]}, {"$set": {"expires_at": audit_expires_at(doc["action"], doc["timestamp"])}})
+        for doc in batch
+        if "expires_at" not in doc
+    ]
+    if updates:
+        db.audit_logs.bulk_write(updates, ordered=False)
+    return len(updates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from pymongo import MongoClient
+from pymongo.server_api import ServerApi
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.repositories.stats_repo import CollectionStatsRepository  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Recount every counter stored in collection_stats")
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", ""), help="MongoDB connection URI")
+    parser.add_argument(
+        "--db-name",
+        default=os.getenv("MONGODB_DB_NAME", "archive"),
+        help="MongoDB database name",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not args.mongo_uri:
+        raise SystemExit("Missing --mongo-uri or MONGODB_URI")
+
+    client = MongoClient(args.mongo_uri, server_api=ServerApi("1"))
+    client.admin.command("ping")
+    db = client[args.db_name]
+
+    reconciled = CollectionStatsRepository(db).reconcile()
+
+    print("Reconciliation complete")
+    for key, count in sorted(reconciled.items()):
+        print(f"- {key}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from pymongo import MongoClient
+from pymongo.server_api import ServerApi
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db import ensure_indexes  # noqa: E402
+from app.repositories.books_repo import BooksRepository  # noqa: E402
+from app.repositories.content_version_repo import ContentVersionRepository  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rebuild the search token fields used by the books search index")
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", ""), help="MongoDB connection URI")
+    parser.add_argument(
+        "--db-name",
+        default=os.getenv("MONGODB_DB_NAME", "archive"),
+        help="MongoDB database name",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Cursor batch size")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not args.mongo_uri:
+        raise SystemExit("Missing --mongo-uri or MONGODB_URI")
+
+    client = MongoClient(args.mongo_uri, server_api=ServerApi("1"))
+    client.admin.command("ping")
+    db = client[args.db_name]
+    ensure_indexes(db)
+
+    refreshed = BooksRepository(db).refresh_search_fields(batch_size=args.batch_size)
+    ContentVersionRepository(db).bump("books")
+
+    print("Backfill complete")
+    print(f"- books_refreshed: {refreshed}")
+
+
+if __name__ == "__main__":
+    main()
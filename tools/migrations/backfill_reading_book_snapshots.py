@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from pymongo import MongoClient
+from pymongo.server_api import ServerApi
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db import ensure_indexes  # noqa: E402
+from app.repositories.books_repo import BooksRepository  # noqa: E402
+from app.repositories.content_version_repo import ContentVersionRepository  # noqa: E402
+from app.repositories.reading_repo import ReadingRepository  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Embed (or refresh) the book snapshot stored on every reading list entry"
+    )
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", ""), help="MongoDB connection URI")
+    parser.add_argument(
+        "--db-name",
+        default=os.getenv("MONGODB_DB_NAME", "archive"),
+        help="MongoDB database name",
+    )
+    parser.add_argument("--batch-size", type=int, default=200, help="Books loaded per query")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not args.mongo_uri:
+        raise SystemExit("Missing --mongo-uri or MONGODB_URI")
+
+    client = MongoClient(args.mongo_uri, server_api=ServerApi("1"))
+    client.admin.command("ping")
+    db = client[args.db_name]
+    ensure_indexes(db)
+
+    books_repo = BooksRepository(db)
+    reading_repo = ReadingRepository(db)
+    book_ids = [str(book_id) for book_id in db.reading_list.distinct("book_id")]
+
+    refreshed = 0
+    missing = 0
+    for start in range(0, len(book_ids), args.batch_size):
+        batch = book_ids[start : start + args.batch_size]
+        books = books_repo.list_by_ids(batch)
+        missing += len(batch) - len(books)
+        for book in books:
+            refreshed += reading_repo.update_book_snapshot(book["id"], book)
+    ContentVersionRepository(db).bump("reading_list")
+
+    print("Backfill complete")
+    print(f"- entries_refreshed: {refreshed}")
+    print(f"- missing_books: {missing}")
+
+
+if __name__ == "__main__":
+    main()
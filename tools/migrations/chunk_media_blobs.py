@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from pymongo import MongoClient
+from pymongo.server_api import ServerApi
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db import ensure_indexes  # noqa: E402
+from app.repositories.blob_repo import DEFAULT_CHUNK_SIZE, ChunkedBlobRepository  # noqa: E402
+from app.services.media_storage_service import MEDIA_BLOB_BUCKETS  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Move inline media blobs into chunked storage")
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", ""), help="MongoDB connection URI")
+    parser.add_argument(
+        "--db-name",
+        default=os.getenv("MONGODB_DB_NAME", "archive"),
+        help="MongoDB database name",
+    )
+    parser.add_argument(
+        "--bucket",
+        action="append",
+        choices=MEDIA_BLOB_BUCKETS,
+        help="Only migrate this bucket (repeatable, defaults to all)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Chunk size in bytes")
+    parser.add_argument("--dry-run", action="store_true", help="Only count blobs that still need migrating")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not args.mongo_uri:
+        raise SystemExit("Missing --mongo-uri or MONGODB_URI")
+
+    client = MongoClient(args.mongo_uri, server_api=ServerApi("1"))
+    client.admin.command("ping")
+    db = client[args.db_name]
+    ensure_indexes(db)
+
+    print("Dry run" if args.dry_run else "Migration complete")
+    for bucket in args.bucket or MEDIA_BLOB_BUCKETS:
+        repo = ChunkedBlobRepository(db, bucket)
+        # Only ids are fetched up front; each blob's bytes are loaded one at a time.
+        pending = [doc["_id"] for doc in repo.files.find({"storage": {"$ne": "chunked"}}, {"_id": 1})]
+        migrated = 0
+        if not args.dry_run:
+            migrated = sum(1 for file_id in pending if repo.migrate_inline(file_id, chunk_size=args.chunk_size))
+        print(f"- {bucket}: pending={len(pending)} migrated={migrated}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,10 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from app.db import ensure_indexes  # noqa: E402
+from app.repositories.books_repo import BooksRepository, book_search_fields  # noqa: E402
+from app.repositories.content_version_repo import ContentVersionRepository  # noqa: E402
+from app.repositories.reading_repo import ReadingRepository  # noqa: E402
+from app.repositories.stats_repo import CollectionStatsRepository  # noqa: E402
 from app.services.books_service import BooksService  # noqa: E402
 
 
@@ -63,6 +67,7 @@ def main():
     updated = 0
     skipped = 0
     errors = 0
+    updated_ids: list[str] = []
 
     for index, raw_book in enumerate(raw_books, start=1):
         try:
@@ -77,6 +82,7 @@ def main():
 
             original_title = normalized["original_title"]
             created_at = normalized.pop("created_at")
+            normalized.update(book_search_fields(normalized))
 
             if args.dry_run:
                 if existing:
@@ -98,6 +104,8 @@ def main():
                 migrated += 1
             elif result.modified_count:
                 updated += 1
+                if existing:
+                    updated_ids.append(str(existing["_id"]))
             else:
                 skipped += 1
 
@@ -105,14 +113,38 @@ def main():
             errors += 1
             print(f"[{index}] error: {exc}")
 
+    snapshots_refreshed = 0
+    if not args.dry_run:
+        CollectionStatsRepository(db).reconcile()
+        snapshots_refreshed = refresh_reading_snapshots(db, updated_ids)
+        versions = ContentVersionRepository(db)
+        versions.bump("books")
+        if snapshots_refreshed:
+            versions.bump("reading_list")
+
     print("Migration complete")
     print(f"- source_rows: {len(raw_books)}")
     print(f"- migrated: {migrated}")
     print(f"- updated: {updated}")
     print(f"- skipped: {skipped}")
     print(f"- errors: {errors}")
+    print(f"- reading_snapshots_refreshed: {snapshots_refreshed}")
     print(f"- dry_run: {args.dry_run}")
 
 
+def refresh_reading_snapshots(db, book_ids: list[str]) -> int:
+    """Re-embed updated books in the reading list entries that carry a copy of them."""
+    referenced = {str(book_id) for book_id in db.reading_list.distinct("book_id")}
+    changed = [book_id for book_id in book_ids if book_id in referenced]
+    if not changed:
+        return 0
+
+    reading_repo = ReadingRepository(db)
+    refreshed = 0
+    for book in BooksRepository(db).list_by_ids(changed, projection="reading_card"):
+        refreshed += reading_repo.update_book_snapshot(book["id"], book)
+    return refreshed
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from pymongo import MongoClient
+from pymongo.server_api import ServerApi
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db import SCHEMA_VERSION, ensure_schema  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Create MongoDB indexes and record the schema version, so app workers can skip index management"
+    )
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", ""), help="MongoDB connection URI")
+    parser.add_argument(
+        "--db-name",
+        default=os.getenv("MONGODB_DB_NAME", "archive"),
+        help="MongoDB database name",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-run index creation even if the version is current")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not args.mongo_uri:
+        raise SystemExit("Missing --mongo-uri or MONGODB_URI")
+
+    client = MongoClient(args.mongo_uri, server_api=ServerApi("1"))
+    client.admin.command("ping")
+    db = client[args.db_name]
+
+    migrated = ensure_schema(db, force=args.force)
+
+    print("Migration complete" if migrated else "Schema already current")
+    print(f"- schema_version: {SCHEMA_VERSION}")
+
+
+if __name__ == "__main__":
+    main()